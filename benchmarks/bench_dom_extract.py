@@ -0,0 +1,112 @@
+"""DOM 提取往返次数对比
+
+生成含 N 篇文章卡片的本地页面，分别用逐元素 find_element/.text 的旧方式
+和 extract_rows 的单次脚本方式解析，统计 WebDriver 命令往返次数和耗时。
+
+    python benchmarks/bench_dom_extract.py --articles 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from modules.dom_extractor import extract_rows, parse_stat_texts
+
+CARD_HTML = """
+<div class="article-card">
+  <div class="title">测试文章 {i}</div>
+  <div class="create-time">2024-01-{day:02d} 10:00</div>
+  <ul class="count">
+    <li>展现 {show}</li><li>阅读 {read}</li><li>点赞 {digg}</li><li>评论 {comment}</li>
+  </ul>
+</div>
+"""
+
+def build_page(count):
+    """生成文章列表页面"""
+    cards = ''.join(
+        CARD_HTML.format(i=i, day=i % 28 + 1, show=i * 100, read=i * 10, digg=i, comment=i % 7)
+        for i in range(count)
+    )
+    return f'<html><head><meta charset="utf-8"></head><body>{cards}</body></html>'
+
+class RoundTripCounter:
+    """统计 driver.execute 调用次数（每次即一次 WebDriver HTTP 往返）"""
+
+    def __init__(self, driver):
+        self.count = 0
+        self._execute = driver.execute
+
+        def counting_execute(*args, **kwargs):
+            self.count += 1
+            return self._execute(*args, **kwargs)
+
+        driver.execute = counting_execute
+
+def parse_per_element(driver):
+    """旧方式：逐个元素查找并读取文本"""
+    articles = []
+    for elem in driver.find_elements(By.CSS_SELECTOR, '.article-card'):
+        article = {'title': elem.find_element(By.CSS_SELECTOR, '.title').text.strip()}
+        article['publish_time'] = elem.find_element(By.CSS_SELECTOR, '.create-time').text.strip()
+        stats = [stat.text.strip() for stat in elem.find_elements(By.CSS_SELECTOR, 'ul.count li')]
+        article.update(parse_stat_texts(stats))
+        articles.append(article)
+    return articles
+
+def parse_batched(driver):
+    """新方式：一次脚本调用"""
+    _, rows = extract_rows(
+        driver,
+        ['.article-card'],
+        fields={'title': '.title', 'publish_time': '.create-time'},
+        lists={'stats': 'ul.count li'}
+    )
+    articles = []
+    for row in rows:
+        article = {'title': row['title'], 'publish_time': row['publish_time']}
+        article.update(parse_stat_texts(row['stats']))
+        articles.append(article)
+    return articles
+
+def measure(driver, counter, parse):
+    """返回 (文章数, 往返次数, 耗时秒)"""
+    counter.count = 0
+    started = time.perf_counter()
+    articles = parse(driver)
+    return len(articles), counter.count, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description='DOM 提取往返次数对比')
+    parser.add_argument('--articles', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile('w', suffix='.html', delete=False, encoding='utf-8') as f:
+        f.write(build_page(args.articles))
+        page = f.name
+
+    options = Options()
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    driver = webdriver.Chrome(options=options)
+    try:
+        driver.get('file://' + page)
+        counter = RoundTripCounter(driver)
+
+        print(f'{"方式":<12}{"文章数":>8}{"往返次数":>10}{"耗时(ms)":>12}')
+        for name, parse in (('逐元素', parse_per_element), ('单次脚本', parse_batched)):
+            count, trips, elapsed = measure(driver, counter, parse)
+            print(f'{name:<12}{count:>8}{trips:>10}{elapsed * 1000:>12.1f}')
+    finally:
+        driver.quit()
+        os.remove(page)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""启动预算检查
+
+用 python -X importtime 测量导入 main 的耗时，并确认启动路径没有加载浏览器自动化等重型模块；
+再在 offscreen 平台上测量主窗口显示出来所需的时间。超出预算或加载了禁止的模块时以非零状态退出，
+导入部分由 tests/test_startup.py 在 pytest 中检查；也可以单独运行：
+
+    python benchmarks/check_startup.py
+    python benchmarks/check_startup.py --budget-ms 250 --window-budget-ms 600
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, 'src')
+
+# 启动时不应导入的模块：第一次抓取或显示统计时才需要
+FORBIDDEN = ['selenium', 'webdriver_manager', 'bs4', 'numpy', 'requests', 'urllib3']
+
+# 导入 main 和显示主窗口的默认预算（ms），tests/test_startup.py 使用同一预算
+IMPORT_BUDGET_MS = 300
+WINDOW_BUDGET_MS = 800
+
+WINDOW_SCRIPT = """
+import time
+started = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+from ui.account_manager_ui import AccountManagerUI
+app = QApplication([])
+window = AccountManagerUI()
+window.show()
+app.processEvents()
+print(round((time.perf_counter() - started) * 1000, 1))
+window.bridge.engine.stop()
+"""
+
+def measure_imports(module='main'):
+    """返回 (导入的所有模块名, module 的累计耗时 ms, [(耗时 ms, 直接子模块), ...])"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=SRC, capture_output=True, text=True, env=dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else '导入失败')
+
+    # 子模块先于父模块输出，遇到顶层模块时前面的一层子模块都属于它
+    names, children, total = set(), [], 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        try:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            ms = int(cumulative) / 1000
+        except ValueError:
+            continue  # 表头
+        name = name[1:].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        names.add(name)
+        if depth == 0:
+            if name == module:
+                total = ms
+                break
+            children = []
+        elif depth == 1:
+            children.append((ms, name))
+    return names, total, children
+
+def measure_window():
+    """offscreen 平台上显示主窗口的耗时（ms）"""
+    result = subprocess.run(
+        [sys.executable, '-c', WINDOW_SCRIPT],
+        cwd=SRC, capture_output=True, text=True,
+        env=dict(os.environ, QT_QPA_PLATFORM='offscreen'), timeout=60
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else '启动失败')
+    return float(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description='检查界面启动耗时和导入的模块')
+    parser.add_argument('--budget-ms', type=float, default=IMPORT_BUDGET_MS, help='导入 main 的耗时预算')
+    parser.add_argument('--window-budget-ms', type=float, default=WINDOW_BUDGET_MS, help='显示主窗口的耗时预算')
+    parser.add_argument('--repeat', type=int, default=3, help='取多次测量的最小值')
+    parser.add_argument('--no-window', action='store_true', help='不测量窗口显示（没有 Qt 平台插件时）')
+    args = parser.parse_args()
+
+    failures = []
+    runs = [measure_imports() for _ in range(max(1, args.repeat))]
+    names, total, children = min(runs, key=lambda run: run[1])
+    print(f'导入 main: {total:.1f}ms（预算 {args.budget_ms:.0f}ms）')
+    if total > args.budget_ms:
+        failures.append(f'导入耗时 {total:.1f}ms 超出预算 {args.budget_ms:.0f}ms')
+
+    loaded = sorted({name.split('.')[0] for name in names} & set(FORBIDDEN))
+    if loaded:
+        failures.append(f'启动时导入了: {", ".join(loaded)}')
+
+    for ms, name in sorted(children, reverse=True)[:8]:
+        print(f'  {ms:>8.1f}ms  {name}')
+
+    if not args.no_window:
+        shown = min(measure_window() for _ in range(max(1, args.repeat)))
+        print(f'显示主窗口: {shown:.1f}ms（预算 {args.window_budget_ms:.0f}ms）')
+        if shown > args.window_budget_ms:
+            failures.append(f'显示主窗口 {shown:.1f}ms 超出预算 {args.window_budget_ms:.0f}ms')
+
+    for failure in failures:
+        print(f'失败: {failure}')
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
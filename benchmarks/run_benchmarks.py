@@ -0,0 +1,359 @@
+"""刷新链路基准测试
+
+启动本地桩服务器（生成 --articles 篇文章，注入 --latency 延迟），依次测量：
+
+    http_fetch            fetch_articles 走创作者中心接口
+    http_batch            fetch_articles_many 并发抓取 --accounts 个账号
+    selenium_fetch        fetch_articles 走浏览器（需要 Chrome）
+    session_get_articles  SessionManager.get_articles（需要 Chrome）
+    account_listing       AccountManager.get_all_accounts 列出 --accounts 个账号
+    ui_table              ArticleTableModel + QTableView 填充文章表格（需要 PyQt5）
+
+每个阶段记录墙钟时间、往返次数（HTTP 请求 / WebDriver 命令 / SQL 语句 / data() 调用）
+和峰值内存，结果保存为 JSON，便于在不同提交之间对比：
+
+    python benchmarks/run_benchmarks.py --articles 500 --latency 0.02
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/上一次.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+from stub_server import start_stub_server, PAGE_SIZE
+
+STAGES = ['http_fetch', 'http_batch', 'selenium_fetch', 'session_get_articles', 'account_listing', 'ui_table']
+
+COOKIES = [{'name': 'sessionid', 'value': 'bench', 'domain': '127.0.0.1', 'path': '/'}]
+
+def current_rss():
+    """当前进程常驻内存（字节），无法获取时返回 None"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+class RssSampler:
+    """在后台线程中采样内存，记录阶段内的峰值"""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        rss = current_rss()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self._sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+class WebDriverCounter:
+    """统计所有 WebDriver 实例发出的命令数（每条命令一次 HTTP 往返）"""
+
+    def __init__(self):
+        from selenium.webdriver.remote.webdriver import WebDriver
+        self.count = 0
+        self._cls = WebDriver
+        self._execute = WebDriver.execute
+        counter = self
+
+        def counting_execute(driver, *args, **kwargs):
+            counter.count += 1
+            return counter._execute(driver, *args, **kwargs)
+
+        WebDriver.execute = counting_execute
+
+    def close(self):
+        self._cls.execute = self._execute
+
+class Context:
+    """各阶段共享的环境"""
+
+    def __init__(self, args, server, base_url, workdir):
+        self.args = args
+        self.server = server
+        self.base_url = base_url
+        self.workdir = workdir
+        self.max_pages = max(1, -(-args.articles // PAGE_SIZE))
+        self._session_manager = None
+        self.chrome_error = None  # Chrome 启动失败的原因，后续阶段不再重试
+
+    def http_requests(self):
+        return sum(self.server.stats.values())
+
+    def session_manager(self):
+        if self._session_manager is None:
+            from modules.session_manager import SessionManager
+            self._session_manager = SessionManager(pool_size=1)
+        return self._session_manager
+
+    def close(self):
+        if self._session_manager is not None:
+            self._session_manager.close()
+
+# ---- 各阶段：返回 (条目数, 往返次数)，不可用时抛出 SkipStage ----
+
+class SkipStage(Exception):
+    pass
+
+def stage_http_fetch(ctx):
+    from modules.creator_api import CreatorApi
+    from services.article_service import fetch_articles
+    api = CreatorApi(base_url=ctx.base_url)
+    before = ctx.http_requests()
+    articles = fetch_articles(COOKIES, backend='http', api=api, max_pages=ctx.max_pages)
+    return len(articles), ctx.http_requests() - before
+
+def stage_http_batch(ctx):
+    from modules.creator_api import CreatorApi
+    from services.article_service import fetch_articles_many
+    from services.async_engine import AsyncEngine
+    import services.article_service as article_service
+
+    # 让批量抓取使用指向桩服务器的接口客户端
+    article_service._default_creator_api = CreatorApi(base_url=ctx.base_url, pool_size=ctx.args.concurrency)
+    accounts = [(f'bench{i}', COOKIES) for i in range(ctx.args.accounts)]
+    engine = AsyncEngine(max_workers=ctx.args.concurrency).start()
+    before = ctx.http_requests()
+    try:
+        results = engine.run(fetch_articles_many(
+            accounts, session_manager=object(), limit=ctx.args.concurrency,
+            backend='http', max_pages=ctx.max_pages
+        ))
+    finally:
+        engine.stop()
+    return sum(len(articles) for _, articles, _ in results), ctx.http_requests() - before
+
+def _with_chrome(ctx, run):
+    try:
+        import selenium  # noqa: F401
+    except ImportError:
+        raise SkipStage('未安装 selenium')
+    if ctx.chrome_error:
+        raise SkipStage(ctx.chrome_error)
+    counter = WebDriverCounter()
+    try:
+        try:
+            session_manager = ctx.session_manager()
+            session_manager.driver_pool.release(session_manager.driver_pool.acquire(timeout=60))
+        except Exception as e:
+            ctx.chrome_error = f'无法启动 Chrome: {str(e).splitlines()[0] if str(e) else type(e).__name__}'
+            raise SkipStage(ctx.chrome_error)
+        counter.count = 0
+        return run(session_manager), counter.count
+    finally:
+        counter.close()
+
+def stage_selenium_fetch(ctx):
+    from services.article_service import fetch_articles
+
+    def run(session_manager):
+        return len(fetch_articles(COOKIES, session_manager, backend='selenium', max_pages=ctx.max_pages))
+    return _with_chrome(ctx, run)
+
+def stage_session_get_articles(ctx):
+    def run(session_manager):
+        result = session_manager.get_articles(COOKIES)
+        return len(result.get('articles') or [])
+    return _with_chrome(ctx, run)
+
+def stage_account_listing(ctx):
+    from modules.account_manager import AccountManager
+    cwd = os.getcwd()
+    os.chdir(ctx.workdir)
+    try:
+        manager = AccountManager()
+        if not manager.get_account(f'bench{ctx.args.accounts - 1}'):
+            manager.add_accounts([(f'bench{i}', COOKIES) for i in range(ctx.args.accounts)])
+
+        statements = [0]
+        manager.storage.connection().set_trace_callback(lambda sql: statements.__setitem__(0, statements[0] + 1))
+        try:
+            accounts = manager.get_all_accounts()
+        finally:
+            manager.storage.connection().set_trace_callback(None)
+        manager.close()
+        return len(accounts), statements[0]
+    finally:
+        os.chdir(cwd)
+
+_qt_app = None
+
+def stage_ui_table(ctx):
+    global _qt_app
+    try:
+        from PyQt5.QtWidgets import QApplication, QTableView
+    except ImportError:
+        raise SkipStage('未安装 PyQt5')
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    _qt_app = QApplication.instance() or QApplication([])
+
+    from modules.creator_api import CreatorApi
+    from stub_server import generate_article_list
+    from ui.article_table_model import ArticleTableModel, ArticleFilterProxyModel
+    articles = [CreatorApi.to_article(item) for item in generate_article_list(ctx.args.articles)['data']['list']]
+
+    model = ArticleTableModel(lambda a: a['article_id'])
+    calls = [0]
+    data = model.data
+
+    def counting_data(*args):
+        calls[0] += 1
+        return data(*args)
+
+    model.data = counting_data
+    proxy = ArticleFilterProxyModel()
+    proxy.setSourceModel(model)
+    view = QTableView()
+    view.setModel(proxy)
+    view.setSortingEnabled(True)
+    view.resize(1000, 800)
+    view.show()
+
+    model.set_articles(articles)
+    _qt_app.processEvents()
+    view.sortByColumn(4, 1)
+    _qt_app.processEvents()
+    rows = model.rowCount()
+    view.close()
+    return rows, calls[0]
+
+# ---- 运行与保存 ----
+
+def git_revision():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+        dirty = bool(subprocess.check_output(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT, text=True).strip())
+        return commit, dirty
+    except Exception:
+        return None, None
+
+def run_stage(name, ctx, repeat):
+    func = globals()[f'stage_{name}']
+    runs, items, trips = [], None, None
+    with RssSampler() as sampler:
+        try:
+            for _ in range(repeat):
+                started = time.perf_counter()
+                items, trips = func(ctx)
+                runs.append(time.perf_counter() - started)
+        except SkipStage as e:
+            return {'skipped': str(e)}
+    return {
+        'runs_s': [round(r, 6) for r in runs],
+        'median_s': round(statistics.median(runs), 6),
+        'min_s': round(min(runs), 6),
+        'items': items,
+        'round_trips': trips,
+        'peak_rss_mb': round(sampler.peak / 1048576, 1) if sampler.peak else None,
+    }
+
+def print_results(results, baseline=None):
+    base_stages = (baseline or {}).get('stages', {})
+    print(f'{"阶段":<22}{"中位数(ms)":>12}{"条目":>8}{"往返":>8}{"峰值内存(MB)":>14}{"对比":>10}')
+    for name, stage in results['stages'].items():
+        if 'skipped' in stage:
+            print(f'{name:<22}  跳过: {stage["skipped"]}')
+            continue
+        change = ''
+        base = base_stages.get(name) or {}
+        if base.get('median_s'):
+            change = f'{(stage["median_s"] / base["median_s"] - 1) * 100:+.1f}%'
+        print(
+            f'{name:<22}{stage["median_s"] * 1000:>12.1f}{stage["items"]:>8}'
+            f'{stage["round_trips"]:>8}{stage["peak_rss_mb"] or "-":>14}{change:>10}'
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description='刷新链路基准测试')
+    parser.add_argument('--articles', type=int, default=200, help='每个账号的文章数')
+    parser.add_argument('--accounts', type=int, default=50, help='批量抓取和账号列表的账号数')
+    parser.add_argument('--latency', type=float, default=0.02, help='每个请求注入的延迟（秒）')
+    parser.add_argument('--concurrency', type=int, default=8, help='批量抓取并发数')
+    parser.add_argument('--repeat', type=int, default=3, help='每个阶段重复次数')
+    parser.add_argument('--stages', default=','.join(STAGES), help='逗号分隔的阶段名')
+    parser.add_argument('--output', help='结果 JSON 路径，默认保存到 benchmarks/results/')
+    parser.add_argument('--compare', help='与之前保存的结果对比')
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f'未知的阶段: {", ".join(sorted(unknown))}')
+
+    logging.basicConfig(level=logging.WARNING)
+    server, base_url = start_stub_server(latency=args.latency, articles=args.articles)
+    # 浏览器路径通过环境变量访问桩服务器，须在导入 src 模块之前设置
+    os.environ['TOUTIAO_MP_BASE_URL'] = base_url
+
+    commit, dirty = git_revision()
+    results = {
+        'meta': {
+            'commit': commit,
+            'dirty': dirty,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'args': vars(args),
+        },
+        'stages': {},
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        ctx = Context(args, server, base_url, workdir)
+        try:
+            for name in stages:
+                results['stages'][name] = run_stage(name, ctx, args.repeat)
+        finally:
+            ctx.close()
+            server.shutdown()
+
+    output = args.output or os.path.join(
+        BENCH_DIR, 'results', f'{time.strftime("%Y%m%d-%H%M%S")}-{commit or "unknown"}.json'
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    print(f'结果已保存: {output}')
+
+if __name__ == '__main__':
+    main()
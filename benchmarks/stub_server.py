@@ -0,0 +1,211 @@
+"""本地创作者中心桩服务器
+
+回放 fixtures 目录下录制的接口 JSON（或按 --articles 生成的文章列表），用于在不访问头条的情况下
+测试 CreatorApi / fetch_articles 的 HTTP 路径、浏览器路径和 HotCrawler 的热榜轮询。
+
+    python benchmarks/stub_server.py --port 8765 --articles 500 --latency 0.05
+    set TOUTIAO_MP_BASE_URL=http://127.0.0.1:8765
+    set TOUTIAO_HOT_BOARD_URL=http://127.0.0.1:8765/hot-event/hot-board/?origin=toutiao_pc
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from email.utils import formatdate
+from html import escape
+from urllib.parse import urlparse, parse_qs
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+ARTICLE_LIST_PATH = '/mp/agw/creator_center/list_v2/'
+ARTICLES_PAGE_PATH = '/profile_v4/graphic/articles'
+
+# 接口路径 -> 录制的响应文件
+ROUTES = {
+    ARTICLE_LIST_PATH: 'article_list.json',
+    ARTICLES_PAGE_PATH: 'article_list.json',
+    '/hot-event/hot-board/': 'hot_board.json',
+}
+
+# 以 HTML 页面返回的路径（由文章列表渲染）
+HTML_PATHS = {ARTICLES_PAGE_PATH}
+
+# 不需要登录 cookie 的路径；浏览器通过 CDP 写入的是头条域名的 cookie，本地页面收不到
+PUBLIC_PATHS = {'/hot-event/hot-board/', ARTICLES_PAGE_PATH}
+
+# 文章页每页显示的条数
+PAGE_SIZE = 20
+
+CARD_HTML = """
+<div class="article-card article-item" data-create-time="{create_time}">
+  <div class="title">{title}</div>
+  <div class="create-time">{publish_time}</div>
+  <div class="raw-stats" style="display:none">
+    <span class="impression">{show}</span><span class="read">{read}</span>
+    <span class="digg">{digg}</span><span class="comment">{comment}</span>
+  </div>
+  <ul class="count"><li>展现 {show}</li><li>阅读 {read}</li><li>点赞 {digg}</li><li>评论 {comment}</li></ul>
+</div>
+"""
+
+def generate_article_list(count, seed=0, now=None):
+    """生成 count 篇文章的接口响应，按发布时间倒序"""
+    rng = random.Random(seed)
+    now = int(now or 1700000000)
+    items = []
+    for i in range(count):
+        show = rng.randint(100, 2000000)
+        read = rng.randint(0, show // 5)
+        items.append({
+            'item_id': str(7300000000000000000 + i),
+            'title': f'基准测试文章 {i}',
+            'create_time': now - i * 3600,
+            'stat': {
+                'impression_count': show,
+                'read_count': read,
+                'digg_count': read // 30,
+                'comment_count': read // 200,
+            },
+        })
+    return {'code': 0, 'message': 'success', 'data': {'has_more': False, 'list': items}}
+
+def render_articles_page(payload, page=1, size=PAGE_SIZE):
+    """把文章列表渲染为与创作者中心相同结构的 HTML 页面"""
+    items = (payload.get('data') or {}).get('list') or []
+    cards = []
+    for item in items[(page - 1) * size:page * size]:
+        stat = item.get('stat') or {}
+        cards.append(CARD_HTML.format(
+            create_time=item.get('create_time', 0),
+            title=escape(item.get('title', '')),
+            publish_time=time.strftime('%Y-%m-%d %H:%M', time.localtime(item.get('create_time', 0))),
+            show=stat.get('impression_count', 0),
+            read=stat.get('read_count', 0),
+            digg=stat.get('digg_count', 0),
+            comment=stat.get('comment_count', 0),
+        ))
+    disabled = '' if page * size < len(items) else ' byte-pagination-item-disabled'
+    pagination = (
+        f'<a class="byte-pagination-item-next{disabled}" href="{ARTICLES_PAGE_PATH}?page={page + 1}">下一页</a>'
+    )
+    return (
+        '<html><head><meta charset="utf-8"><title>文章管理</title></head><body>'
+        f'<div class="article-list">{"".join(cards)}</div>{pagination}</body></html>'
+    )
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    required_cookie = 'sessionid'
+    payloads = {}  # 接口路径 -> 覆盖 fixture 的响应，测试中可随时替换
+    stats = {}     # 路径 -> 请求次数
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+        url = urlparse(self.path)
+        path = url.path
+        self.stats[path] = self.stats.get(path, 0) + 1
+        fixture = ROUTES.get(path)
+        if fixture is None:
+            self.send_error(404)
+            return
+
+        # 未携带登录 cookie 时模拟跳转登录页
+        if path not in PUBLIC_PATHS and f'{self.required_cookie}=' not in self.headers.get('Cookie', ''):
+            self.send_response(302)
+            self.send_header('Location', '/auth/page/login')
+            self.end_headers()
+            return
+
+        # 文章页与文章接口共用同一份数据
+        source = ARTICLE_LIST_PATH if path in HTML_PATHS else path
+        payload, modified = self.load_payload(source, fixture)
+        query = parse_qs(url.query)
+        if path in HTML_PATHS:
+            page = int(query.get('page', ['1'])[0])
+            body = render_articles_page(payload, page).encode('utf-8')
+            content_type = 'text/html; charset=utf-8'
+        else:
+            body = json.dumps(self.paginate(payload, query), ensure_ascii=False).encode('utf-8')
+            content_type = 'application/json; charset=utf-8'
+
+        # 条件请求：内容未变时返回 304
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        last_modified = formatdate(modified, usegmt=True)
+        if self.headers.get('If-None-Match') == etag or (
+            'If-None-Match' not in self.headers and self.headers.get('If-Modified-Since') == last_modified
+        ):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def load_payload(self, path, fixture):
+        """返回 (响应内容, 修改时间)，优先使用内存中的覆盖内容"""
+        override = self.payloads.get(path)
+        if override is not None:
+            return override
+        file_path = os.path.join(FIXTURE_DIR, fixture)
+        with open(file_path, encoding='utf-8') as f:
+            return json.load(f), os.path.getmtime(file_path)
+
+    @staticmethod
+    def paginate(payload, query):
+        """按 page_num / size 切分录制的列表"""
+        data = payload.get('data') or {}
+        if 'list' not in data or 'page_num' not in query:
+            return payload
+        page = int(query['page_num'][0])
+        size = int(query.get('size', ['20'])[0])
+        items = data['list']
+        page_data = dict(data, list=items[(page - 1) * size:page * size], has_more=page * size < len(items))
+        return dict(payload, data=page_data)
+
+    def log_message(self, format, *args):
+        pass
+
+def set_payload(server, path, payload):
+    """替换某个接口的响应内容，用于模拟热榜变化等场景"""
+    server.payloads[path] = (payload, time.time())
+
+def start_stub_server(port=0, latency=0.0, articles=None):
+    """在后台线程启动桩服务器，返回 (server, base_url)
+
+    articles 不为空时文章接口和文章页返回生成的 articles 篇文章，而不是录制的 fixture。
+    server.stats 记录各路径的请求次数。
+    """
+    handler = type('Handler', (StubHandler,), {'latency': latency, 'payloads': {}, 'stats': {}})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.payloads = handler.payloads
+    server.stats = handler.stats
+    if articles:
+        set_payload(server, ARTICLE_LIST_PATH, generate_article_list(articles))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='本地创作者中心桩服务器')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='每个请求注入的延迟（秒）')
+    parser.add_argument('--articles', type=int, default=0, help='生成的文章数，0 表示使用录制的 fixture')
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.port, args.latency, args.articles)
+    print(f'桩服务器已启动: {base_url}')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
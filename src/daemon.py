@@ -0,0 +1,70 @@
+"""无界面的后台刷新进程
+
+按各账号的缓存有效期定时同步文章并写入数据库，界面只需读取缓存即可显示最新数据。
+
+    python src/daemon.py --workers 4
+    python src/daemon.py --once
+    python src/daemon.py --processes 2
+    python src/daemon.py --metrics-port 9108 --metrics-file data/metrics.prom
+"""
+import argparse
+import logging
+import signal
+import sys
+from modules.account_manager import AccountManager
+from services.refresh_scheduler import RefreshScheduler
+from services.session_validator import validate_sessions
+from services.worker_pool import FetchWorkerPool
+from utils import telemetry
+from utils import logger as logger_utils
+
+def setup_logging():
+    """配置日志：后台线程写控制台和 logs/daemon.jsonl"""
+    logger_utils.setup_logging('daemon.jsonl')
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='后台定时刷新所有账号的文章')
+    parser.add_argument('--workers', type=int, default=4, help='同时刷新的账号数')
+    parser.add_argument('--backend', choices=['auto', 'http', 'selenium'], default='auto', help='抓取方式')
+    parser.add_argument('--processes', type=int, default=0,
+                        help='在这么多个独立工作进程中抓取（各自持有浏览器，崩溃或超时后自动重启），0 为不使用')
+    parser.add_argument('--once', action='store_true', help='刷新一轮到期账号后退出')
+    parser.add_argument('--metrics-file', help='定期写入 Prometheus 文本格式统计的文件')
+    parser.add_argument('--metrics-port', type=int, help='在本地端口提供 /metrics')
+    args = parser.parse_args()
+
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    logger.info("启动后台刷新进程")
+
+    exporter = telemetry.start_exporter(args.metrics_file, args.metrics_port)
+    account_manager = AccountManager()
+    pool = None
+    if args.processes > 0:
+        pool = FetchWorkerPool(args.processes, cookie_sink=account_manager.update_cookies)
+    scheduler = RefreshScheduler(account_manager, max_workers=args.workers, backend=args.backend, pool=pool)
+
+    def handle_signal(signum, frame):
+        logger.info(f"收到信号 {signum}，正在停止")
+        scheduler.stop()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+    if hasattr(signal, 'SIGBREAK'):  # Windows 控制台的 Ctrl+Break
+        signal.signal(signal.SIGBREAK, handle_signal)
+
+    try:
+        # 先剔除 cookies 已失效的账号，避免为它们发起抓取；运行中失效的账号由调度器在刷新时标记
+        validate_sessions(account_manager)
+        scheduler.run(once=args.once)
+    finally:
+        if pool:
+            pool.shutdown()
+        account_manager.close()
+        if exporter:
+            exporter.stop()
+        logger.info("后台刷新进程已退出")
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,17 +2,12 @@ import sys
 import logging
 from PyQt5.QtWidgets import QApplication
 from ui.account_manager_ui import AccountManagerUI
+from utils import telemetry
+from utils import logger as logger_utils
 
 def setup_logging():
-    """配置日志"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),  # 输出到控制台
-            logging.FileHandler('app.log', encoding='utf-8')  # 输出到文件
-        ]
-    )
+    """配置日志：后台线程写控制台和 logs/app.jsonl，界面可读取内存中的最近日志"""
+    logger_utils.setup_logging('app.jsonl')
 
 def main():
     """主函数"""
@@ -22,6 +17,9 @@ def main():
         logger = logging.getLogger(__name__)
         logger.info("启动应用程序")
         
+        # 设置了 TOUTIAO_METRICS_FILE / TOUTIAO_METRICS_PORT 时导出运行统计
+        exporter = telemetry.start_exporter()
+        
         # 创建应用
         app = QApplication(sys.argv)
         
@@ -30,7 +28,10 @@ def main():
         window.show()
         
         # 运行应用
-        sys.exit(app.exec_())
+        code = app.exec_()
+        if exporter:
+            exporter.stop()
+        sys.exit(code)
         
     except Exception as e:
         logger = logging.getLogger(__name__)
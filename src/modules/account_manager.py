@@ -1,83 +1,210 @@
-import sqlite3
+from collections import OrderedDict
+import hashlib
 import json
 import logging
 import os
-from datetime import datetime
-from .session_manager import SessionManager
+import threading
+import time
+from .storage import Storage, column_names
+from .metrics_store import MetricsStore, METRIC_FIELDS
+from .profile_store import ProfileStore
+
+def _migrate_v1(cursor):
+    """账号表和文章缓存表"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS accounts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            cookies TEXT,
+            last_login TIMESTAMP,
+            status TEXT
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS articles (
+            username TEXT NOT NULL,
+            article_id TEXT NOT NULL,
+            title TEXT,
+            publish_time TEXT,
+            create_time INTEGER,
+            show_count TEXT,
+            read_count TEXT,
+            digg_count TEXT,
+            comment_count TEXT,
+            updated_at REAL,
+            PRIMARY KEY (username, article_id)
+        )
+    ''')
+
+def _migrate_v2(cursor):
+    """缓存有效期、最近同步时间和增量同步水位"""
+    columns = column_names(cursor, 'accounts')
+    for name, sql_type in (('article_ttl', 'INTEGER'), ('articles_synced_at', 'REAL'),
+                           ('watermark_time', 'INTEGER'), ('watermark_id', 'TEXT')):
+        if name not in columns:
+            cursor.execute(f'ALTER TABLE accounts ADD COLUMN {name} {sql_type}')
+
+def _migrate_v3(cursor):
+    """用户名唯一索引（先清理重复账号，保留最新的一条）"""
+    cursor.execute('''
+        DELETE FROM accounts WHERE id NOT IN (
+            SELECT MAX(id) FROM accounts GROUP BY username
+        )
+    ''')
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_accounts_username ON accounts (username)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_articles_create_time ON articles (username, create_time)')
+
+def _migrate_v4(cursor):
+    """账号行版本号，cookies 变化时自增，用作解码缓存的键"""
+    if 'version' not in column_names(cursor, 'accounts'):
+        cursor.execute('ALTER TABLE accounts ADD COLUMN version INTEGER NOT NULL DEFAULT 0')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_accounts_version
+        AFTER UPDATE OF cookies ON accounts
+        BEGIN
+            UPDATE accounts SET version = OLD.version + 1 WHERE id = NEW.id;
+        END
+    ''')
+
+def _migrate_v5(cursor):
+    """登录状态最近一次检测的时间"""
+    if 'last_check' not in column_names(cursor, 'accounts'):
+        cursor.execute('ALTER TABLE accounts ADD COLUMN last_check REAL')
+    cursor.execute("UPDATE accounts SET status = 'active' WHERE status IS NULL")
+
+# 账号库的结构迁移，按版本号顺序执行
+MIGRATIONS = [
+    (1, _migrate_v1),
+    (2, _migrate_v2),
+    (3, _migrate_v3),
+    (4, _migrate_v4),
+    (5, _migrate_v5),
+]
+
+# 账号状态
+STATUS_ACTIVE = 'active'
+STATUS_EXPIRED = 'expired'
+
+_UNLOADED = object()
 
 class Account:
-    def __init__(self, username, cookies, status=True, last_check_time=None, user_info=None):
+    """账号记录
+
+    列表只加载轻量字段；cookies 在首次访问时通过 loader 解码。
+    """
+    __slots__ = ('username', 'status', 'last_login', 'version', 'last_check', 'id', '_cookies', '_loader')
+
+    def __init__(self, username, cookies=_UNLOADED, status=STATUS_ACTIVE, last_login=None, version=0,
+                 last_check=None, loader=None, id=None):
         self.username = username
-        self.cookies = cookies
+        self.id = id
         self.status = status
-        self.last_check_time = last_check_time or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.user_info = user_info or {}
+        self.last_login = last_login
+        self.version = version
+        self.last_check = last_check
+        self._cookies = cookies
+        self._loader = loader
+
+    @property
+    def cookies(self):
+        if self._cookies is _UNLOADED:
+            self._cookies = self._loader(self) if self._loader else None
+        return self._cookies
+
+    def __repr__(self):
+        return f"Account({self.username!r}, status={self.status!r}, version={self.version})"
+
+    @property
+    def expired(self):
+        return self.status == STATUS_EXPIRED
 
 class AccountManager:
+    # 文章缓存默认有效期（秒），可按账号单独设置
+    DEFAULT_ARTICLE_TTL = 600
+    
+    ARTICLE_FIELDS = ['title', 'publish_time', 'create_time', 'show_count', 'read_count', 'digg_count', 'comment_count']
+    
+    # 已存在的账号重新登录时更新 cookies
+    UPSERT_ACCOUNT_SQL = '''
+        INSERT INTO accounts (username, cookies, last_login, status)
+        VALUES (?, ?, CURRENT_TIMESTAMP, 'active')
+        ON CONFLICT (username) DO UPDATE SET
+            cookies = excluded.cookies,
+            last_login = excluded.last_login,
+            status = excluded.status,
+            last_check = NULL
+    '''
+    
+    # cookies 解码缓存容量（按账号行 id 和行版本缓存）
+    COOKIE_CACHE_SIZE = 256
+    
+    ACCOUNT_COLUMNS = 'username, status, last_login, version, last_check, id'
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.logger.info("初始化 AccountManager")
         
-        # 初始化 SessionManager
-        self.session_manager = SessionManager()  # 改为 session_manager
+        self._cookie_cache = OrderedDict()
+        self._cookie_lock = threading.Lock()
         
-        # 初始化数据库
-        self.db_path = os.path.join('data', 'accounts.db')
-        os.makedirs('data', exist_ok=True)
-        
-        self.conn = sqlite3.connect(self.db_path)
-        self.cursor = self.conn.cursor()
+        # SessionManager 第一次使用时才创建，启动时不导入 Selenium
+        self._session_manager = None
+        self._session_lock = threading.Lock()
         
-        # 修改账号表结构，添加 cookies 字段
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS accounts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT NOT NULL,
-                cookies TEXT,
-                last_login TIMESTAMP,
-                status TEXT
-            )
-        ''')
-        self.conn.commit()
+        # 初始化数据库：每线程独立连接，后台抓取线程和界面可以同时读写
+        self.db_path = os.path.join('data', 'accounts.db')
+        self.storage = Storage(self.db_path, MIGRATIONS)
         self.logger.info(f"数据库初始化成功: {os.path.abspath(self.db_path)}")
+        
+        # 文章统计数据的时间序列
+        self.metrics = MetricsStore(os.path.join('data', 'metrics.db'))
+
+    @property
+    def session_manager(self):
+        """浏览器会话管理器，第一次访问时导入 Selenium 并创建"""
+        if self._session_manager is None:
+            with self._session_lock:
+                if self._session_manager is None:
+                    from .session_manager import SessionManager
+                    self._session_manager = SessionManager(cookie_sink=self.update_cookies)
+        return self._session_manager
+
+    def close(self):
+        """释放浏览器池（已创建时）和数据库连接"""
+        if self._session_manager is not None:
+            self._session_manager.close()
+        self.storage.close()
+        self.metrics.storage.close()
+
+    @staticmethod
+    def _encode_cookies(cookies):
+        """把 cookies 规范为 JSON 字符串，格式错误时抛出 ValueError"""
+        if isinstance(cookies, (list, dict)):
+            return json.dumps(cookies)
+        if isinstance(cookies, str):
+            # 验证是否为有效的 JSON 字符串
+            try:
+                json.loads(cookies)
+            except json.JSONDecodeError:
+                raise ValueError('Invalid cookies format')
+            return cookies
+        raise ValueError('Invalid cookies type')
 
     def add_account(self, username, cookies):
-        """添加新账号"""
+        """添加新账号（已存在时更新 cookies）"""
         try:
-            # 检查账号是否已存在
-            self.cursor.execute('SELECT * FROM accounts WHERE username = ?', (username,))
-            if self.cursor.fetchone():
-                return {
-                    'success': False,
-                    'error': '账号已存在'
-                }
-
-            # 确保 cookies 是正确的 JSON 格式
-            if isinstance(cookies, (list, dict)):
-                cookies_str = json.dumps(cookies)
-            elif isinstance(cookies, str):
-                # 验证是否为有效的 JSON 字符串
-                try:
-                    json.loads(cookies)
-                    cookies_str = cookies
-                except json.JSONDecodeError:
-                    return {
-                        'success': False,
-                        'error': 'Invalid cookies format'
-                    }
-            else:
-                return {
-                    'success': False,
-                    'error': 'Invalid cookies type'
-                }
-
-            # 保存账号信息
-            self.cursor.execute('''
-                INSERT INTO accounts (username, cookies, last_login, status)
-                VALUES (?, ?, CURRENT_TIMESTAMP, 'active')
-            ''', (username, cookies_str))
-            self.conn.commit()
-
+            cookies_str = self._encode_cookies(cookies)
+        except ValueError as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+        
+        try:
+            self.storage.execute(self.UPSERT_ACCOUNT_SQL, (username, cookies_str))
+            self._evict_cookies(username)
+            # 重新登录后浏览器目录中的旧登录状态作废，下次抓取时重新写入新的 cookies
+            self._remove_profile(username)
             return {
                 'success': True,
                 'message': '账号添加成功'
@@ -90,67 +217,91 @@ class AccountManager:
                 'error': str(e)
             }
 
-    def get_account(self, username):
-        """获取账号信息"""
+    def update_cookies(self, username, cookies):
+        """写回浏览器中更新后的 cookies，不改变登录时间和状态"""
         try:
-            self.cursor.execute('SELECT username, cookies, last_login, status FROM accounts WHERE username = ?', (username,))
-            row = self.cursor.fetchone()
-            
-            if row:
-                username, cookies_str, last_login, status = row
-                try:
-                    cookies = json.loads(cookies_str) if cookies_str else None
-                except json.JSONDecodeError:
-                    self.logger.error(f"解析 cookies 失败，账号: {username}")
-                    cookies = None
-                    
-                return {
-                    'username': username,
-                    'cookies': cookies,
-                    'last_login': last_login,
-                    'status': status
-                }
+            cookies_str = self._encode_cookies(cookies)
+            self.storage.execute(
+                'UPDATE accounts SET cookies = ? WHERE username = ? AND cookies IS NOT ?',
+                (cookies_str, username, cookies_str)
+            )
+        except Exception as e:
+            self.logger.error(f"更新账号 {username} 的 cookies 失败: {str(e)}")
+
+    def add_accounts(self, accounts):
+        """批量添加或更新账号，accounts 为 (username, cookies) 序列，返回写入条数"""
+        rows = []
+        for username, cookies in accounts:
+            try:
+                rows.append((username, self._encode_cookies(cookies)))
+            except ValueError as e:
+                self.logger.warning(f"跳过账号 {username}: {str(e)}")
+        if rows:
+            self.storage.executemany(self.UPSERT_ACCOUNT_SQL, rows)
+            for username, _ in rows:
+                self._evict_cookies(username)
+                self._remove_profile(username)
+        return len(rows)
+
+    def _account_from_row(self, row):
+        username, status, last_login, version, last_check, row_id = row
+        return Account(username, status=status, last_login=last_login, version=version,
+                       last_check=last_check, loader=self._load_cookies, id=row_id)
+
+    def _evict_cookies(self, username):
+        """删除或重新写入账号时清掉它的 cookies 缓存"""
+        with self._cookie_lock:
+            for key in [key for key, (name, _) in self._cookie_cache.items() if name == username]:
+                del self._cookie_cache[key]
+
+    def _load_cookies(self, account):
+        """解码账号 cookies，按 (行 id, version) 做 LRU 缓存
+
+        删除后重新添加的账号是新的一行，version 从 0 重新开始，只按用户名和版本缓存会取到旧 cookies。
+        """
+        key = (account.id, account.version)
+        with self._cookie_lock:
+            if account.id is not None and key in self._cookie_cache:
+                self._cookie_cache.move_to_end(key)
+                return self._cookie_cache[key][1]
+        
+        row = self.storage.query_one('SELECT id, cookies, version FROM accounts WHERE username = ?', (account.username,))
+        if not row:
             return None
+        row_id, cookies_str, version = row
+        key = (row_id, version)
+        try:
+            cookies = json.loads(cookies_str) if cookies_str else None
+        except (TypeError, json.JSONDecodeError):
+            self.logger.error(f"解析 cookies 失败，账号: {account.username}")
+            cookies = None
+        
+        with self._cookie_lock:
+            self._cookie_cache[key] = (account.username, cookies)
+            self._cookie_cache.move_to_end(key)
+            while len(self._cookie_cache) > self.COOKIE_CACHE_SIZE:
+                self._cookie_cache.popitem(last=False)
+        return cookies
+
+    def get_account(self, username):
+        """获取账号信息（cookies 首次访问时解码）"""
+        try:
+            row = self.storage.query_one(
+                f'SELECT {self.ACCOUNT_COLUMNS} FROM accounts WHERE username = ?',
+                (username,)
+            )
+            return self._account_from_row(row) if row else None
             
         except Exception as e:
             self.logger.error(f"Error getting account: {str(e)}")
             return None
 
     def get_all_accounts(self):
-        """获取所有账号列表"""
+        """获取所有账号列表（只查询轻量字段）"""
         try:
             self.logger.info("获取所有账号列表")
-            accounts = []
-            
-            self.cursor.execute('SELECT username, cookies, last_login, status FROM accounts')
-            rows = self.cursor.fetchall()
-            
-            for row in rows:
-                try:
-                    username, cookies_str, last_login, status = row
-                    
-                    # 尝试解析 cookies
-                    try:
-                        if cookies_str and isinstance(cookies_str, str):
-                            cookies = json.loads(cookies_str)
-                        else:
-                            cookies = None
-                    except json.JSONDecodeError as e:
-                        self.logger.error(f"解析 cookies 失败: {str(e)}, 数据: {cookies_str}")
-                        cookies = None
-                    
-                    account = {
-                        'username': username,
-                        'cookies': cookies,
-                        'last_login': last_login,
-                        'status': status
-                    }
-                    accounts.append(account)
-                    
-                except Exception as e:
-                    self.logger.error(f"处理账号数据时出错: {str(e)}")
-                    continue
-            
+            rows = self.storage.query(f'SELECT {self.ACCOUNT_COLUMNS} FROM accounts ORDER BY id')
+            accounts = [self._account_from_row(row) for row in rows]
             self.logger.info(f"成功获取所有账号，共 {len(accounts)} 个")
             return accounts
             
@@ -163,13 +314,12 @@ class AccountManager:
         try:
             self.logger.info(f"删除账号: {username}")
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('DELETE FROM accounts WHERE username = ?', (username,))
-            
-            conn.commit()
-            conn.close()
+            with self.storage.transaction() as cursor:
+                cursor.execute('DELETE FROM accounts WHERE username = ?', (username,))
+                cursor.execute('DELETE FROM articles WHERE username = ?', (username,))
+            self._evict_cookies(username)
+            self.metrics.delete_account(username)
+            self._remove_profile(username)
             
             self.logger.info(f"账号删除成功: {username}")
             return True
@@ -178,27 +328,36 @@ class AccountManager:
             self.logger.error(f"删除账号失败: {str(e)}")
             return False
 
+    def _remove_profile(self, username):
+        """删除账号的浏览器目录
+
+        已创建 SessionManager 时由它的 ProfileStore 删除（正在使用的目录保留）；
+        否则直接删除磁盘上的目录，不为此导入 Selenium。
+        """
+        if self._session_manager is not None:
+            if self._session_manager.profiles:
+                self._session_manager.profiles.remove(username)
+        elif os.path.isdir(ProfileStore.ROOT):
+            ProfileStore().remove(username)
+
     def _repair_database(self):
         """修复数据库中的错误数据"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # 获取所有账号
-            cursor.execute('SELECT username, cookies FROM accounts')
-            rows = cursor.fetchall()
+            rows = self.storage.query('SELECT username, cookies FROM accounts')
             
+            broken = []
             for username, cookies_str in rows:
                 try:
                     # 尝试解析数据
                     json.loads(cookies_str)
-                except json.JSONDecodeError:
+                except (TypeError, json.JSONDecodeError):
                     self.logger.warning(f"发现错误的 cookies 数据，正在修复账号: {username}")
-                    # 删除错误数据
-                    cursor.execute('DELETE FROM accounts WHERE username = ?', (username,))
-                    
-            conn.commit()
-            conn.close()
+                    broken.append((username,))
+            
+            # 删除错误数据
+            if broken:
+                self.storage.executemany('DELETE FROM accounts WHERE username = ?', broken)
             
         except Exception as e:
             self.logger.error(f"修复数据库失败: {str(e)}")
@@ -229,4 +388,211 @@ class AccountManager:
                 
         except Exception as e:
             self.logger.error(f"获取文章列表失败: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+
+    @staticmethod
+    def article_key(article: dict) -> str:
+        """文章缓存主键，页面抓取没有 id 时用标题和发布时间戳（精确到分钟）生成
+
+        不使用页面上的发布时间文本："今天 10:00" 这样的相对时间第二天就变了。
+        """
+        if article.get('article_id'):
+            return str(article['article_id'])
+        create_time = article.get('create_time') or 0
+        stamp = create_time // 60 * 60 if create_time else article.get('publish_time', '')
+        raw = f"{article.get('title', '')}|{stamp}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+    def article_keys(self, username: str, articles: list) -> list:
+        """各文章的缓存主键
+
+        页面抓取的文章没有 id，缓存中已有同标题、同一分钟发布的文章（通常来自接口）时沿用其 id，
+        两种抓取方式交替使用也不会产生重复行。
+        """
+        keys = [self.article_key(article) for article in articles]
+        scraped = [i for i, article in enumerate(articles)
+                   if not article.get('article_id') and article.get('create_time')]
+        if not scraped:
+            return keys
+        rows = self.storage.query(
+            'SELECT article_id, title, create_time FROM articles WHERE username = ? AND create_time > 0',
+            (username,)
+        )
+        known = {(title, create_time // 60): article_id for article_id, title, create_time in rows}
+        for i in scraped:
+            article = articles[i]
+            keys[i] = known.get((article.get('title'), article['create_time'] // 60), keys[i])
+        return keys
+
+    def get_cached_articles(self, username: str) -> list:
+        """读取缓存的文章列表（按发布时间倒序）"""
+        try:
+            rows = self.storage.query(f'''
+                SELECT article_id, {', '.join(self.ARTICLE_FIELDS)} FROM articles
+                WHERE username = ?
+                ORDER BY create_time DESC, publish_time DESC
+            ''', (username,))
+            articles = []
+            for row in rows:
+                article = dict(zip(['article_id'] + self.ARTICLE_FIELDS, row))
+                articles.append(article)
+            return articles
+        except Exception as e:
+            self.logger.error(f"读取文章缓存失败: {str(e)}")
+            return []
+
+    def get_article_batch(self, usernames: list = None) -> 'ArticleBatch':
+        """把缓存的文章读成按列存放的 ArticleBatch，usernames 为空时包含所有账号"""
+        from .article_metrics import ArticleBatch
+        sql = 'SELECT username, article_id, title, create_time, ' + ', '.join(METRIC_FIELDS) + ' FROM articles'
+        params = ()
+        if usernames:
+            sql += f" WHERE username IN ({', '.join('?' * len(usernames))})"
+            params = tuple(usernames)
+        rows = self.storage.query(sql + ' ORDER BY username', params)
+
+        accounts, account_index = [], []
+        for row in rows:
+            if not accounts or accounts[-1] != row[0]:
+                accounts.append(row[0])
+            account_index.append(len(accounts) - 1)
+        columns = list(zip(*rows)) or [()] * (4 + len(METRIC_FIELDS))
+        return ArticleBatch.from_columns(
+            accounts, account_index, columns[1], columns[2],
+            [value or 0 for value in columns[3]],
+            {field: columns[4 + i] for i, field in enumerate(METRIC_FIELDS)}
+        )
+
+    def save_articles(self, username: str, articles: list, since: int = None):
+        """把最新抓取结果写入文章缓存，并推进同步水位
+
+        since 为 None 表示全量结果，缓存中其余文章全部删除；
+        否则只删除发布时间不早于 since、但本次未出现的文章（视为已删除）。
+        """
+        self.save_articles_batch([(username, articles, since)])
+
+    def save_articles_batch(self, batch):
+        """在一个事务里写入多个账号的抓取结果，batch 为 (username, articles, since) 序列"""
+        fields = ', '.join(self.ARTICLE_FIELDS)
+        updates = ', '.join(f'{field} = excluded.{field}' for field in self.ARTICLE_FIELDS)
+        upsert_sql = f'''
+            INSERT INTO articles (username, article_id, {fields}, updated_at)
+            VALUES (?, ?, {', '.join('?' * len(self.ARTICLE_FIELDS))}, ?)
+            ON CONFLICT (username, article_id) DO UPDATE SET
+                {updates}, updated_at = excluded.updated_at
+        '''
+        
+        try:
+            now = time.time()
+            with self.storage.transaction() as cursor:
+                for username, articles, since in batch:
+                    keys = self.article_keys(username, articles)
+                    cursor.executemany(upsert_sql, [
+                        [username, key] + [article.get(field) for field in self.ARTICLE_FIELDS] + [now]
+                        for key, article in zip(keys, articles)
+                    ])
+                    
+                    # 删除已不存在的文章
+                    condition = 'username = ?'
+                    params = [username]
+                    if since is not None:
+                        condition += ' AND create_time >= ?'
+                        params.append(since)
+                    if keys:
+                        condition += f" AND article_id NOT IN ({', '.join('?' * len(keys))})"
+                        params += keys
+                    cursor.execute(f'DELETE FROM articles WHERE {condition}', params)
+                    
+                    # 推进水位
+                    newest = cursor.execute('''
+                        SELECT create_time, article_id FROM articles
+                        WHERE username = ? ORDER BY create_time DESC LIMIT 1
+                    ''', (username,)).fetchone() or (None, None)
+                    
+                    cursor.execute('''
+                        UPDATE accounts SET articles_synced_at = ?, watermark_time = ?, watermark_id = ?
+                        WHERE username = ?
+                    ''', (now, newest[0], newest[1], username))
+        except Exception as e:
+            self.logger.error(f"保存文章缓存失败: {str(e)}")
+
+    def record_metrics(self, username: str, articles: list, ts: int = None):
+        """把本次抓取到的统计数据追加为时间序列快照"""
+        from .article_metrics import parse_counts
+        try:
+            keys = self.article_keys(username, articles)
+            columns = [parse_counts([article.get(field) for article in articles]).tolist() for field in METRIC_FIELDS]
+            self.metrics.record(username, list(zip(keys, *columns)), ts)
+        except Exception as e:
+            self.logger.error(f"记录统计快照失败: {str(e)}")
+
+    def get_watermark(self, username: str):
+        """获取增量同步水位 (create_time, article_id)，从未同步时返回 None"""
+        row = self.storage.query_one(
+            'SELECT watermark_time, watermark_id FROM accounts WHERE username = ?',
+            (username,)
+        )
+        if not row or not row[0]:
+            return None
+        return row[0], row[1]
+
+    def set_article_ttl(self, username: str, ttl: int):
+        """设置账号的文章缓存有效期（秒），None 表示使用默认值"""
+        self.storage.execute('UPDATE accounts SET article_ttl = ? WHERE username = ?', (ttl, username))
+
+    def is_articles_stale(self, username: str) -> bool:
+        """文章缓存是否已过期（从未同步也视为过期）"""
+        row = self.storage.query_one(
+            'SELECT article_ttl, articles_synced_at FROM accounts WHERE username = ?',
+            (username,)
+        )
+        if not row or row[1] is None:
+            return True
+        ttl = row[0] if row[0] is not None else self.DEFAULT_ARTICLE_TTL
+        return time.time() - row[1] >= ttl
+
+    def get_refresh_schedule(self) -> list:
+        """各账号下次需要刷新文章的时间，返回 [(username, 到期时间戳, ttl), ...]，从未同步的到期时间为 0
+
+        cookies 已失效的账号不参与刷新。
+        """
+        rows = self.storage.query(
+            'SELECT username, article_ttl, articles_synced_at FROM accounts WHERE status IS NOT ? ORDER BY id',
+            (STATUS_EXPIRED,)
+        )
+        schedule = []
+        for username, ttl, synced_at in rows:
+            ttl = ttl if ttl is not None else self.DEFAULT_ARTICLE_TTL
+            schedule.append((username, (synced_at + ttl) if synced_at is not None else 0, ttl))
+        return schedule
+
+    def update_statuses(self, results: list, checked_at: float = None):
+        """批量写入登录状态检测结果，results 为 [(username, status), ...]"""
+        checked_at = checked_at or time.time()
+        self.storage.executemany(
+            'UPDATE accounts SET status = ?, last_check = ? WHERE username = ?',
+            [(status, checked_at, username) for username, status in results]
+        )
+
+    def invalidate_articles(self, username: str = None, purge: bool = False):
+        """使文章缓存失效；purge 为 True 时同时删除缓存的文章"""
+        try:
+            with self.storage.transaction() as cursor:
+                if username is None:
+                    cursor.execute('UPDATE accounts SET articles_synced_at = NULL')
+                    if purge:
+                        cursor.execute('DELETE FROM articles')
+                        cursor.execute('UPDATE accounts SET watermark_time = NULL, watermark_id = NULL')
+                else:
+                    cursor.execute(
+                        'UPDATE accounts SET articles_synced_at = NULL WHERE username = ?',
+                        (username,)
+                    )
+                    if purge:
+                        cursor.execute('DELETE FROM articles WHERE username = ?', (username,))
+                        cursor.execute(
+                            'UPDATE accounts SET watermark_time = NULL, watermark_id = NULL WHERE username = ?',
+                            (username,)
+                        )
+        except Exception as e:
+            self.logger.error(f"清除文章缓存失败: {str(e)}")
@@ -1,8 +1,24 @@
+import asyncio
+
 class AIWriter:
-    def __init__(self, api_key):
+    def __init__(self, api_key, engine=None):
         self.api_key = api_key
+        self.engine = engine  # services.async_engine.AsyncEngine，在其事件循环上运行协程
     
     async def rewrite_article(self, original_content):
         """文章仿写"""
         # 实现 AI 仿写逻辑
-        pass 
\ No newline at end of file
+        pass
+    
+    def submit_rewrite(self, original_content, timeout=None):
+        """在引擎的事件循环上提交仿写任务，返回可取消的 Future"""
+        if self.engine is None:
+            raise RuntimeError("AIWriter 未绑定异步引擎")
+        return self.engine.submit(self.rewrite_article(original_content), timeout)
+    
+    def rewrite(self, original_content, timeout=None):
+        """同步调用：没有引擎时使用临时事件循环"""
+        if self.engine is not None:
+            return self.submit_rewrite(original_content, timeout).result()
+        coro = self.rewrite_article(original_content)
+        return asyncio.run(asyncio.wait_for(coro, timeout) if timeout else coro)
@@ -0,0 +1,133 @@
+"""文章统计数据的数值化与聚合
+
+抓取得到的计数是 '1.2万'、'3,456'、'-' 这类显示文本。这里把整批文本
+一次性转换为整数数组，组装成按列存放的 ArticleBatch，再用 NumPy
+计算各账号的合计、均值、阅读/展现比和 Top N。
+"""
+import numpy as np
+from .dom_extractor import COUNT_PATTERN, COUNT_UNITS
+from .metrics_store import METRIC_FIELDS
+
+def parse_counts(values):
+    """把一批计数文本转换为 int64 数组，无法识别的（空值、'-' 等）记为 0
+
+    dom_extractor.parse_count 的批量版本，共用 COUNT_PATTERN 和 COUNT_UNITS。
+    """
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.int64)
+    text = np.asarray([str(v).replace(',', '') if v is not None else '' for v in values], dtype=str)
+    text = np.char.strip(text)
+    # 逐个用 COUNT_PATTERN 校验，'1亿万'、'²' 这类文本记为 0，不会叠加单位或让 astype 抛异常
+    valid = np.fromiter((COUNT_PATTERN.fullmatch(t) is not None for t in text.tolist()), dtype=bool, count=len(text))
+    text = np.where(valid, text, '0')
+
+    multiplier = np.ones(len(text), dtype=np.float64)
+    for unit, scale in COUNT_UNITS.items():
+        mask = np.char.endswith(text, unit)
+        multiplier[mask] = scale
+        text = np.where(mask, np.char.rstrip(text, unit), text)
+
+    numbers = text.astype(np.float64)
+    return np.rint(numbers * multiplier).astype(np.int64)
+
+class ArticleBatch:
+    """按列存放的一批文章
+
+    accounts 为账号名数组，account_index 为每篇文章所属账号的下标，
+    counts 为 (文章数, len(METRIC_FIELDS)) 的 int64 矩阵。
+    """
+
+    __slots__ = ('accounts', 'account_index', 'article_ids', 'titles', 'create_time', 'counts')
+
+    def __init__(self, accounts, account_index, article_ids, titles, create_time, counts):
+        self.accounts = accounts
+        self.account_index = account_index
+        self.article_ids = article_ids
+        self.titles = titles
+        self.create_time = create_time
+        self.counts = counts
+
+    def __len__(self):
+        return len(self.account_index)
+
+    @classmethod
+    def from_articles(cls, articles_by_account, key_func=None):
+        """由 {username: [文章字典, ...]} 构建"""
+        accounts = list(articles_by_account)
+        account_index, article_ids, titles, create_time = [], [], [], []
+        raw = {field: [] for field in METRIC_FIELDS}
+
+        for index, username in enumerate(accounts):
+            for article in articles_by_account[username]:
+                account_index.append(index)
+                article_ids.append(key_func(article) if key_func else article.get('article_id'))
+                titles.append(article.get('title', ''))
+                create_time.append(article.get('create_time') or 0)
+                for field in METRIC_FIELDS:
+                    raw[field].append(article.get(field))
+
+        return cls.from_columns(accounts, account_index, article_ids, titles, create_time, raw)
+
+    @classmethod
+    def from_columns(cls, accounts, account_index, article_ids, titles, create_time, raw_counts):
+        """由列数据构建，raw_counts 为 {字段: 计数文本列表}"""
+        counts = np.column_stack([parse_counts(raw_counts[field]) for field in METRIC_FIELDS]) \
+            if len(account_index) else np.zeros((0, len(METRIC_FIELDS)), dtype=np.int64)
+        return cls(
+            np.asarray(accounts, dtype=object),
+            np.asarray(account_index, dtype=np.int64),
+            np.asarray(article_ids, dtype=object),
+            np.asarray(titles, dtype=object),
+            np.asarray(create_time, dtype=np.int64),
+            counts,
+        )
+
+    def column(self, field):
+        """某个计数字段的整列"""
+        return self.counts[:, METRIC_FIELDS.index(field)]
+
+    def aggregate(self):
+        """各账号的文章数、合计、均值和阅读/展现比"""
+        n_accounts = len(self.accounts)
+        articles = np.bincount(self.account_index, minlength=n_accounts)
+        totals = np.stack([
+            np.bincount(self.account_index, weights=self.counts[:, i], minlength=n_accounts)
+            for i in range(len(METRIC_FIELDS))
+        ], axis=1).astype(np.int64) if n_accounts else np.zeros((0, len(METRIC_FIELDS)), dtype=np.int64)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = np.where(articles[:, None] > 0, totals / np.maximum(articles[:, None], 1), 0.0)
+            read = totals[:, METRIC_FIELDS.index('read_count')]
+            show = totals[:, METRIC_FIELDS.index('show_count')]
+            ratio = np.where(show > 0, read / np.maximum(show, 1), 0.0)
+
+        summary = {}
+        for i, username in enumerate(self.accounts):
+            summary[username] = {
+                'articles': int(articles[i]),
+                'totals': {field: int(totals[i, j]) for j, field in enumerate(METRIC_FIELDS)},
+                'means': {field: float(means[i, j]) for j, field in enumerate(METRIC_FIELDS)},
+                'read_show_ratio': float(ratio[i]),
+            }
+        return summary
+
+    def top(self, n=10, field='read_count', username=None):
+        """按某个字段取前 n 篇，返回 [(username, article_id, title, 数值), ...]"""
+        values = self.column(field)
+        indices = np.arange(len(self))
+        if username is not None:
+            matches = np.nonzero(self.accounts == username)[0]
+            if not len(matches):
+                return []
+            indices = indices[self.account_index == matches[0]]
+        if not len(indices):
+            return []
+
+        n = min(n, len(indices))
+        # argpartition 取前 n，再对这 n 个排序
+        part = indices[np.argpartition(-values[indices], n - 1)[:n]]
+        order = part[np.argsort(-values[part], kind='stable')]
+        return [
+            (self.accounts[self.account_index[i]], self.article_ids[i], self.titles[i], int(values[i]))
+            for i in order
+        ]
@@ -0,0 +1,178 @@
+import requests
+from requests.adapters import HTTPAdapter
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
+from datetime import datetime
+from .dom_extractor import reached_cutoff
+import json
+import logging
+import os
+import threading
+import time
+
+class CreatorApiError(Exception):
+    """创作者中心接口调用失败（cookies 失效、接口变更等）"""
+
+class SessionExpiredError(CreatorApiError):
+    """cookies 已失效，需要重新登录"""
+
+class CreatorApi:
+    """头条创作者中心 JSON 接口客户端
+
+    直接复用账号保存的 cookies 调用接口，不启动浏览器。
+    每个线程保留一个长期的会话，共享同一个连接池，连接在账号之间复用；
+    cookies 随每次请求传入，会话本身不保存任何账号的 cookies。
+    base_url 可指向本地桩服务器用于测试。
+    """
+
+    BASE_URL = os.environ.get('TOUTIAO_MP_BASE_URL', 'https://mp.toutiao.com')
+    ARTICLE_LIST_PATH = '/mp/agw/creator_center/list_v2/'
+
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36'
+
+    def __init__(self, base_url=None, timeout=10, pool_size=10):
+        self.logger = logging.getLogger(__name__)
+        self.base_url = (base_url or self.BASE_URL).rstrip('/')
+        self.timeout = timeout
+
+        # 所有账号共用一个连接池
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._local = threading.local()
+
+    def _cookie_domain(self, domain):
+        """桩服务器等非头条域名下改为 host-only cookie"""
+        host = urlparse(self.base_url).hostname or ''
+        if domain and host.endswith(domain.lstrip('.')):
+            return domain
+        return ''
+
+    @property
+    def session(self):
+        """当前线程的会话，挂载共享的连接池
+
+        会话的 cookie 策略拒绝所有响应中的 Set-Cookie，避免一个账号的 cookies 带到下一个账号。
+        不要关闭它：关闭会话会同时关闭共享的连接池。
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('http://', self.adapter)
+            session.mount('https://', self.adapter)
+            session.headers.update({
+                'User-Agent': self.USER_AGENT,
+                'Accept': 'application/json, text/plain, */*',
+                'Referer': f'{self.base_url}/profile_v4/graphic/articles',
+            })
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            self._local.session = session
+        return session
+
+    def cookie_jar(self, cookies):
+        """把账号保存的 cookies 转为随请求发送的 cookie jar"""
+        if isinstance(cookies, str):
+            cookies = json.loads(cookies)
+
+        jar = requests.cookies.RequestsCookieJar()
+        for cookie in cookies or []:
+            if isinstance(cookie, str):
+                cookie = json.loads(cookie)
+            if 'name' in cookie and 'value' in cookie:
+                jar.set(
+                    cookie['name'],
+                    cookie['value'],
+                    domain=self._cookie_domain(cookie.get('domain', '.toutiao.com')),
+                    path=cookie.get('path', '/')
+                )
+        return jar
+
+    def get_json(self, jar, path, params=None):
+        """带上账号的 cookie jar 请求接口并校验返回"""
+        response = self.session.get(
+            f'{self.base_url}{path}',
+            params=params,
+            cookies=jar,
+            timeout=self.timeout,
+            allow_redirects=False
+        )
+
+        # 跳转到登录页说明 cookies 已失效
+        if response.is_redirect or response.status_code in (401, 403):
+            raise SessionExpiredError(f"登录状态失效: HTTP {response.status_code}")
+        if response.status_code != 200:
+            raise CreatorApiError(f"接口返回异常: HTTP {response.status_code}")
+
+        try:
+            payload = response.json()
+        except ValueError:
+            raise CreatorApiError("接口未返回 JSON")
+
+        code = payload.get('code', payload.get('err_no', 0))
+        if code != 0:
+            raise CreatorApiError(f"接口返回错误: {code} {payload.get('message', '')}")
+        return payload.get('data') or {}
+
+    def list_articles(self, cookies, page=1, size=20):
+        """获取一页文章，返回 (文章列表, 是否还有更多)"""
+        data = self.get_json(self.cookie_jar(cookies), self.ARTICLE_LIST_PATH, {
+            'type': 2,
+            'page_num': page,
+            'size': size,
+        })
+
+        items = data.get('list') or data.get('content') or []
+        articles = [self.to_article(item) for item in items]
+        return articles, bool(data.get('has_more'))
+
+    def check_session(self, cookies):
+        """用最小的一页文章请求检查 cookies 是否仍然有效
+
+        有效返回 True，已失效返回 False；网络错误等无法判断时抛出异常。
+        """
+        try:
+            self.list_articles(cookies, page=1, size=1)
+            return True
+        except SessionExpiredError:
+            return False
+
+    def fetch_articles(self, cookies, size=20, max_pages=1, stop_before=None, deadline=None):
+        """逐页获取文章，返回与页面抓取一致的文章字典
+
+        某页出现早于 stop_before（时间戳）的文章或没有更多时停止翻页；
+        超过 deadline（time.monotonic() 时间）后不再请求下一页，抛出 TimeoutError。
+        """
+        started = time.monotonic()
+        articles = []
+        for page in range(1, max_pages + 1):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"超过抓取时限，已获取 {page - 1} 页")
+            page_articles, has_more = self.list_articles(cookies, page=page, size=size)
+            articles.extend(page_articles)
+            if not has_more or not page_articles:
+                break
+            if reached_cutoff(page_articles, stop_before):
+                break
+        self.logger.info(f"HTTP 获取 {len(articles)} 篇文章（{page} 页），用时 {time.monotonic() - started:.2f}s")
+        return articles
+
+    @staticmethod
+    def to_article(item):
+        """把接口条目转换为文章字典"""
+        stat = item.get('stat') or item
+
+        def count(*keys):
+            for key in keys:
+                if stat.get(key) is not None:
+                    return str(stat[key])
+            return '0'
+
+        create_time = int(item.get('create_time') or item.get('publish_time') or 0)
+        return {
+            'article_id': str(item.get('item_id') or item.get('id') or item.get('gid') or ''),
+            'title': (item.get('title') or '').strip(),
+            'create_time': create_time,
+            'publish_time': datetime.fromtimestamp(create_time).strftime('%Y-%m-%d %H:%M') if create_time else '-',
+            'show_count': count('impression_count', 'show_count'),
+            'read_count': count('read_count', 'go_detail_count'),
+            'digg_count': count('digg_count', 'like_count'),
+            'comment_count': count('comment_count'),
+        }
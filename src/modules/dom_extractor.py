@@ -0,0 +1,183 @@
+from datetime import datetime, timedelta
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# 在页面内一次性提取所有卡片的字段，避免逐个元素调用 WebDriver
+EXTRACT_ROWS_JS = """
+var spec = arguments[0];
+var cards = [], used = null;
+function find(sel) {
+    if (sel.charAt(0) === '/' || sel.charAt(0) === '(') {
+        var snap = document.evaluate(sel, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var n = 0; n < snap.snapshotLength; n++) nodes.push(snap.snapshotItem(n));
+        return nodes;
+    }
+    return document.querySelectorAll(sel);
+}
+for (var i = 0; i < spec.cards.length; i++) {
+    try { cards = find(spec.cards[i]); } catch (e) { cards = []; }
+    if (cards.length) { used = spec.cards[i]; break; }
+}
+function text(el) {
+    return el ? (el.innerText || el.textContent || '').trim() : null;
+}
+function pick(card, sel) {
+    try { if (card.matches(sel)) return card; } catch (e) {}
+    return card.querySelector(sel);
+}
+var rows = [];
+for (var c = 0; c < cards.length; c++) {
+    var card = cards[c], row = {}, key;
+    for (key in spec.fields) row[key] = text(pick(card, spec.fields[key]));
+    for (key in spec.lists) row[key] = Array.prototype.map.call(card.querySelectorAll(spec.lists[key]), text);
+    for (key in spec.attrs) row[key] = card.getAttribute(spec.attrs[key]);
+    rows.push(row);
+}
+return {selector: used, rows: rows};
+"""
+
+class LastResort(str):
+    """最后才尝试的宽泛选择器：可以命中，但不写入选择器缓存
+
+    例如 //div[contains(@class, "article")] 可能先命中卡片渲染前就存在的外层容器，
+    缓存后每次都会优先使用它。
+    """
+
+# 各版本页面使用过的文章卡片选择器；最后一个只匹配标题链接，卡片本身就是标题
+ARTICLE_SELECTORS = [".article-card", ".byte-table-tbody tr", ".article-list-item",
+                     LastResort("[data-log-click='article_title']")]
+
+# 卡片中的标题；卡片本身匹配时（标题链接作为卡片）取卡片自身
+TITLE_SELECTOR = ".title, [data-log-click='article_title']"
+
+# 统计项文字 -> 文章字段
+STAT_LABELS = {
+    '展现': 'show_count',
+    '阅读': 'read_count',
+    '点赞': 'digg_count',
+    '评论': 'comment_count',
+}
+
+def extract_rows(driver, cards, fields=None, lists=None, attrs=None):
+    """一次 execute_script 提取当前页所有卡片
+
+    cards 为候选卡片选择器（CSS 或以 // 开头的 XPath），按顺序取第一个有结果的；
+    fields 取子元素文本（卡片本身匹配时取卡片），lists 取所有匹配子元素的文本列表，attrs 取卡片属性。
+    返回 (命中的卡片选择器, 行列表)。
+    """
+    result = driver.execute_script(EXTRACT_ROWS_JS, {
+        'cards': list(cards),
+        'fields': fields or {},
+        'lists': lists or {},
+        'attrs': attrs or {},
+    }) or {}
+    return result.get('selector'), result.get('rows') or []
+
+# 创作者中心显示账号名称的位置，登录窗口用它判断登录完成
+LOGIN_USERNAME_SELECTORS = ['.menu-title', '.auth-avator-name']
+
+# 个人主页等页面上账号名称可能出现的位置；通用的 .name 等只用于解析主页，
+# 不能用来判断登录，否则任意页面上的第一个 .name 都会被当成账号名
+PROFILE_USERNAME_SELECTORS = LOGIN_USERNAME_SELECTORS + ['.user-name', '.username', '.name', '[data-log="username"]']
+
+def parse_username(text):
+    """从页面文字中取出账号名称，处理"晚上好，PenpoAI创意"这样的问候格式"""
+    text = (text or '').strip()
+    for sep in ('，', ','):
+        if sep in text:
+            return text.split(sep, 1)[1].strip()
+    return text
+
+def parse_stat_texts(texts):
+    """把 ['展现 1.2万', '阅读 345', ...] 转换为统计字段，缺失的补 '0'"""
+    stats = {}
+    for text in texts or []:
+        text = (text or '').strip()
+        for label, field in STAT_LABELS.items():
+            if label in text:
+                stats[field] = text.replace(label, '').strip()
+                break
+    for field in STAT_LABELS.values():
+        stats.setdefault(field, '0')
+    return stats
+
+# 计数文本的单位，article_metrics.parse_counts 的批量版本共用这张表
+COUNT_UNITS = {'万': 10000, '亿': 100000000}
+
+# 去掉千分位逗号后的合法计数：数字（最多一个小数点）加可选的单位
+COUNT_PATTERN = re.compile(r'(\d+\.?\d*|\.\d+)([万亿]?)')
+
+def parse_count(text):
+    """把 '1.2万'、'3,456'、'-' 等计数文本转换为整数，无法识别的记为 0
+
+    与 article_metrics.parse_counts 的结果一致（tests/test_counts.py 用同一组用例检查两者）。
+    """
+    text = str(text if text is not None else '').replace(',', '').strip()
+    match = COUNT_PATTERN.fullmatch(text)
+    if not match:
+        return 0
+    number, unit = match.groups()
+    return int(round(float(number) * COUNT_UNITS.get(unit, 1)))
+
+# "5分钟前"、"3小时前"、"2天前" 这样的相对时间
+RELATIVE_TIME = re.compile(r'^(\d+)\s*(分钟|小时|天)前$')
+RELATIVE_UNITS = {'分钟': 60, '小时': 3600, '天': 86400}
+
+def parse_publish_time(text, now=None):
+    """把页面上的发布时间文本转换为时间戳，无法识别时返回 0"""
+    text = (text or '').strip()
+    if not text or text == '-':
+        return 0
+    now = now or datetime.now()
+    
+    if text == '刚刚':
+        return int(now.timestamp())
+    match = RELATIVE_TIME.match(text)
+    if match:
+        return int(now.timestamp()) - int(match.group(1)) * RELATIVE_UNITS[match.group(2)]
+    
+    for prefix, delta in (('今天', 0), ('昨天', 1), ('前天', 2)):
+        if text.startswith(prefix):
+            day = (now - timedelta(days=delta)).strftime('%Y-%m-%d')
+            text = f"{day} {text[len(prefix):].strip() or '00:00'}"
+            break
+    
+    formats = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d', '%m-%d %H:%M',
+               '%Y年%m月%d日 %H:%M', '%Y年%m月%d日', '%m月%d日 %H:%M', '%m月%d日')
+    for fmt in formats:
+        try:
+            parsed = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        if '%Y' not in fmt:
+            # 当年的文章不显示年份
+            parsed = parsed.replace(year=now.year)
+        return int(parsed.timestamp())
+    return 0
+
+def build_article(title, publish_time, stat_texts):
+    """由标题、发布时间文本和统计项文本组装文章字典"""
+    article = {
+        'title': (title or '').strip(),
+        'publish_time': (publish_time or '').strip() or '-',
+    }
+    article['create_time'] = parse_publish_time(article['publish_time'])
+    article.update(parse_stat_texts(stat_texts))
+    return article
+
+def reached_cutoff(articles, stop_before):
+    """本页是否已经包含早于 stop_before 的文章，接口和浏览器两条路径共用
+
+    有发布时间无法识别（create_time 为 0）的文章时同样停止翻页，
+    否则增量同步永远不会停下，每次都翻满 max_pages。
+    """
+    if not stop_before:
+        return False
+    times = [article.get('create_time') or 0 for article in articles]
+    if any(t <= 0 for t in times):
+        logger.warning("本页有无法识别的发布时间，停止翻页")
+        return True
+    return any(t < stop_before for t in times)
@@ -0,0 +1,145 @@
+from selenium import webdriver
+from contextlib import contextmanager
+from utils import telemetry
+import logging
+import queue
+import threading
+
+class DriverPool:
+    """Chrome WebDriver 池
+
+    预热的浏览器在借出/归还之间复用，归还时清空 cookies 和存储，
+    借出前做健康检查，达到最大使用次数或崩溃后重建。
+    """
+
+    # 归还时需要清理存储的站点
+    RESET_ORIGINS = [
+        'https://mp.toutiao.com',
+        'https://www.toutiao.com',
+    ]
+
+    def __init__(self, options_factory, size=2, max_uses=20, on_create=None):
+        self.logger = logging.getLogger(__name__)
+        self.options_factory = options_factory
+        self.on_create = on_create  # 新实例启动后的初始化回调
+        self.size = max(1, int(size))
+        self.max_uses = max(1, int(max_uses))
+
+        self._idle = queue.LifoQueue()  # 后进先出，优先复用最热的实例
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._uses = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _create(self):
+        """启动新的浏览器实例"""
+        self.logger.info("启动新的 Chrome 实例")
+        with telemetry.span('chrome_start'):
+            driver = webdriver.Chrome(options=self.options_factory())
+            if self.on_create:
+                self.on_create(driver)
+        with self._lock:
+            self._uses[driver.session_id] = 0
+        return driver
+
+    def _discard(self, driver):
+        """销毁浏览器实例"""
+        with self._lock:
+            self._uses.pop(getattr(driver, 'session_id', None), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _is_healthy(self, driver):
+        """检查浏览器是否仍可用"""
+        try:
+            return driver.execute_script('return 1') == 1
+        except Exception as e:
+            self.logger.warning(f"浏览器健康检查失败: {str(e)}")
+            return False
+
+    def _reset(self, driver):
+        """清空 cookies、存储和页面状态，避免账号之间串号"""
+        try:
+            driver.implicitly_wait(0)
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            for origin in self.RESET_ORIGINS:
+                driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                    'origin': origin,
+                    'storageTypes': 'all',
+                })
+            driver.get('about:blank')
+            return True
+        except Exception as e:
+            self.logger.warning(f"重置浏览器状态失败: {str(e)}")
+            return False
+
+    def acquire(self, timeout=None):
+        """借出一个可用的浏览器实例"""
+        if self._closed:
+            raise RuntimeError("浏览器池已关闭")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("等待可用浏览器超时")
+
+        try:
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    driver = self._create()
+                    break
+
+                if self._is_healthy(driver):
+                    break
+                self.logger.info("丢弃不可用的浏览器实例")
+                self._discard(driver)
+
+            with self._lock:
+                self._uses[driver.session_id] = self._uses.get(driver.session_id, 0) + 1
+            return driver
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, driver, broken=False):
+        """归还浏览器实例，必要时回收"""
+        try:
+            with self._lock:
+                uses = self._uses.get(driver.session_id, 0)
+
+            if self._closed or broken:
+                self._discard(driver)
+            elif uses >= self.max_uses:
+                self.logger.info(f"浏览器已使用 {uses} 次，回收重建")
+                self._discard(driver)
+            elif not self._reset(driver):
+                self._discard(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """以上下文方式借用浏览器；因 TimeoutError 退出时页面可能仍在加载，直接销毁不再复用"""
+        driver = self.acquire(timeout=timeout)
+        broken = False
+        try:
+            yield driver
+        except TimeoutError:
+            broken = True
+            raise
+        finally:
+            self.release(driver, broken=broken)
+
+    def close(self):
+        """关闭池中所有空闲的浏览器"""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+        self.logger.info("浏览器池已关闭")
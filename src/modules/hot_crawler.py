@@ -1,13 +1,179 @@
+import requests
+from requests.adapters import HTTPAdapter
+import asyncio
+import logging
+import os
+import threading
+
 class HotCrawler:
-    def __init__(self, session_manager):
-        self.session_manager = session_manager
-    
+    """头条热榜轮询器
+
+    通过共享连接池请求热榜接口，携带 ETag / If-Modified-Since 做条件请求；
+    内存中保留上一次的榜单，只输出新上榜、掉榜和排名变化的话题。
+    连续没有变化时逐步拉长轮询间隔，有变化后恢复到最短间隔。
+    """
+
+    HOT_BOARD_URL = os.environ.get(
+        'TOUTIAO_HOT_BOARD_URL',
+        'https://www.toutiao.com/hot-event/hot-board/?origin=toutiao_pc'
+    )
+
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36'
+
+    MIN_INTERVAL = 60      # 最短轮询间隔（秒）
+    MAX_INTERVAL = 900     # 最长轮询间隔（秒）
+    BACKOFF = 1.5          # 无变化时间隔的放大倍数
+
+    def __init__(self, url=None, timeout=10, min_interval=None, max_interval=None):
+        self.logger = logging.getLogger(__name__)
+        self.url = url or self.HOT_BOARD_URL
+        self.timeout = timeout
+        self.min_interval = min_interval or self.MIN_INTERVAL
+        self.max_interval = max_interval or self.MAX_INTERVAL
+        self.interval = self.min_interval
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': self.USER_AGENT,
+            'Accept': 'application/json, text/plain, */*',
+        })
+
+        self.topics = []          # 上一次的榜单
+        self._etag = None
+        self._last_modified = None
+        self._lock = threading.Lock()
+
+    def fetch(self):
+        """请求热榜，内容未变化（HTTP 304）时返回 None"""
+        headers = {}
+        if self._etag:
+            headers['If-None-Match'] = self._etag
+        if self._last_modified:
+            headers['If-Modified-Since'] = self._last_modified
+
+        response = self.session.get(self.url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+
+        self._etag = response.headers.get('ETag')
+        self._last_modified = response.headers.get('Last-Modified')
+        return self.parse_topics(response.json())
+
+    @staticmethod
+    def parse_topics(payload):
+        """把接口返回转换为按排名排列的话题列表"""
+        topics = []
+        for item in payload.get('data') or []:
+            title = (item.get('Title') or '').strip()
+            if not title:
+                continue
+            try:
+                hot_value = int(item.get('HotValue') or 0)
+            except (TypeError, ValueError):
+                hot_value = 0
+            topics.append({
+                'id': str(item.get('ClusterIdStr') or item.get('ClusterId') or title),
+                'title': title,
+                'rank': len(topics) + 1,
+                'hot_value': hot_value,
+                'url': item.get('Url', ''),
+                'label': item.get('Label', ''),
+            })
+        return topics
+
+    @staticmethod
+    def diff(old, new):
+        """比较两次榜单，返回 {'added': [...], 'dropped': [...], 'moved': [(话题, 原排名), ...]}"""
+        old_by_id = {topic['id']: topic for topic in old}
+        new_ids = {topic['id'] for topic in new}
+        added, moved = [], []
+        for topic in new:
+            previous = old_by_id.get(topic['id'])
+            if previous is None:
+                added.append(topic)
+            elif previous['rank'] != topic['rank']:
+                moved.append((topic, previous['rank']))
+        dropped = [topic for topic in old if topic['id'] not in new_ids]
+        return {'added': added, 'dropped': dropped, 'moved': moved}
+
+    def poll(self):
+        """轮询一次，返回本次的变化（没有变化时为 None），并调整下次轮询间隔"""
+        with self._lock:
+            try:
+                topics = self.fetch()
+            except Exception as e:
+                self.logger.warning(f"获取热榜失败: {str(e)}")
+                self.interval = min(self.interval * self.BACKOFF, self.max_interval)
+                return None
+
+            changes = None
+            if topics is not None:
+                changes = self.diff(self.topics, topics)
+                self.topics = topics
+                if not any(changes.values()):
+                    changes = None
+
+            if changes:
+                self.interval = self.min_interval
+                self.logger.info(
+                    f"热榜变化: 新上榜 {len(changes['added'])}，掉榜 {len(changes['dropped'])}，"
+                    f"排名变化 {len(changes['moved'])}"
+                )
+            else:
+                self.interval = min(self.interval * self.BACKOFF, self.max_interval)
+                self.logger.debug(f"热榜无变化，{self.interval:.0f}s 后再次轮询")
+            return changes
+
     def get_hot_topics(self):
         """获取头条热榜话题"""
-        driver, wait = self.session_manager.create_session()
-        try:
-            driver.get('https://www.toutiao.com/hot-event/')
-            # 实现热榜抓取逻辑
-            pass
-        finally:
-            driver.quit() 
\ No newline at end of file
+        self.poll()
+        return list(self.topics)
+
+    def run(self, on_change, stop_event=None):
+        """持续轮询直到 stop_event 被设置，榜单变化时调用 on_change(changes, topics)"""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            changes = self.poll()
+            if changes:
+                try:
+                    on_change(changes, list(self.topics))
+                except Exception as e:
+                    self.logger.error(f"处理热榜变化出错: {str(e)}")
+            stop_event.wait(self.interval)
+
+    async def watch(self, on_change):
+        """run 的协程版本：请求放进事件循环的线程池，等待期间不占用线程，取消即停止"""
+        loop = asyncio.get_running_loop()
+        while True:
+            changes = await loop.run_in_executor(None, self.poll)
+            if changes:
+                try:
+                    on_change(changes, list(self.topics))
+                except Exception as e:
+                    self.logger.error(f"处理热榜变化出错: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def close(self):
+        """关闭连接池"""
+        self.session.close()
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+
+    def print_changes(changes, topics):
+        for topic in changes['added']:
+            print(f"+ {topic['rank']:>2} {topic['title']}")
+        for topic in changes['dropped']:
+            print(f"- {topic['title']}")
+        for topic, rank in changes['moved']:
+            print(f"~ {rank:>2} -> {topic['rank']:>2} {topic['title']}")
+
+    crawler = HotCrawler()
+    try:
+        crawler.run(print_changes)
+    except KeyboardInterrupt:
+        crawler.close()
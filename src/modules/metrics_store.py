@@ -0,0 +1,181 @@
+from array import array
+from .storage import Storage
+import logging
+import os
+import threading
+import time
+
+# 统计字段，与文章字典中的计数字段一一对应
+METRIC_FIELDS = ['read_count', 'show_count', 'digg_count', 'comment_count']
+
+# 各精度的表和时间桶大小（秒）
+RESOLUTIONS = [
+    ('metric_raw', 0),
+    ('metric_hourly', 3600),
+    ('metric_daily', 86400),
+]
+
+def _create_snapshot_table(cursor, table):
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table} (
+            series_id INTEGER NOT NULL,
+            ts INTEGER NOT NULL,
+            {', '.join(f'{field} INTEGER' for field in METRIC_FIELDS)},
+            PRIMARY KEY (series_id, ts)
+        ) WITHOUT ROWID
+    ''')
+
+def _migrate_v1(cursor):
+    """序列表和三种精度的快照表"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS metric_series (
+            id INTEGER PRIMARY KEY,
+            username TEXT NOT NULL,
+            article_id TEXT NOT NULL,
+            UNIQUE (username, article_id)
+        )
+    ''')
+    for table, _ in RESOLUTIONS:
+        _create_snapshot_table(cursor, table)
+
+MIGRATIONS = [
+    (1, _migrate_v1),
+]
+
+class MetricsStore:
+    """文章统计数据的时间序列存储
+
+    每次抓取追加一条 (账号, 文章, 时间) 快照；原始快照超过保留期后
+    降采样为小时粒度，小时数据再降采样为天粒度。计数为累计值，降采样取桶内最大值。
+    """
+
+    RAW_RETENTION = 2 * 86400       # 原始快照保留 2 天
+    HOURLY_RETENTION = 30 * 86400   # 小时数据保留 30 天
+    DOWNSAMPLE_INTERVAL = 3600      # 自动降采样的最小间隔
+
+    def __init__(self, db_path=None, raw_retention=None, hourly_retention=None):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path or os.path.join('data', 'metrics.db')
+        self.raw_retention = raw_retention or self.RAW_RETENTION
+        self.hourly_retention = hourly_retention or self.HOURLY_RETENTION
+        self.storage = Storage(self.db_path, MIGRATIONS)
+
+        self._series = {}
+        self._lock = threading.Lock()
+        self._last_downsample = 0
+
+    def _series_ids(self, cursor, username, article_ids):
+        """获取（必要时创建）文章序列 id"""
+        missing = [a for a in article_ids if (username, a) not in self._series]
+        if missing:
+            cursor.executemany(
+                'INSERT OR IGNORE INTO metric_series (username, article_id) VALUES (?, ?)',
+                [(username, a) for a in missing]
+            )
+            placeholders = ', '.join('?' * len(missing))
+            for series_id, article_id in cursor.execute(
+                f'SELECT id, article_id FROM metric_series WHERE username = ? AND article_id IN ({placeholders})',
+                [username] + missing
+            ):
+                self._series[(username, article_id)] = series_id
+        return [self._series[(username, a)] for a in article_ids]
+
+    def record(self, username, rows, ts=None):
+        """追加一批快照，rows 为 (article_id, read, show, digg, comment) 序列"""
+        if not rows:
+            return
+        ts = int(ts or time.time())
+        with self._lock, self.storage.transaction() as cursor:
+            series_ids = self._series_ids(cursor, username, [row[0] for row in rows])
+            cursor.executemany(
+                f'INSERT OR REPLACE INTO metric_raw VALUES (?, ?, {", ".join("?" * len(METRIC_FIELDS))})',
+                [(series_id, ts) + tuple(row[1:]) for series_id, row in zip(series_ids, rows)]
+            )
+
+        if ts - self._last_downsample >= self.DOWNSAMPLE_INTERVAL:
+            self.downsample(ts)
+
+    def _rollup(self, cursor, source, target, bucket, cutoff):
+        """把 source 中早于 cutoff 的数据按 bucket 聚合进 target，然后删除"""
+        maxes = ', '.join(f'MAX({field})' for field in METRIC_FIELDS)
+        updates = ', '.join(f'{field} = MAX({field}, excluded.{field})' for field in METRIC_FIELDS)
+        cursor.execute(f'''
+            INSERT INTO {target} (series_id, ts, {', '.join(METRIC_FIELDS)})
+            SELECT series_id, (ts / {bucket}) * {bucket} AS bucket_ts, {maxes}
+            FROM {source} WHERE ts < ?
+            GROUP BY series_id, bucket_ts
+            ON CONFLICT (series_id, ts) DO UPDATE SET {updates}
+        ''', (cutoff,))
+        cursor.execute(f'DELETE FROM {source} WHERE ts < ?', (cutoff,))
+        return cursor.rowcount
+
+    def downsample(self, now=None):
+        """按保留期降采样：原始 -> 小时 -> 天"""
+        now = int(now or time.time())
+        self._last_downsample = now
+        try:
+            with self.storage.transaction() as cursor:
+                # 截止时间对齐到桶边界，避免同一个桶被拆开聚合
+                raw_cutoff = (now - self.raw_retention) // 3600 * 3600
+                hourly_cutoff = (now - self.hourly_retention) // 86400 * 86400
+                raw = self._rollup(cursor, 'metric_raw', 'metric_hourly', 3600, raw_cutoff)
+                hourly = self._rollup(cursor, 'metric_hourly', 'metric_daily', 86400, hourly_cutoff)
+            if raw or hourly:
+                self.logger.info(f"统计数据降采样: 原始 {raw} 条，小时 {hourly} 条")
+        except Exception as e:
+            self.logger.error(f"统计数据降采样失败: {str(e)}")
+
+    def query(self, username, article_id, start=None, end=None, fields=METRIC_FIELDS):
+        """查询一篇文章在 [start, end) 内的快照
+
+        依次合并天、小时、原始三种精度，返回 {'ts': array, 字段: array, ...}，按时间升序。
+        """
+        row = self.storage.query_one(
+            'SELECT id FROM metric_series WHERE username = ? AND article_id = ?',
+            (username, article_id)
+        )
+        result = {'ts': array('q')}
+        result.update({field: array('q') for field in fields})
+        if not row:
+            return result
+
+        start = int(start or 0)
+        end = int(end or 2 ** 62)
+        for table, _ in reversed(RESOLUTIONS):
+            for values in self.storage.query(f'''
+                SELECT ts, {', '.join(fields)} FROM {table}
+                WHERE series_id = ? AND ts >= ? AND ts < ?
+                ORDER BY ts
+            ''', (row[0], start, end)):
+                result['ts'].append(values[0])
+                for field, value in zip(fields, values[1:]):
+                    result[field].append(value or 0)
+        return result
+
+    def query_account(self, username, start=None, end=None, field='read_count', resolution='metric_hourly'):
+        """查询账号所有文章某个字段在各时间桶的合计，返回 (ts array, 合计 array)"""
+        bucket = dict(RESOLUTIONS)[resolution] or 1
+        start = int(start or 0)
+        end = int(end or 2 ** 62)
+        ts, totals = array('q'), array('q')
+        for bucket_ts, total in self.storage.query(f'''
+            SELECT (s.ts / {bucket}) * {bucket} AS bucket_ts, SUM(s.{field})
+            FROM {resolution} s JOIN metric_series m ON m.id = s.series_id
+            WHERE m.username = ? AND s.ts >= ? AND s.ts < ?
+            GROUP BY bucket_ts ORDER BY bucket_ts
+        ''', (username, start, end)):
+            ts.append(bucket_ts)
+            totals.append(total or 0)
+        return ts, totals
+
+    def delete_account(self, username):
+        """删除账号的全部统计数据"""
+        with self._lock, self.storage.transaction() as cursor:
+            for table, _ in RESOLUTIONS:
+                cursor.execute(f'''
+                    DELETE FROM {table} WHERE series_id IN (
+                        SELECT id FROM metric_series WHERE username = ?
+                    )
+                ''', (username,))
+            cursor.execute('DELETE FROM metric_series WHERE username = ?', (username,))
+            self._series = {k: v for k, v in self._series.items() if k[0] != username}
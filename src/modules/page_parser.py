@@ -0,0 +1,99 @@
+"""离线页面解析
+
+基于一次 driver.page_source 快照（或 fetch_articles 保存的 error_page.html
+等存档文件）在本地解析文章、统计数据和账号信息，不再调用 WebDriver。
+
+    python -m modules.page_parser error_page.html
+"""
+from bs4 import BeautifulSoup
+from .dom_extractor import ARTICLE_SELECTORS, PROFILE_USERNAME_SELECTORS, TITLE_SELECTOR, build_article, parse_username
+import json
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml  # noqa: F401
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+# 账号统计区域
+PROFILE_STATS_SELECTORS = ['.user-data', '.data-overview', '.count-wrapper']
+PROFILE_STAT_LABELS = {
+    '粉丝': 'fans',
+    '关注': 'following',
+    '获赞': 'likes',
+}
+
+def _soup(html):
+    """接受 HTML 文本或已解析的 BeautifulSoup"""
+    if isinstance(html, BeautifulSoup):
+        return html
+    return BeautifulSoup(html or '', PARSER)
+
+def _text(element):
+    return element.get_text(' ', strip=True) if element else None
+
+def parse_articles(html):
+    """解析文章列表，返回与页面抓取一致的文章字典"""
+    soup = _soup(html)
+
+    cards = []
+    for selector in ARTICLE_SELECTORS:
+        cards = soup.select(selector)
+        if cards:
+            break
+
+    articles = []
+    for card in cards:
+        title = _text(card if card.css.match(TITLE_SELECTOR) else card.select_one(TITLE_SELECTOR))
+        if not title:
+            continue
+        stats = [_text(li) for li in card.select('ul.count li')]
+        articles.append(build_article(title, _text(card.select_one('.create-time')), stats))
+    return articles
+
+def parse_profile(html):
+    """解析账号名称及粉丝、关注、获赞数"""
+    soup = _soup(html)
+    profile = {}
+
+    for selector in PROFILE_USERNAME_SELECTORS:
+        text = parse_username(_text(soup.select_one(selector)))
+        if text:
+            profile['username'] = text
+            break
+
+    for selector in PROFILE_STATS_SELECTORS:
+        blocks = soup.select(selector)
+        if not blocks:
+            continue
+        for block in blocks:
+            # 统计区域常把粉丝、关注、获赞放在同一个容器的子元素里，逐项匹配
+            items = block.find_all(recursive=False) or [block]
+            for text in map(_text, items):
+                for label, field in PROFILE_STAT_LABELS.items():
+                    if text and label in text:
+                        profile[field] = text
+        break
+
+    return profile
+
+def parse_page(html):
+    """解析整页：文章和账号信息"""
+    soup = _soup(html)
+    return {
+        'articles': parse_articles(soup),
+        'profile': parse_profile(soup),
+    }
+
+def parse_file(path):
+    """重新解析存档的 HTML 文件"""
+    with open(path, encoding='utf-8') as f:
+        return parse_page(f.read())
+
+if __name__ == '__main__':
+    for path in sys.argv[1:]:
+        print(json.dumps(parse_file(path), ensure_ascii=False, indent=2))
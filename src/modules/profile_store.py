@@ -0,0 +1,127 @@
+import hashlib
+import logging
+import os
+import shutil
+import threading
+
+class ProfileStore:
+    """按账号保存的 Chrome 用户数据目录
+
+    每个账号一个 --user-data-dir，登录状态和静态资源缓存在多次运行之间保留。
+    目录数量（以及可选的总大小）有上限，超出时按最近使用时间淘汰最旧的目录；
+    同一目录同时只能被一个浏览器使用，正在使用的目录不会被淘汰。
+    """
+
+    MARKER = '.last_used'
+    ROOT = os.path.join('data', 'profiles')
+
+    def __init__(self, root=None, max_profiles=20, max_bytes=None):
+        self.logger = logging.getLogger(__name__)
+        self.root = root or self.ROOT
+        self.max_profiles = max(1, int(max_profiles))
+        self.max_bytes = max_bytes
+
+        self._in_use = set()
+        self._locks = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def _dirname(username):
+        return hashlib.sha1(username.encode('utf-8')).hexdigest()[:16]
+
+    def path(self, username):
+        return os.path.abspath(os.path.join(self.root, self._dirname(username)))
+
+    def exists(self, username):
+        return os.path.exists(os.path.join(self.path(username), self.MARKER))
+
+    def _account_lock(self, username):
+        with self._lock:
+            return self._locks.setdefault(username, threading.Lock())
+
+    def acquire(self, username, timeout=None):
+        """独占账号的目录，返回路径；目录不存在时创建"""
+        lock = self._account_lock(username)
+        if not lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise TimeoutError(f"等待账号 {username} 的浏览器目录超时")
+
+        path = self.path(username)
+        with self._lock:
+            self._in_use.add(path)
+        os.makedirs(path, exist_ok=True)
+        self._touch(path)
+        self.evict()
+        return path
+
+    def release(self, username):
+        """释放账号的目录"""
+        path = self.path(username)
+        self._touch(path)
+        with self._lock:
+            self._in_use.discard(path)
+        self._account_lock(username).release()
+
+    def _touch(self, path):
+        marker = os.path.join(path, self.MARKER)
+        try:
+            with open(marker, 'a'):
+                pass
+            os.utime(marker, None)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _size(path):
+        total = 0
+        for directory, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(directory, name))
+                except OSError:
+                    pass
+        return total
+
+    def _profiles(self):
+        """[(最近使用时间, 路径), ...]，最旧的在前"""
+        profiles = []
+        for name in os.listdir(self.root):
+            path = os.path.abspath(os.path.join(self.root, name))
+            if not os.path.isdir(path):
+                continue
+            try:
+                used = os.path.getmtime(os.path.join(path, self.MARKER))
+            except OSError:
+                used = 0
+            profiles.append((used, path))
+        profiles.sort()
+        return profiles
+
+    def evict(self):
+        """淘汰最久未使用的目录，直到数量和总大小都在上限内"""
+        profiles = self._profiles()
+        sizes = {path: self._size(path) for _, path in profiles} if self.max_bytes else {}
+        total = sum(sizes.values())
+
+        for _, path in profiles:
+            over_count = len(profiles) > self.max_profiles
+            over_size = self.max_bytes and total > self.max_bytes
+            if not over_count and not over_size:
+                break
+            with self._lock:
+                if path in self._in_use:
+                    continue
+            shutil.rmtree(path, ignore_errors=True)
+            profiles = [p for p in profiles if p[1] != path]
+            total -= sizes.get(path, 0)
+            self.logger.info(f"淘汰浏览器目录: {path}")
+
+    def remove(self, username):
+        """删除账号的目录（账号被删除时调用）"""
+        path = self.path(username)
+        with self._lock:
+            if path in self._in_use:
+                return False
+        shutil.rmtree(path, ignore_errors=True)
+        return True
+
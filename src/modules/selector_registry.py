@@ -0,0 +1,187 @@
+"""页面选择器注册表
+
+同一字段的所有候选选择器在一次 execute_script 中同时探测，按优先级取第一个有结果的；
+上次命中的选择器按 (页面, 字段) 保存在 data/selector_cache.json，下次排在最前面。
+缓存的选择器失效时，同一次探测里其余候选照常参与，页面改版只多花一次探测，
+不会在每次刷新时逐个等待超时。标记为 LastResort 的宽泛候选命中后不写入缓存。
+"""
+from collections import namedtuple
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from utils import telemetry
+from .dom_extractor import LastResort
+import json
+import logging
+import os
+import threading
+
+# 以 // 或 ( 开头的候选按 XPath 处理，其余为 CSS 选择器
+PROBE_JS = """
+var spec = arguments[0], limit = arguments[1], result = {};
+function find(sel) {
+    if (sel.charAt(0) === '/' || sel.charAt(0) === '(') {
+        var snap = document.evaluate(sel, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var i = 0; i < snap.snapshotLength; i++) nodes.push(snap.snapshotItem(i));
+        return nodes;
+    }
+    return document.querySelectorAll(sel);
+}
+for (var field in spec) {
+    var candidates = spec[field];
+    for (var i = 0; i < candidates.length; i++) {
+        var nodes;
+        try { nodes = find(candidates[i]); } catch (e) { continue; }
+        if (!nodes.length) continue;
+        var texts = [];
+        for (var j = 0; j < nodes.length && j < limit; j++) {
+            texts.push((nodes[j].innerText || nodes[j].textContent || '').trim());
+        }
+        result[field] = {selector: candidates[i], count: nodes.length, texts: texts};
+        break;
+    }
+}
+return result;
+"""
+
+# 命中的选择器、匹配的元素数和前若干个元素的文字
+Match = namedtuple('Match', ['selector', 'count', 'texts'])
+
+class SelectorRegistry:
+    """按 (页面, 字段) 记住上次命中的选择器，并在一次脚本调用中探测所有候选"""
+
+    # 每个字段最多返回的元素文字条数
+    TEXT_LIMIT = 50
+
+    def __init__(self, path=None):
+        self.logger = logging.getLogger(__name__)
+        self.path = path or os.path.join('data', 'selector_cache.json')
+        self._cache = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._cache is None:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self._cache = json.load(f)
+            except FileNotFoundError:
+                self._cache = {}
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"读取选择器缓存失败，重新学习: {str(e)}")
+                self._cache = {}
+        return self._cache
+
+    def _save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._cache, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def cached(self, page, field):
+        """上次命中的选择器"""
+        with self._lock:
+            return self._load().get(page, {}).get(field)
+
+    @staticmethod
+    def _last_resort(selector, defaults):
+        return any(isinstance(c, LastResort) and c == selector for c in defaults)
+
+    def candidates(self, page, field, defaults):
+        """候选列表：上次命中的排在最前，其余保持默认顺序
+
+        旧版本缓存的宽泛候选不再提前。
+        """
+        cached = self.cached(page, field)
+        defaults = list(defaults)
+        if cached and not self._last_resort(cached, defaults):
+            return [cached] + [selector for selector in defaults if selector != cached]
+        return defaults
+
+    def remember(self, page, field, selector, defaults=()):
+        """记录命中的选择器，有变化时写回缓存文件
+
+        selector 是 defaults 中的 LastResort 候选时不记录，并清除该字段的缓存。
+        """
+        if not selector:
+            return
+        if self._last_resort(selector, defaults):
+            if self.cached(page, field):
+                self.forget(page, field)
+            return
+        with self._lock:
+            fields = self._load().setdefault(page, {})
+            if fields.get(field) == selector:
+                return
+            previous = fields.get(field)
+            fields[field] = selector
+            try:
+                self._save()
+            except OSError as e:
+                self.logger.warning(f"保存选择器缓存失败: {str(e)}")
+        if previous:
+            self.logger.info(f"{page}.{field} 的选择器由 {previous} 改为 {selector}")
+
+    def forget(self, page, field=None):
+        """清除某个页面（或其中一个字段）的缓存"""
+        with self._lock:
+            cache = self._load()
+            if field is None:
+                cache.pop(page, None)
+            else:
+                cache.get(page, {}).pop(field, None)
+            try:
+                self._save()
+            except OSError as e:
+                self.logger.warning(f"保存选择器缓存失败: {str(e)}")
+
+    def probe(self, driver, page, fields):
+        """探测一次当前页面，fields 为 {字段: 默认候选}，返回 {字段: Match}"""
+        spec = {field: self.candidates(page, field, defaults) for field, defaults in fields.items()}
+        raw = driver.execute_script(PROBE_JS, spec, self.TEXT_LIMIT) or {}
+        return {
+            field: Match(item['selector'], item.get('count', 0), item.get('texts') or [])
+            for field, item in raw.items()
+        }
+
+    def resolve(self, driver, page, fields, timeout=0, required=None, poll=0.25):
+        """等待 required 中的字段（默认全部）都有命中，最多 timeout 秒
+
+        每次轮询只调用一次脚本；超时后返回已命中的字段。
+        命中的选择器写入缓存，不是默认首选时计入备用选择器统计。
+        """
+        required = set(fields if required is None else required)
+        found = {}
+
+        def ready(d):
+            found.update(self.probe(d, page, fields))
+            return required.issubset(found)
+
+        with telemetry.span('selector_probe'):
+            try:
+                # timeout 为 0 时只探测一次
+                WebDriverWait(
+                    driver, timeout, poll_frequency=poll,
+                    ignored_exceptions=(JavascriptException,)
+                ).until(ready)
+            except TimeoutException:
+                missing = sorted(required - set(found))
+                self.logger.warning(f"{page} 页面在 {timeout} 秒内未找到: {', '.join(missing)}")
+
+        for field, match in found.items():
+            defaults = list(fields[field])
+            if defaults and match.selector != defaults[0]:
+                telemetry.incr('selector_fallbacks_total', selector=match.selector)
+            self.remember(page, field, match.selector, defaults)
+        return found
+
+_default_registry = None
+_default_lock = threading.Lock()
+
+def get_registry():
+    """获取共享的选择器注册表"""
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = SelectorRegistry()
+        return _default_registry
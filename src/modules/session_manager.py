@@ -1,20 +1,99 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import JavascriptException, TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
+from contextlib import contextmanager, ExitStack
+from .driver_pool import DriverPool
+from .profile_store import ProfileStore
+from .dom_extractor import ARTICLE_SELECTORS, LOGIN_USERNAME_SELECTORS, extract_rows, parse_username
+from .selector_registry import get_registry
+from utils import telemetry
+import json
 import logging
 import os
 import time
 
 class SessionManager:
-    def __init__(self):
+    # 抓取时屏蔽的资源：图片、媒体、字体及统计上报
+    BLOCKED_URLS = [
+        '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+        '*.mp4', '*.webm', '*.m3u8', '*.mp3',
+        '*.woff', '*.woff2', '*.ttf', '*.otf',
+        '*mcs.snssdk.com*', '*mon.snssdk.com*', '*mon.zijieapi.com*',
+        '*google-analytics.com*', '*googletagmanager.com*', '*hm.baidu.com*',
+    ]
+    
+    # 统计页面加载耗时和传输字节数
+    PAGE_STATS_JS = """
+        var nav = performance.getEntriesByType('navigation')[0] || {};
+        var bytes = nav.transferSize || 0;
+        var resources = performance.getEntriesByType('resource');
+        for (var i = 0; i < resources.length; i++) bytes += resources[i].transferSize || 0;
+        return {
+            load_ms: Math.round((nav.domContentLoadedEventEnd || performance.now()) - (nav.startTime || 0)),
+            bytes: bytes,
+            requests: resources.length + 1
+        };
+    """
+    
+    LOGIN_URL = 'https://mp.toutiao.com/auth/page/login'
+    
+    # 创作者中心文章列表页，可通过 TOUTIAO_MP_BASE_URL 指向本地桩服务器
+    ARTICLES_URL = os.environ.get('TOUTIAO_MP_BASE_URL', 'https://mp.toutiao.com').rstrip('/') + '/profile_v4/graphic/articles'
+    
+    # 等待文章列表出现的最长时间（秒）
+    LIST_TIMEOUT = 20
+    
+    # 等待用户完成登录的最长时间（秒）
+    LOGIN_TIMEOUT = 300
+    
+    # 已离开登录页时返回第一个有文字的账号名称元素，否则返回 null
+    LOGIN_STATE_JS = """
+        if (location.href.indexOf('login') !== -1) return null;
+        var selectors = arguments[0];
+        for (var i = 0; i < selectors.length; i++) {
+            var el = document.querySelector(selectors[i]);
+            var text = el ? (el.innerText || el.textContent || '').trim() : '';
+            if (text) return text;
+        }
+        return null;
+    """
+    
+    # 带 data-create-time 和各项计数的文章卡片，依次为首选和备用选择器
+    STAT_CARD_SELECTORS = ["[class*='article-item']"] + ARTICLE_SELECTORS
+    
+    # 同步 cookies 时读取的站点
+    COOKIE_URLS = ['https://mp.toutiao.com', 'https://www.toutiao.com']
+    
+    # 登录状态所在的 cookie，账号目录中已有它时不再写入数据库中的 cookies
+    SESSION_COOKIE = 'sessionid'
+    
+    def __init__(self, pool_size=2, max_driver_uses=20, headless=True,
+                 use_profiles=None, profile_dir=None, max_profiles=20, cookie_sink=None):
         self.logger = logging.getLogger(__name__)
         self.logger.info("初始化 SessionManager")
+        self.headless = headless
         self.chrome_options = self._init_chrome_options()
+        self.scrape_options = self._init_scrape_options(headless)
         self.logger.info("Chrome选项初始化成功")
+        
+        # 按账号保存的浏览器目录，默认关闭，可通过环境变量开启
+        if use_profiles is None:
+            use_profiles = os.environ.get('TOUTIAO_CHROME_PROFILES', '').lower() in ('1', 'true', 'yes')
+        self.profiles = ProfileStore(profile_dir, max_profiles) if use_profiles else None
+        
+        # 抓取结束后 cookies 有变化时回调 cookie_sink(username, cookies)，用于写回数据库
+        self.cookie_sink = cookie_sink
+        
+        # 抓取用浏览器池，避免每次刷新都冷启动 Chrome
+        self.driver_pool = DriverPool(
+            lambda: self.scrape_options,
+            size=pool_size,
+            max_uses=max_driver_uses,
+            on_create=self._prepare_scrape_driver
+        )
     
     def _init_chrome_options(self):
         """初始化Chrome选项"""
@@ -23,6 +102,7 @@ class SessionManager:
         # 基础设置
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--ignore-certificate-errors')
         
         # 禁用不必要的功能
         options.add_argument('--disable-gpu')
@@ -50,8 +130,225 @@ class SessionManager:
         }
         options.add_experimental_option('prefs', prefs)
         
+        # DOM 就绪即返回，加快页面加载
+        options.page_load_strategy = 'eager'
+        
         return options
     
+    def _init_scrape_options(self, headless=True):
+        """后台抓取专用的浏览器选项：无头、不加载图片、精简缓存"""
+        options = self._init_chrome_options()
+        
+        if headless:
+            options.add_argument('--headless=new')
+        
+        # 不加载图片
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        
+        # 关闭与抓取无关的缓存和后台网络，保留静态脚本的 HTTP 缓存
+        options.add_argument('--media-cache-size=1')
+        options.add_argument('--disable-gpu-shader-disk-cache')
+        options.add_argument('--disable-background-networking')
+        options.add_argument('--disable-component-update')
+        options.add_argument('--mute-audio')
+        
+        prefs = dict(options.experimental_options.get('prefs', {}))
+        prefs['profile.managed_default_content_settings.images'] = 2
+        options.add_experimental_option('prefs', prefs)
+        
+        return options
+    
+    def _prepare_scrape_driver(self, driver):
+        """新建抓取浏览器后，通过 CDP 屏蔽无关资源"""
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.BLOCKED_URLS})
+        except Exception as e:
+            self.logger.warning(f"设置资源屏蔽失败: {str(e)}")
+    
+    def page_stats(self, driver):
+        """当前页面的加载耗时（毫秒）、传输字节数和请求数"""
+        try:
+            return driver.execute_script(self.PAGE_STATS_JS) or {}
+        except Exception as e:
+            self.logger.debug(f"获取页面统计失败: {str(e)}")
+            return {}
+    
+    @contextmanager
+    def session(self, timeout=20, username=None, cookies=None):
+        """借出一个浏览器会话，用完自动归还
+
+        开启账号目录且指定了 username 时使用该账号独占的浏览器，否则从浏览器池借出。
+        传入 cookies 时先通过 CDP 写入（不需要先打开站点）；账号目录已存在且保留着登录状态时
+        以目录为准，不再写入。
+        不会自动写回 cookies：调用方确认抓取成功后再调用 sync_cookies，
+        避免跳转到登录页的浏览器覆盖数据库中仍然有效的 cookies。
+        """
+        if self.profiles and username:
+            # acquire 会创建目录，所以在借出之前判断是否为新目录
+            reuse_profile = self.profiles.exists(username)
+            context = self._profile_driver(username)
+        else:
+            reuse_profile = False
+            context = self.driver_pool.driver()
+        
+        with ExitStack() as stack:
+            with telemetry.span('driver_acquire', account=username):
+                driver = stack.enter_context(context)
+            if cookies and not (reuse_profile and self._has_session(driver)):
+                with telemetry.span('cookie_inject', account=username):
+                    self.load_cookies(driver, cookies)
+            yield driver, WebDriverWait(driver, timeout)
+    
+    @contextmanager
+    def _profile_driver(self, username):
+        """启动使用账号目录的浏览器，结束后关闭"""
+        path = self.profiles.acquire(username)
+        driver = None
+        try:
+            options = self._init_scrape_options(self.headless)
+            options.add_argument(f'--user-data-dir={path}')
+            with telemetry.span('chrome_start'):
+                driver = webdriver.Chrome(options=options)
+            self._prepare_scrape_driver(driver)
+            yield driver
+        finally:
+            if driver:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+            self.profiles.release(username)
+    
+    def _has_session(self, driver):
+        """浏览器（账号目录）中是否已有登录 cookie"""
+        try:
+            return any(
+                cookie['name'] == self.SESSION_COOKIE and cookie['value']
+                for cookie in self.read_cookies(driver)
+            )
+        except Exception as e:
+            self.logger.warning(f"读取账号目录中的 cookies 失败: {e}")
+            return False
+    
+    def load_cookies(self, driver, cookies):
+        """通过 CDP 一次写入所有 cookies，失败时退回到打开站点逐个添加"""
+        if isinstance(cookies, str):
+            cookies = json.loads(cookies)
+        
+        params = []
+        for cookie in cookies or []:
+            if isinstance(cookie, str):
+                cookie = json.loads(cookie)
+            if 'name' not in cookie or 'value' not in cookie:
+                continue
+            param = {
+                'name': cookie['name'],
+                'value': cookie['value'],
+                'domain': cookie.get('domain', '.toutiao.com'),
+                'path': cookie.get('path', '/'),
+                'secure': bool(cookie.get('secure', False)),
+                'httpOnly': bool(cookie.get('httpOnly', False)),
+            }
+            if cookie.get('expiry'):
+                param['expires'] = cookie['expiry']
+            params.append(param)
+        
+        try:
+            driver.execute_cdp_cmd('Network.setCookies', {'cookies': params})
+        except Exception as e:
+            self.logger.warning(f"CDP 写入 cookies 失败，改为逐个添加: {str(e)}")
+            self.inject_cookies(driver, cookies)
+    
+    def read_cookies(self, driver):
+        """读取浏览器中头条站点的 cookies，格式与 driver.get_cookies() 一致"""
+        result = driver.execute_cdp_cmd('Network.getCookies', {'urls': self.COOKIE_URLS}) or {}
+        cookies = []
+        for cookie in result.get('cookies') or []:
+            item = {
+                'name': cookie['name'],
+                'value': cookie['value'],
+                'domain': cookie.get('domain', ''),
+                'path': cookie.get('path', '/'),
+                'secure': cookie.get('secure', False),
+                'httpOnly': cookie.get('httpOnly', False),
+            }
+            if not cookie.get('session') and cookie.get('expires', -1) > 0:
+                item['expiry'] = int(cookie['expires'])
+            if cookie.get('sameSite'):
+                item['sameSite'] = cookie['sameSite']
+            cookies.append(item)
+        return cookies
+    
+    @staticmethod
+    def merge_cookies(previous, cookies):
+        """把浏览器中的 cookies 按 (name, domain, path) 合并进保存的 cookies
+
+        read_cookies 只读取 COOKIE_URLS 下的 cookies，保存的其他域名和路径的 cookies 原样保留。
+        """
+        def key(cookie):
+            return cookie.get('name'), cookie.get('domain') or '.toutiao.com', cookie.get('path') or '/'
+        
+        merged = [c for c in previous or [] if isinstance(c, dict)]
+        index = {key(c): i for i, c in enumerate(merged)}
+        for cookie in cookies:
+            if key(cookie) in index:
+                # 值没变时保留原条目，只有属性差异不算更新
+                position = index[key(cookie)]
+                if merged[position].get('value') != cookie.get('value'):
+                    merged[position] = cookie
+            else:
+                index[key(cookie)] = len(merged)
+                merged.append(cookie)
+        return merged
+    
+    def sync_cookies(self, driver, username, previous=None):
+        """把浏览器中更新的 cookies 合并进 previous，有变化时交给 cookie_sink 保存
+
+        只应在抓取成功后调用。
+        """
+        if not self.cookie_sink:
+            return
+        try:
+            cookies = self.read_cookies(driver)
+            if not cookies:
+                return
+            if isinstance(previous, str):
+                previous = json.loads(previous)
+            previous = [json.loads(c) if isinstance(c, str) else c for c in previous or []]
+            merged = self.merge_cookies(previous, cookies)
+            if merged != previous:
+                self.cookie_sink(username, merged)
+                self.logger.info(f"账号 {username} 的 cookies 已更新")
+        except Exception as e:
+            self.logger.warning(f"同步账号 {username} 的 cookies 失败: {str(e)}")
+    
+    def inject_cookies(self, driver, cookies, url='https://mp.toutiao.com'):
+        """访问站点并注入账号 cookies"""
+        if isinstance(cookies, str):
+            cookies = json.loads(cookies)
+        
+        driver.get(url)
+        for cookie in cookies or []:
+            try:
+                if isinstance(cookie, str):
+                    cookie = json.loads(cookie)
+                    
+                if 'name' in cookie and 'value' in cookie:
+                    driver.add_cookie({
+                        'name': cookie['name'],
+                        'value': cookie['value'],
+                        'domain': cookie.get('domain', '.toutiao.com'),
+                        'path': cookie.get('path', '/')
+                    })
+            except Exception as e:
+                self.logger.warning(f"添加cookie失败: {e}")
+                continue
+    
+    def close(self):
+        """释放浏览器池"""
+        self.driver_pool.close()
+    
     def open_login_window(self):
         """打开登录窗口并获取登录结果"""
         try:
@@ -73,99 +370,41 @@ class SessionManager:
                 # 添加实验性选项
                 options.add_experimental_option('excludeSwitches', ['enable-logging'])  # 禁用日志
                 
-                driver = webdriver.Chrome(options=options)
+                with telemetry.span('chrome_start'):
+                    driver = webdriver.Chrome(options=options)
                 driver.set_page_load_timeout(30)  # 设置页面加载超时
                 
                 # 访问登录页面
                 self.logger.debug("Navigating to login page...")
-                driver.get('https://mp.toutiao.com/auth/page/login')
+                with telemetry.span('navigate'):
+                    driver.get(self.LOGIN_URL)
                 
-                # 等待登录完成
+                # 离开登录页且页面上出现账号名称即视为登录完成，每次轮询只调用一次脚本
                 self.logger.debug("Waiting for login completion...")
-                while True:
-                    current_url = driver.current_url
-                    if 'login' not in current_url:
-                        # 登录成功，等待页面完全加载
-                        self.logger.debug("Login successful, waiting for page load...")
-                        time.sleep(5)  # 等待页面加载
-                        
-                        try:
-                            # 打印页面源码用于调试
-                            self.logger.debug("Current page source:")
-                            self.logger.debug(driver.page_source)
-                            
-                            # 更新用户名选择器
-                            selectors = [
-                                ".menu-title",  # 菜单标题中的用户名
-                                ".auth-avator-name",  # 头像区域的用户名
-                                "//div[contains(@class, 'menu-title')]/text()",  # XPath方式
-                                "//div[contains(@class, 'auth-avator-name')]/text()"  # XPath方式
-                            ]
-                            
-                            # 修改用户名提取逻辑
-                            for selector in selectors:
-                                try:
-                                    if selector.startswith("//"):
-                                        element = WebDriverWait(driver, 5).until(
-                                            EC.presence_of_element_located((By.XPATH, selector))
-                                        )
-                                    else:
-                                        element = WebDriverWait(driver, 5).until(
-                                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                                        )
-                                    
-                                    text = element.text.strip()
-                                    self.logger.debug(f"Found element with selector {selector}: {text}")
-                                    
-                                    if text:
-                                        # 处理"晚上好，PenpoAI创意"这样的格式
-                                        if "，" in text:
-                                            username = text.split("，")[1].strip()
-                                        elif "," in text:
-                                            username = text.split(",")[1].strip()
-                                        else:
-                                            username = text
-                                        
-                                        if username:
-                                            self.logger.debug(f"Successfully extracted username: {username}")
-                                            break
-                                except Exception as e:
-                                    self.logger.debug(f"Selector {selector} failed: {str(e)}")
-                                    continue
-                            
-                            if not username:
-                                # 如果还是没有找到用户名，尝试查找所有可能的元素
-                                self.logger.debug("Trying to find all possible elements...")
-                                elements = driver.find_elements(By.CSS_SELECTOR, "*")
-                                for elem in elements:
-                                    try:
-                                        text = elem.text.strip()
-                                        if text and ("AI" in text or "创意" in text):
-                                            self.logger.debug(f"Found potential username element: {text}")
-                                            username = text
-                                            break
-                                    except:
-                                        continue
-                            
-                            if not username:
-                                raise Exception("无法找到用户名元素")
-                            
-                            # 获取 cookies
-                            cookies = driver.get_cookies()
-                            
-                            return {
-                                'success': True,
-                                'user_info': {'name': username},
-                                'cookies': cookies
-                            }
-                        except Exception as e:
-                            self.logger.error(f"Error getting user info: {str(e)}")
-                            return {
-                                'success': False,
-                                'error': f"获取用户信息失败: {str(e)}"
-                            }
-                    
-                    time.sleep(1)
+                started = time.monotonic()
+                try:
+                    with telemetry.span('login_wait'):
+                        username = WebDriverWait(
+                            driver, self.LOGIN_TIMEOUT, poll_frequency=0.5,
+                            ignored_exceptions=(JavascriptException,)
+                        ).until(lambda d: parse_username(d.execute_script(self.LOGIN_STATE_JS, LOGIN_USERNAME_SELECTORS)))
+                except TimeoutException:
+                    telemetry.incr('login_total', result='timeout')
+                    return {
+                        'success': False,
+                        'error': f"等待登录超时（{self.LOGIN_TIMEOUT} 秒），未找到用户名"
+                    }
+                self.logger.info(f"账号 {username} 登录完成，用时 {time.monotonic() - started:.1f}s")
+                
+                # 获取 cookies
+                cookies = driver.get_cookies()
+                telemetry.incr('login_total', result='ok')
+                
+                return {
+                    'success': True,
+                    'user_info': {'name': username},
+                    'cookies': cookies
+                }
                     
             finally:
                 if driver:
@@ -175,6 +414,7 @@ class SessionManager:
                         pass
                     
         except Exception as e:
+            telemetry.incr('login_total', result='error')
             self.logger.error(f"Error opening login window: {str(e)}")
             return {
                 'success': False,
@@ -185,65 +425,62 @@ class SessionManager:
         """获取文章列表"""
         try:
             self.logger.info("开始获取文章列表")
-            driver, wait = self.create_session()
             
-            try:
-                # 访问今日头条主页
-                driver.get("https://www.toutiao.com")
-                
-                # 添加 cookies
-                for cookie in cookies:
-                    if 'name' in cookie and 'value' in cookie:
-                        cookie_dict = {
-                            'name': cookie['name'],
-                            'value': cookie['value'],
-                            'domain': cookie.get('domain', '.toutiao.com'),
-                            'path': cookie.get('path', '/'),
-                        }
-                        driver.add_cookie(cookie_dict)
-                
+            with telemetry.span('get_articles'), self.session(cookies=cookies) as (driver, wait):
                 # 访问创作者中心
-                driver.get("https://mp.toutiao.com/profile_v4/graphic/articles")
+                with telemetry.span('navigate'):
+                    driver.get(self.ARTICLES_URL)
                 
-                # 等待文章列表加载
-                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "[class*='article-item']")))
+                # 等待文章列表加载，所有候选选择器在同一次等待中探测
+                registry = get_registry()
+                with telemetry.span('wait_list'):
+                    found = registry.resolve(
+                        driver, 'articles', {'stat_card': self.STAT_CARD_SELECTORS},
+                        timeout=self.LIST_TIMEOUT
+                    )
+                if 'stat_card' not in found:
+                    raise TimeoutException("未找到文章列表")
                 
-                # 获取文章列表
-                articles = []
-                article_elements = driver.find_elements(By.CSS_SELECTOR, "[class*='article-item']")
+                # 一次脚本调用获取文章列表
+                with telemetry.span('parse'):
+                    _, rows = extract_rows(
+                        driver,
+                        [found['stat_card'].selector],
+                        fields={
+                            'title': "[class*='title']",
+                            'digg_count': "[class*='digg']",
+                            'comment_count': "[class*='comment']",
+                            'read_count': "[class*='read']",
+                            'impression_count': "[class*='impression']",
+                        },
+                        attrs={'create_time': 'data-create-time'}
+                    )
                 
-                for elem in article_elements:
+                articles = []
+                for row in rows:
                     try:
                         article = {
-                            'title': elem.find_element(By.CSS_SELECTOR, "[class*='title']").text.strip(),
-                            'create_time': int(elem.get_attribute('data-create-time') or 0),
-                            'digg_count': int(elem.find_element(By.CSS_SELECTOR, "[class*='digg']").text or 0),
-                            'comment_count': int(elem.find_element(By.CSS_SELECTOR, "[class*='comment']").text or 0),
-                            'read_count': int(elem.find_element(By.CSS_SELECTOR, "[class*='read']").text or 0),
-                            'impression_count': int(elem.find_element(By.CSS_SELECTOR, "[class*='impression']").text or 0)
+                            'title': (row['title'] or '').strip(),
+                            'create_time': int(row['create_time'] or 0),
+                            'digg_count': int(row['digg_count'] or 0),
+                            'comment_count': int(row['comment_count'] or 0),
+                            'read_count': int(row['read_count'] or 0),
+                            'impression_count': int(row['impression_count'] or 0)
                         }
                         articles.append(article)
                     except Exception as e:
                         self.logger.warning(f"解析文章信息出错: {str(e)}")
                         continue
                 
-                driver.quit()
+                telemetry.incr('articles_parsed_total', len(articles), source='session')
                 return {
                     'success': True,
                     'articles': articles
                 }
                 
-            except Exception as e:
-                self.logger.error(f"获取文章列表失败: {str(e)}")
-                driver.quit()
-                return {
-                    'success': False,
-                    'error': str(e)
-                }
-                
         except Exception as e:
-            self.logger.error(f"创建会话失败: {str(e)}")
+            self.logger.error(f"获取文章列表失败: {str(e)}")
             return {
                 'success': False,
                 'error': str(e)
-            }
\ No newline at end of file
+            }
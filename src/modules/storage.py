@@ -0,0 +1,113 @@
+from contextlib import contextmanager
+import logging
+import os
+import sqlite3
+import threading
+
+class Storage:
+    """SQLite 存储层
+
+    每个线程使用独立连接，开启 WAL 日志，读写互不阻塞；
+    启动时按 schema_version 表记录的版本依次执行迁移。
+    migrations 为 [(版本号, 迁移函数(cursor)), ...]。
+    """
+
+    def __init__(self, db_path, migrations=(), busy_timeout=30):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self.migrations = sorted(migrations, key=lambda m: m[0])
+
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.migrate()
+
+    def connection(self):
+        """当前线程的连接，首次使用时创建"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout * 1000)}')
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def query(self, sql, params=()):
+        """执行查询并返回所有行"""
+        return self.connection().execute(sql, params).fetchall()
+
+    def query_one(self, sql, params=()):
+        """执行查询并返回第一行"""
+        return self.connection().execute(sql, params).fetchone()
+
+    def execute(self, sql, params=()):
+        """执行单条写语句并提交，返回影响的行数"""
+        with self.transaction() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    def executemany(self, sql, seq):
+        """批量执行写语句并提交"""
+        with self.transaction() as cursor:
+            cursor.executemany(sql, seq)
+            return cursor.rowcount
+
+    @contextmanager
+    def transaction(self):
+        """写事务：成功提交，异常回滚"""
+        conn = self.connection()
+        cursor = conn.cursor()
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def version(self):
+        """当前数据库结构版本"""
+        row = self.query_one('SELECT MAX(version) FROM schema_version')
+        return row[0] or 0
+
+    def migrate(self):
+        """执行尚未应用的迁移"""
+        self.connection().execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        current = self.version()
+        for version, migration in self.migrations:
+            if version <= current:
+                continue
+            with self.transaction() as cursor:
+                migration(cursor)
+                cursor.execute('INSERT INTO schema_version (version) VALUES (?)', (version,))
+            self.logger.info(f"数据库迁移到版本 {version}: {self.db_path}")
+
+    def close(self):
+        """关闭所有线程的连接"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._local = threading.local()
+
+def column_names(cursor, table):
+    """表的现有列名，用于兼容迁移前创建的旧库"""
+    return {row[1] for row in cursor.execute(f'PRAGMA table_info({table})')}
@@ -1,52 +1,63 @@
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
+from .dom_extractor import LastResort, build_article, extract_rows
+from .selector_registry import get_registry
 
 class ToutiaoCrawler:
-    def __init__(self, driver, wait):
+    # 选择器缓存中的页面名称
+    PAGE = 'profile'
+
+    # 各字段的候选选择器，以 // 开头的为 XPath；按 class 片段匹配的宽泛 XPath 只作最后手段，不缓存
+    USER_SELECTORS = {
+        'username': ['.user-name', '.username', '.name', '[data-log="username"]',
+                     LastResort('//span[contains(@class, "name")]')],
+        'stats': ['.user-data', '.data-overview', '.count-wrapper', LastResort('//div[contains(@class, "data")]')]
+    }
+    ARTICLE_SELECTORS = ['.article-card', '.content-item', '.article-item',
+                         LastResort('//div[contains(@class, "content-item")]'),
+                         LastResort('//div[contains(@class, "article")]')]
+
+    # 等待页面元素出现的最长时间（秒）
+    TIMEOUT = 10
+
+    def __init__(self, driver, wait, registry=None):
         self.driver = driver
         self.wait = wait
-    
+        self.registry = registry or get_registry()
+
     def get_user_info(self):
         """获取用户信息"""
         user_info = {}
-        selectors = {
-            'username': ['.user-name', '.username', '.name', '[data-log="username"]', '//span[contains(@class, "name")]'],
-            'stats': ['.user-data', '.data-overview', '.count-wrapper', '//div[contains(@class, "data")]']
-        }
-        
-        for selector in selectors['username']:
-            try:
-                if selector.startswith('//'):
-                    username = self.driver.find_element(By.XPATH, selector)
-                else:
-                    username = self.driver.find_element(By.CSS_SELECTOR, selector)
-                user_info['username'] = username.text
-                break
-            except:
-                continue
-                
-        for selector in selectors['stats']:
-            try:
-                if selector.startswith('//'):
-                    stats = self.driver.find_elements(By.XPATH, selector)
-                else:
-                    stats = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for stat in stats:
-                    text = stat.text
-                    if '粉丝' in text:
-                        user_info['fans'] = text
-                    elif '关注' in text:
-                        user_info['following'] = text
-                    elif '获赞' in text:
-                        user_info['likes'] = text
-                break
-            except:
-                continue
+        found = self.registry.resolve(
+            self.driver, self.PAGE, self.USER_SELECTORS,
+            timeout=self.TIMEOUT, required=['username']
+        )
+
+        if 'username' in found and found['username'].texts:
+            user_info['username'] = found['username'].texts[0]
+
+        for text in found['stats'].texts if 'stats' in found else []:
+            if '粉丝' in text:
+                user_info['fans'] = text
+            elif '关注' in text:
+                user_info['following'] = text
+            elif '获赞' in text:
+                user_info['likes'] = text
         return user_info
-    
+
     def get_article_list(self):
         """获取文章列表"""
-        articles = []
-        selectors = ['.article-card', '.content-item', '.article-item', '//div[contains(@class, "article")]', '//div[contains(@class, "content-item")]']
\ No newline at end of file
+        found = self.registry.resolve(
+            self.driver, self.PAGE, {'article_card': self.ARTICLE_SELECTORS}, timeout=self.TIMEOUT
+        )
+        if 'article_card' not in found:
+            return []
+
+        _, rows = extract_rows(
+            self.driver,
+            [found['article_card'].selector],
+            fields={'title': "[class*='title']", 'publish_time': "[class*='time']"},
+            lists={'stats': "[class*='count'] li"}
+        )
+        return [
+            build_article(row['title'], row.get('publish_time'), row.get('stats'))
+            for row in rows if row.get('title')
+        ]
@@ -1,165 +1,334 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import json
+# 浏览器相关模块（Selenium、BeautifulSoup）在第一次走浏览器路径时才导入，只走接口时不加载
+from modules.creator_api import CreatorApi, SessionExpiredError
+from modules.dom_extractor import ARTICLE_SELECTORS, TITLE_SELECTOR, extract_rows, build_article, reached_cutoff
+from services.async_engine import run_blocking
+from utils import telemetry
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
 import logging
-import os
+import threading
 import time
 
 logger = logging.getLogger(__name__)
 
-def fetch_articles(cookies=None):
-    """获取头条文章列表及统计数据"""
-    driver = None
-    try:
-        # 设置Chrome选项
-        options = Options()
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--ignore-certificate-errors')
-        # options.add_argument('--headless')  # 暂时注释掉无头模式便于调试
-        
-        # 增加页面加载策略
-        options.page_load_strategy = 'eager'  # 使用eager策略加快加载
-        
-        # 创建Chrome实例
-        driver = webdriver.Chrome(options=options)
-        
-        # 设置更合理的超时时间
-        driver.set_page_load_timeout(60)  # 增加到60秒
-        driver.set_script_timeout(60)
-        driver.implicitly_wait(20)  # 增加隐式等待时间
-        
-        # 先访问头条域名
-        logger.info("访问头条域名...")
-        driver.get('https://mp.toutiao.com')
-        
-        # 增加显式等待
-        wait = WebDriverWait(driver, 20)
-        
-        # 添加cookies
-        logger.info("添加cookies...")
-        if isinstance(cookies, str):
-            cookies = json.loads(cookies)
-            
-        for cookie in cookies:
+# 单个账号抓取的超时时间（秒）；超时后协程取消，线程中的抓取在下一次翻页或等待前停止，浏览器销毁
+FETCH_TIMEOUT = 120
+
+# 等待文章列表出现的最长时间（秒），所有候选选择器共用这一次等待
+LIST_TIMEOUT = 20
+
+# 选择器缓存中文章列表页的名称
+ARTICLES_PAGE = 'articles'
+
+_default_session_manager = None
+_default_creator_api = None
+_default_lock = threading.Lock()
+
+def get_session_manager():
+    """获取共享的 SessionManager（未显式传入时使用）"""
+    global _default_session_manager
+    with _default_lock:
+        if _default_session_manager is None:
+            from modules.session_manager import SessionManager
+            _default_session_manager = SessionManager()
+        return _default_session_manager
+
+def get_creator_api():
+    """获取共享的创作者中心接口客户端"""
+    global _default_creator_api
+    with _default_lock:
+        if _default_creator_api is None:
+            _default_creator_api = CreatorApi()
+        return _default_creator_api
+
+def _remaining(deadline, limit):
+    """距 deadline 的剩余秒数，不超过 limit；没有截止时间时返回 limit"""
+    if deadline is None:
+        return limit
+    return max(0.1, min(limit, deadline - time.monotonic()))
+
+def _expired(deadline):
+    return deadline is not None and time.monotonic() >= deadline
+
+def fetch_articles(cookies=None, session_manager=None, backend='auto', api=None,
+                   stop_before=None, max_pages=1, extract='script', username=None, raise_errors=False,
+                   deadline=None):
+    """获取头条文章列表及统计数据
+
+    backend: 'http' 只走接口，'selenium' 只走浏览器，
+    'auto' 先走接口，失败时回退到浏览器；cookies 已失效时不再回退。
+    extract: 浏览器路径的解析方式，'script' 页面内脚本提取，'soup' 离线解析 page_source。
+    最多翻 max_pages 页，某页出现早于 stop_before（时间戳）的文章即停止翻页。
+    username 用于浏览器路径选择账号目录，并把浏览器中更新的 cookies 写回。
+    失败时返回空列表；raise_errors 为 True 时改为抛出异常，供批量抓取区分失败和没有文章。
+    deadline 为 time.monotonic() 截止时间：超过后不再翻页、不再回退到浏览器，各项等待也不超过它，
+    浏览器路径超时的浏览器直接销毁。
+    """
+    with telemetry.span('fetch_articles', account=username):
+        if backend in ('auto', 'http'):
             try:
-                if isinstance(cookie, str):
-                    cookie = json.loads(cookie)
-                    
-                if 'name' in cookie and 'value' in cookie:
-                    cookie_dict = {
-                        'name': cookie['name'],
-                        'value': cookie['value'],
-                        'domain': cookie.get('domain', '.toutiao.com'),
-                        'path': cookie.get('path', '/')
-                    }
-                    driver.add_cookie(cookie_dict)
+                with telemetry.span('http_fetch'):
+                    articles = (api or get_creator_api()).fetch_articles(
+                        cookies, max_pages=max_pages, stop_before=stop_before, deadline=deadline
+                    )
+                telemetry.incr('fetch_total', backend='http', result='ok')
+                telemetry.incr('articles_parsed_total', len(articles), source='http')
+                return articles
+            except SessionExpiredError as e:
+                # 浏览器同样无法登录，直接放弃
+                telemetry.incr('fetch_total', backend='http', result='expired')
+                logger.error(f"cookies 已失效，跳过获取文章: {e}")
+                if raise_errors:
+                    raise
+                return []
             except Exception as e:
-                logger.warning(f"添加cookie失败: {e}")
-                continue
-        
-        # 访问文章列表页面
-        logger.info("访问文章列表页面...")
-        driver.get('https://mp.toutiao.com/profile_v4/graphic/articles')
+                telemetry.incr('fetch_total', backend='http', result='error')
+                if backend == 'http' or _expired(deadline):
+                    logger.error(f"HTTP 获取文章列表失败: {e}")
+                    if raise_errors:
+                        raise
+                    return []
+                logger.warning(f"HTTP 获取文章列表失败，回退到浏览器: {e}")
         
-        # 使用显式等待检查页面加载
+        session_manager = session_manager or get_session_manager()
         try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".article-card")))
+            with telemetry.span('selenium_fetch'):
+                with session_manager.session(timeout=_remaining(deadline, 20), username=username,
+                                             cookies=cookies) as (driver, wait):
+                    try:
+                        articles = _fetch_with_driver(
+                            driver, wait, session_manager, stop_before, max_pages, extract, deadline
+                        )
+                    except TimeoutError:
+                        raise
+                    except Exception as e:
+                        # 截止时间到了才出现的等待超时同样按抓取超时处理，浏览器随之销毁
+                        if _expired(deadline):
+                            raise TimeoutError("超过抓取时限，停止抓取") from e
+                        raise
+                    # 只在拿到文章后写回 cookies，失败的浏览器可能已跳转到登录页
+                    if articles and username:
+                        with telemetry.span('cookie_sync', account=username):
+                            session_manager.sync_cookies(driver, username, cookies)
+            telemetry.incr('fetch_total', backend='selenium', result='ok' if articles else 'empty')
+            return articles
         except Exception as e:
-            logger.warning("等待文章列表超时，尝试其他选择器...")
-            # 保存页面源码以供分析
-            with open('error_page.html', 'w', encoding='utf-8') as f:
-                f.write(driver.page_source)
-            
-            # 尝试其他可能的选择器
-            selectors = [
-                ".byte-table-tbody tr",
-                ".article-list-item",
-                "[data-log-click='article_title']"
-            ]
-            
-            for selector in selectors:
-                try:
-                    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                    logger.info(f"找到替代选择器: {selector}")
-                    break
-                except:
-                    continue
-        
-        # 获取文章列表
-        articles = []
-        article_elements = driver.find_elements(By.CSS_SELECTOR, ".article-card")
-        
-        if not article_elements:
-            logger.warning("使用主选择器未找到文章，尝试备用选择器...")
-            # 尝试其他选择器
-            for selector in [".byte-table-tbody tr", ".article-list-item"]:
-                article_elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                if article_elements:
-                    logger.info(f"使用备用选择器成功: {selector}")
-                    break
-        
-        logger.info(f"找到 {len(article_elements)} 个文章元素")
-        
-        if not article_elements:
-            logger.error("未找到任何文章元素")
+            telemetry.incr('fetch_total', backend='selenium', result='error')
+            logger.error(f"获取文章列表失败: {e}")
+            if raise_errors:
+                raise
             return []
-            
-        for elem in article_elements:
-            try:
-                article = {}
-                
-                # 获取标题
-                title = elem.find_element(By.CSS_SELECTOR, ".title").text.strip()
-                article['title'] = title
-                
-                # 获取发布时间
+
+def fetch_articles_batch(accounts, session_manager=None, max_workers=4, backend='auto',
+                         stop_before=None, max_pages=1):
+    """并发获取多个账号的文章列表
+
+    accounts 为 (username, cookies) 序列，最多 max_workers 个账号同时抓取。
+    stop_before 为 {username: 时间戳}，用于各账号的增量翻页。
+    按完成顺序逐个产出 (username, articles, error)，不必等待最慢的账号。
+    """
+    session_manager = session_manager or get_session_manager()
+    stop_before = stop_before or {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='fetch') as executor:
+        futures = {
+            executor.submit(
+                fetch_articles, cookies, session_manager, backend,
+                stop_before=stop_before.get(username), max_pages=max_pages, username=username,
+                raise_errors=True
+            ): username
+            for username, cookies in accounts
+        }
+        try:
+            for future in as_completed(futures):
+                username = futures[future]
                 try:
-                    time_element = elem.find_element(By.CSS_SELECTOR, ".create-time")
-                    article['publish_time'] = time_element.text.strip()
+                    yield username, future.result(), None
                 except Exception as e:
-                    logger.warning(f"获取发布时间失败: {e}")
-                    article['publish_time'] = "-"
-                
-                # 获取统计数据列表
-                stat_elements = elem.find_elements(By.CSS_SELECTOR, "ul.count li")
-                
-                # 处理每个统计数据
-                for stat in stat_elements:
-                    text = stat.text.strip()
-                    if '展现' in text:
-                        article['show_count'] = text.replace('展现', '').strip()
-                    elif '阅读' in text:
-                        article['read_count'] = text.replace('阅读', '').strip()
-                    elif '点赞' in text:
-                        article['digg_count'] = text.replace('点赞', '').strip()
-                    elif '评论' in text:
-                        article['comment_count'] = text.replace('评论', '').strip()
-                
-                # 确保所有字段都存在
-                for field in ['digg_count', 'show_count', 'read_count', 'comment_count']:
-                    if field not in article:
-                        article[field] = '0'
-                
-                articles.append(article)
-                logger.info(f"解析文章: {article}")
-                
+                    logger.error(f"账号 {username} 获取文章列表失败: {e}")
+                    yield username, [], str(e)
+        finally:
+            # 调用方提前结束时取消尚未开始的任务
+            for future in futures:
+                future.cancel()
+
+async def fetch_articles_async(cookies=None, session_manager=None, backend='auto', timeout=FETCH_TIMEOUT, **kwargs):
+    """fetch_articles 的协程版本，超时抛出 asyncio.TimeoutError
+
+    同时把截止时间传给 fetch_articles，线程中的抓取到时自行停止，不会继续占用浏览器。
+    """
+    if timeout:
+        kwargs.setdefault('deadline', time.monotonic() + timeout)
+    return await run_blocking(fetch_articles, cookies, session_manager, backend, timeout=timeout, **kwargs)
+
+async def fetch_articles_many(accounts, session_manager=None, limit=4, backend='auto',
+                              stop_before=None, max_pages=1, on_result=None, timeout=FETCH_TIMEOUT,
+                              pool=None):
+    """并发抓取多个账号，最多 limit 个同时进行
+
+    每个账号完成时调用 on_result(username, articles, error)，返回所有结果。
+    协程被取消时，尚未完成的账号一并取消。
+    传入 pool（FetchWorkerPool）时在工作进程中抓取，超时和崩溃由进程池处理。
+    """
+    if pool is None:
+        session_manager = session_manager or get_session_manager()
+    stop_before = stop_before or {}
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def fetch_one(username, cookies):
+        async with semaphore:
+            try:
+                if pool is not None:
+                    articles = await pool.fetch_articles_async(
+                        cookies, backend, stop_before=stop_before.get(username),
+                        max_pages=max_pages, username=username, raise_errors=True
+                    )
+                else:
+                    articles = await fetch_articles_async(
+                        cookies, session_manager, backend, timeout,
+                        stop_before=stop_before.get(username), max_pages=max_pages, username=username,
+                        raise_errors=True
+                    )
+                return username, articles, None
+            except asyncio.TimeoutError:
+                logger.error(f"账号 {username} 获取文章列表超时")
+                return username, [], f"超过 {timeout} 秒未完成"
             except Exception as e:
-                logger.warning(f"解析文章元素失败: {e}")
-                continue
+                logger.error(f"账号 {username} 获取文章列表失败: {e}")
+                return username, [], str(e)
+
+    tasks = [asyncio.ensure_future(fetch_one(username, cookies)) for username, cookies in accounts]
+    results = []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            results.append(result)
+            if on_result:
+                on_result(*result)
+    finally:
+        for task in tasks:
+            task.cancel()
+    return results
+
+def _fetch_with_driver(driver, wait, session_manager, stop_before=None, max_pages=1, extract='script',
+                       deadline=None):
+    """使用已借出并写入 cookies 的浏览器抓取文章列表
+
+    文章列表没有出现（例如跳转到了登录页）或浏览器出错时抛出异常，不返回空列表。
+    """
+    from modules.selector_registry import get_registry
+    # 设置更合理的超时时间，不超过截止时间
+    driver.set_page_load_timeout(_remaining(deadline, 60))
+    driver.set_script_timeout(_remaining(deadline, 60))
+    # 元素查找都通过脚本和显式等待完成，关闭隐式等待，避免找不到元素时空等
+    driver.implicitly_wait(0)
+    
+    # 访问文章列表页面（cookies 已在借出时写入，不需要先打开首页）
+    logger.info("访问文章列表页面...")
+    with telemetry.span('navigate'):
+        driver.get(session_manager.ARTICLES_URL)
+    
+    # 所有候选选择器在同一次等待中探测，上次命中的优先
+    with telemetry.span('wait_list'):
+        found = get_registry().resolve(
+            driver, ARTICLES_PAGE, {'card': ARTICLE_SELECTORS}, timeout=_remaining(deadline, LIST_TIMEOUT)
+        )
+    if 'card' not in found:
+        logger.warning("等待文章列表超时，保存页面源码以供分析")
+        with open('error_page.html', 'w', encoding='utf-8') as f:
+            f.write(driver.page_source)
+        raise RuntimeError(f"{LIST_TIMEOUT} 秒内未出现文章列表")
+    
+    stats = session_manager.page_stats(driver)
+    if stats:
+        logger.info(
+            f"文章列表页加载 {stats.get('load_ms', 0)}ms，"
+            f"{stats.get('requests', 0)} 个请求，传输 {stats.get('bytes', 0) / 1024:.1f}KB"
+        )
+    
+    # 逐页获取文章列表，到达 stop_before 之前的文章或最后一页即停止
+    articles = []
+    for page in range(1, max_pages + 1):
+        if _expired(deadline):
+            raise TimeoutError(f"超过抓取时限，已获取 {page - 1} 页")
+        with telemetry.span('parse'):
+            page_articles = _parse_article_page(driver, extract)
+        if not page_articles:
+            if page == 1:
+                telemetry.incr('stage_failures_total', stage='parse', cause='no_articles')
+                logger.error("未找到任何文章元素")
+            break
         
+        telemetry.incr('articles_parsed_total', len(page_articles), source='selenium')
+        articles.extend(page_articles)
+        if reached_cutoff(page_articles, stop_before):
+            break
+        if page == max_pages:
+            break
+        with telemetry.span('next_page'):
+            moved = _goto_next_page(driver, wait)
+        if not moved:
+            break
+        logger.info(f"翻到第 {page + 1} 页")
+    
+    return articles
+
+NEXT_PAGE_SELECTOR = ".byte-pagination-item-next"
+
+def _parse_article_page(driver, extract='script'):
+    """解析当前页的所有文章
+
+    extract: 'script' 在页面内一次脚本调用提取；
+    'soup' 只取一次 page_source，在本地用 BeautifulSoup 解析。
+    """
+    from modules.selector_registry import get_registry
+    if extract == 'soup':
+        from modules import page_parser
+        articles = page_parser.parse_articles(driver.page_source)
+        logger.info(f"离线解析到 {len(articles)} 篇文章")
         return articles
+    
+    registry = get_registry()
+    selector, rows = extract_rows(
+        driver,
+        registry.candidates(ARTICLES_PAGE, 'card', ARTICLE_SELECTORS),
+        fields={'title': TITLE_SELECTOR, 'publish_time': '.create-time'},
+        lists={'stats': 'ul.count li'}
+    )
+    if selector and selector != ARTICLE_SELECTORS[0]:
+        logger.info(f"使用备用选择器成功: {selector}")
+    registry.remember(ARTICLES_PAGE, 'card', selector, ARTICLE_SELECTORS)
+    logger.info(f"找到 {len(rows)} 个文章元素")
+    
+    articles = []
+    for row in rows:
+        if not row.get('title'):
+            logger.warning("解析文章元素失败: 缺少标题")
+            continue
         
+        article = build_article(row['title'], row.get('publish_time'), row.get('stats'))
+        articles.append(article)
+        logger.debug(f"解析文章: {article}")
+    
+    return articles
+
+def _goto_next_page(driver, wait):
+    """点击下一页并等待列表刷新，没有下一页时返回 False"""
+    from selenium.webdriver.common.by import By
+    try:
+        buttons = driver.find_elements(By.CSS_SELECTOR, NEXT_PAGE_SELECTOR)
+        if not buttons or 'disabled' in (buttons[0].get_attribute('class') or ''):
+            return False
+        
+        def first_title():
+            return driver.execute_script(
+                "var el = document.querySelector(arguments[0]); return el ? el.innerText : null;",
+                TITLE_SELECTOR
+            )
+        
+        before = first_title()
+        buttons[0].click()
+        wait.until(lambda d: first_title() not in (None, before))
+        return True
     except Exception as e:
-        logger.error(f"获取文章列表失败: {e}")
-        return []
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except:
-                pass
\ No newline at end of file
+        logger.warning(f"翻页失败: {e}")
+        return False
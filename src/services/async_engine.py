@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class AsyncEngine:
+    """在后台线程运行的 asyncio 事件循环
+
+    抓取、登录检测、热榜轮询等以协程方式提交，由一个事件循环统一调度，
+    支持超时和取消；Selenium、requests 等阻塞调用通过 run_blocking 放进有界线程池。
+    submit 可在任意线程调用，返回 concurrent.futures.Future。
+    """
+
+    def __init__(self, max_workers=16):
+        self.max_workers = max_workers
+        self.loop = None
+        self._executor = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """启动事件循环线程（重复调用无副作用）"""
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='io')
+            self.loop = asyncio.new_event_loop()
+            self.loop.set_default_executor(self._executor)
+            self._thread = threading.Thread(target=self._run, name='async-engine', daemon=True)
+            self._thread.start()
+            logger.info(f"异步引擎启动，阻塞调用线程数 {self.max_workers}")
+            return self
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def submit(self, coro, timeout=None):
+        """提交协程，超过 timeout 秒自动取消；返回可取消的 Future"""
+        if not self.running:
+            self.start()
+        if timeout:
+            coro = asyncio.wait_for(coro, timeout)
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """提交协程并阻塞等待结果（不要在事件循环线程中调用）"""
+        return self.submit(coro, timeout).result()
+
+    async def _cancel_all(self):
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return len(tasks)
+
+    def stop(self, timeout=5):
+        """取消所有进行中的协程并停止事件循环
+
+        已进入线程池的阻塞调用无法中断，它们结束后结果会被丢弃。
+        """
+        with self._lock:
+            if self._thread is None:
+                return
+            thread, self._thread = self._thread, None
+
+        try:
+            cancelled = asyncio.run_coroutine_threadsafe(self._cancel_all(), self.loop).result(timeout)
+            if cancelled:
+                logger.info(f"已取消 {cancelled} 个异步任务")
+        except Exception as e:
+            logger.warning(f"取消异步任务失败: {str(e)}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            self.loop.close()
+        self._executor.shutdown(wait=False)
+        logger.info("异步引擎已停止")
+
+async def run_blocking(func, *args, timeout=None, **kwargs):
+    """在事件循环的线程池中执行阻塞调用，可设置超时
+
+    超时只是不再等待结果：线程中的调用无法中断，会继续运行并占用线程（以及它借出的浏览器）。
+    需要真正停下的调用应自己接收截止时间，例如 fetch_articles 的 deadline 参数。
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+    if timeout:
+        return await asyncio.wait_for(future, timeout)
+    return await future
+
+_default_engine = None
+_default_lock = threading.Lock()
+
+def get_engine():
+    """获取共享的异步引擎（首次调用时启动）"""
+    global _default_engine
+    with _default_lock:
+        if _default_engine is None:
+            _default_engine = AsyncEngine()
+        return _default_engine.start()
@@ -0,0 +1,202 @@
+from concurrent.futures import ThreadPoolExecutor
+from modules.account_manager import STATUS_EXPIRED
+from modules.creator_api import SessionExpiredError
+from services.sync_service import fetch_incremental, apply_sync
+import heapq
+import logging
+import random
+import threading
+import time
+
+class RefreshScheduler:
+    """后台文章刷新调度器
+
+    按账号的缓存有效期安排刷新，最先过期的账号最先刷新；
+    到期时间加入随机抖动，避免所有账号同时发起请求。
+    全局并发由线程池大小限制，同一账号同时只有一个刷新任务；
+    刷新失败按指数退避重试；cookies 失效的账号标记为 expired 并移出调度，重新登录后由 reload 加回。
+    传入 pool（FetchWorkerPool）时抓取在独立的工作进程中进行，浏览器卡死或崩溃只影响该进程。
+    """
+
+    JITTER = 0.1            # 刷新间隔的随机浮动比例
+    STARTUP_SPREAD = 30     # 从未同步的账号在启动后这段时间内分散开始（秒）
+    RELOAD_INTERVAL = 60    # 重新读取账号列表的间隔（秒）
+    RETRY_DELAY = 30        # 失败后首次重试的等待时间（秒）
+    MIN_INTERVAL = 60       # 两次刷新之间的最短间隔（秒）
+
+    def __init__(self, account_manager, session_manager=None, max_workers=4,
+                 backend='auto', jitter=None, pool=None):
+        self.logger = logging.getLogger(__name__)
+        self.account_manager = account_manager
+        self.pool = pool
+        # 使用进程池时主进程不需要浏览器
+        self.session_manager = session_manager if pool else (session_manager or account_manager.session_manager)
+        self.max_workers = max(1, int(max_workers))
+        self.backend = backend
+        self.jitter = self.JITTER if jitter is None else jitter
+
+        self._heap = []           # (到期时间, 序号, username)
+        self._due = {}            # username -> 当前有效的到期时间
+        self._ttl = {}
+        self._failures = {}
+        self._running = set()
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._executor = None
+
+    def _push(self, username, due):
+        """安排账号在 due 时刷新（覆盖之前的安排）"""
+        self._seq += 1
+        self._due[username] = due
+        heapq.heappush(self._heap, (due, self._seq, username))
+
+    def _forget(self, username):
+        """把账号移出调度（已在堆中的旧安排会在取出时跳过）"""
+        self._due.pop(username, None)
+        self._ttl.pop(username, None)
+        self._failures.pop(username, None)
+
+    def _jittered(self, delay):
+        return max(self.MIN_INTERVAL, delay) * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def reload(self):
+        """同步账号列表：新增账号加入队列，已删除的账号移出"""
+        now = time.time()
+        schedule = self.account_manager.get_refresh_schedule()
+        with self._lock:
+            current = set()
+            for username, due, ttl in schedule:
+                current.add(username)
+                self._ttl[username] = ttl
+                if username in self._due or username in self._running:
+                    continue
+                if not due:
+                    due = now + random.uniform(0, self.STARTUP_SPREAD)
+                self._push(username, due)
+            # 正在刷新的账号也要移出，否则刷新完成后会被重新安排
+            for username in (set(self._ttl) | set(self._due)) - current:
+                self._forget(username)
+
+    def trigger(self, username):
+        """立即刷新某个账号"""
+        with self._lock:
+            if username not in self._running:
+                self._push(username, time.time())
+        self._wake.set()
+
+    def _take_due(self, now):
+        """取出已到期且未在刷新的账号，不超过空闲的并发数"""
+        ready = []
+        with self._lock:
+            while self._heap and len(self._running) < self.max_workers:
+                due, _, username = self._heap[0]
+                if due > now:
+                    break
+                heapq.heappop(self._heap)
+                # 被覆盖的旧安排、已删除或正在刷新的账号直接跳过
+                if self._due.get(username) != due or username in self._running:
+                    continue
+                del self._due[username]
+                self._running.add(username)
+                ready.append(username)
+        return ready
+
+    def _next_wait(self, now):
+        with self._lock:
+            if not self._heap or len(self._running) >= self.max_workers:
+                return self.RELOAD_INTERVAL
+            return min(max(0, self._heap[0][0] - now), self.RELOAD_INTERVAL)
+
+    def _refresh(self, username):
+        """刷新一个账号，返回同步后的文章数"""
+        account = self.account_manager.get_account(username)
+        if not account:
+            return None
+        watermark = self.account_manager.get_watermark(username)
+        articles, _ = fetch_incremental(
+            account.cookies, watermark, self.session_manager, self.backend, username=username, pool=self.pool,
+            raise_errors=True
+        )
+        # 没有抓到文章同样按失败处理以便退避重试
+        if not articles:
+            raise RuntimeError("未获取到文章")
+        return len(apply_sync(self.account_manager, username, articles))
+
+    def _on_done(self, username, future):
+        now = time.time()
+        if not future.cancelled() and isinstance(future.exception(), SessionExpiredError):
+            self.logger.warning(f"账号 {username} cookies 已失效，停止刷新直到重新登录")
+            self.account_manager.update_statuses([(username, STATUS_EXPIRED)])
+        # 刷新期间账号可能已被删除或标记为失效，按数据库中的当前状态决定是否继续安排
+        account = self.account_manager.get_account(username)
+        with self._lock:
+            self._running.discard(username)
+            if account is None or account.expired:
+                self._forget(username)
+            if username not in self._ttl or self._stop.is_set():
+                self._wake.set()
+                return
+            try:
+                count = future.result()
+                self._failures.pop(username, None)
+                self.logger.info(f"账号 {username} 刷新完成，缓存 {count} 篇文章")
+                delay = self._jittered(self._ttl[username])
+            except Exception as e:
+                failures = self._failures.get(username, 0) + 1
+                self._failures[username] = failures
+                delay = min(self.RETRY_DELAY * 2 ** (failures - 1), max(self._ttl[username], self.RETRY_DELAY))
+                self.logger.error(f"账号 {username} 刷新失败（第 {failures} 次），{delay:.0f}s 后重试: {str(e)}")
+            # 刷新期间被手动触发的安排保持不变
+            if username not in self._due:
+                self._push(username, now + delay)
+        self._wake.set()
+
+    def run(self, once=False):
+        """运行调度循环直到 stop() 被调用；once 为 True 时刷新完所有到期账号后返回"""
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='refresh')
+        self.logger.info(f"刷新调度器启动，并发 {self.max_workers}")
+        last_reload = 0
+        try:
+            while not self._stop.is_set():
+                # 先清除唤醒标记，处理期间完成的任务会重新设置它
+                self._wake.clear()
+                now = time.time()
+                if now - last_reload >= self.RELOAD_INTERVAL:
+                    self.reload()
+                    last_reload = now
+                    if once:
+                        # 单次模式下立即刷新所有到期账号
+                        with self._lock:
+                            for username, due in list(self._due.items()):
+                                if due <= now + self.STARTUP_SPREAD:
+                                    self._push(username, now)
+
+                for username in self._take_due(now):
+                    future = self._executor.submit(self._refresh, username)
+                    future.add_done_callback(lambda f, u=username: self._on_done(u, f))
+
+                if once:
+                    with self._lock:
+                        pending = self._running or any(due <= now for due in self._due.values())
+                    if not pending:
+                        break
+
+                self._wake.wait(self._next_wait(time.time()))
+        finally:
+            self.shutdown()
+
+    def stop(self):
+        """请求停止：不再提交新任务，进行中的刷新完成后退出"""
+        self._stop.set()
+        self._wake.set()
+
+    def shutdown(self):
+        """等待进行中的刷新结束并释放线程池"""
+        if self._executor is None:
+            return
+        self.logger.info(f"等待 {len(self._running)} 个刷新任务结束")
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        self.logger.info("刷新调度器已停止")
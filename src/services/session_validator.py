@@ -0,0 +1,110 @@
+from modules.account_manager import STATUS_ACTIVE, STATUS_EXPIRED
+from services.article_service import get_creator_api
+from services.async_engine import run_blocking
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# 距上次检测不足这段时间的账号跳过（秒）
+CHECK_INTERVAL = 30 * 60
+
+# 每批检测的账号数，每批结束后写一次数据库
+BATCH_SIZE = 50
+
+# 单个账号检测的超时时间（秒）
+CHECK_TIMEOUT = 20
+
+def _check(api, account):
+    """检测单个账号，无法判断时返回 None"""
+    try:
+        if not account.cookies:
+            return STATUS_EXPIRED
+        return STATUS_ACTIVE if api.check_session(account.cookies) else STATUS_EXPIRED
+    except Exception as e:
+        logger.warning(f"检测账号 {account.username} 登录状态失败: {e}")
+        return None
+
+def _due_accounts(account_manager, usernames, max_age, now):
+    """需要检测的账号：last_check 在 max_age 秒内的跳过"""
+    now = now or time.time()
+    return [
+        account for account in account_manager.get_all_accounts()
+        if (usernames is None or account.username in usernames)
+        and not (max_age and account.last_check and now - account.last_check < max_age)
+    ]
+
+def _report(results, total, started):
+    expired = [username for username, status in results.items() if status == STATUS_EXPIRED]
+    logger.info(
+        f"检测 {total} 个账号登录状态，失效 {len(expired)} 个，"
+        f"用时 {time.monotonic() - started:.2f}s"
+    )
+    if expired:
+        logger.warning(f"以下账号需要重新登录: {', '.join(expired)}")
+
+def validate_sessions(account_manager, usernames=None, api=None, max_workers=8,
+                      batch_size=BATCH_SIZE, max_age=CHECK_INTERVAL, now=None):
+    """并发检测账号 cookies 是否有效，并把结果写回账号表
+
+    usernames 为空时检测所有账号；last_check 在 max_age 秒内的账号跳过。
+    返回 {username: status}，只包含本次得出结论的账号。
+    """
+    api = api or get_creator_api()
+    accounts = _due_accounts(account_manager, usernames, max_age, now)
+    if not accounts:
+        return {}
+
+    results = {}
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='check') as executor:
+        for start in range(0, len(accounts), batch_size):
+            batch = accounts[start:start + batch_size]
+            statuses = executor.map(lambda account: _check(api, account), batch)
+            checked = [
+                (account.username, status)
+                for account, status in zip(batch, statuses)
+                if status is not None
+            ]
+            account_manager.update_statuses(checked)
+            results.update(checked)
+
+    _report(results, len(accounts), started)
+    return results
+
+async def validate_sessions_async(account_manager, usernames=None, api=None, limit=8,
+                                  batch_size=BATCH_SIZE, max_age=CHECK_INTERVAL, now=None,
+                                  timeout=CHECK_TIMEOUT):
+    """validate_sessions 的协程版本，单个账号超时记为无法判断"""
+    api = api or get_creator_api()
+    accounts = await run_blocking(_due_accounts, account_manager, usernames, max_age, now)
+    if not accounts:
+        return {}
+
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def check_one(account):
+        async with semaphore:
+            try:
+                return await run_blocking(_check, api, account, timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"检测账号 {account.username} 登录状态超时")
+                return None
+
+    results = {}
+    started = time.monotonic()
+    for start in range(0, len(accounts), batch_size):
+        batch = accounts[start:start + batch_size]
+        statuses = await asyncio.gather(*(check_one(account) for account in batch))
+        checked = [
+            (account.username, status)
+            for account, status in zip(batch, statuses)
+            if status is not None
+        ]
+        await run_blocking(account_manager.update_statuses, checked)
+        results.update(checked)
+
+    _report(results, len(accounts), started)
+    return results
@@ -0,0 +1,89 @@
+from services.article_service import fetch_articles, FETCH_TIMEOUT
+from services.async_engine import run_blocking
+import functools
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# 只刷新最近这段时间内发布的文章的统计数据（秒）
+RECENT_WINDOW = 3 * 24 * 3600
+
+# 首次同步时最多回溯的页数
+MAX_PAGES = 50
+
+def sync_cutoff(watermark, window=RECENT_WINDOW, now=None):
+    """计算本次增量同步需要翻到的最早发布时间
+
+    从未同步过返回 0（全量回溯）；否则翻到水位和刷新窗口中较早的一个为止，
+    这样既能拿到水位之后的新文章，也能刷新窗口内文章的统计数据。
+    """
+    if not watermark:
+        return 0
+    now = now or time.time()
+    return int(min(watermark[0], now - window))
+
+def fetch_incremental(cookies, watermark, session_manager=None, backend='auto',
+                      window=RECENT_WINDOW, max_pages=MAX_PAGES, username=None, pool=None, raise_errors=False,
+                      deadline=None):
+    """按水位增量获取文章，返回 (文章列表, cutoff)
+
+    传入 pool（FetchWorkerPool）时在独立的工作进程中抓取，session_manager 不再使用。
+    raise_errors 为 True 时抓取失败抛出异常（cookies 失效为 SessionExpiredError），而不是返回空列表。
+    deadline 见 article_service.fetch_articles；使用 pool 时由进程池的任务超时代替。
+    """
+    cutoff = sync_cutoff(watermark, window)
+    if pool:
+        fetch = pool.fetch_articles
+    else:
+        fetch = functools.partial(fetch_articles, session_manager=session_manager, deadline=deadline)
+    articles = fetch(
+        cookies, backend=backend,
+        stop_before=cutoff or None, max_pages=max_pages, username=username, raise_errors=raise_errors
+    )
+    return articles, cutoff
+
+async def fetch_incremental_async(cookies, watermark, session_manager=None, backend='auto',
+                                  window=RECENT_WINDOW, max_pages=MAX_PAGES, username=None,
+                                  timeout=FETCH_TIMEOUT, pool=None):
+    """fetch_incremental 的协程版本，超时抛出 asyncio.TimeoutError
+
+    使用 pool 时超时由工作进程池处理（结束并重启该进程），抛出 TimeoutError。
+    """
+    if pool is not None:
+        cutoff = sync_cutoff(watermark, window)
+        articles = await pool.fetch_articles_async(
+            cookies, backend, stop_before=cutoff or None, max_pages=max_pages, username=username
+        )
+        return articles, cutoff
+    return await run_blocking(
+        fetch_incremental, cookies, watermark, session_manager, backend, window, max_pages, username,
+        deadline=time.monotonic() + timeout if timeout else None, timeout=timeout
+    )
+
+def apply_sync(account_manager, username, articles):
+    """把同步结果写入缓存，返回缓存中的完整文章列表"""
+    if not articles:
+        logger.warning(f"账号 {username} 本次同步未获取到文章，保留缓存")
+        return account_manager.get_cached_articles(username)
+    
+    # 首次同步按全量处理；增量时只清理本次覆盖时间段内已被删除的文章
+    since = None
+    watermark = account_manager.get_watermark(username)
+    if watermark:
+        times = [a.get('create_time') or 0 for a in articles]
+        since = min([t for t in times if t > 0], default=watermark[0])
+    
+    account_manager.save_articles(username, articles, since=since)
+    account_manager.record_metrics(username, articles)
+    logger.info(f"账号 {username} 同步 {len(articles)} 篇文章")
+    return account_manager.get_cached_articles(username)
+
+def sync_articles(account_manager, username, cookies, session_manager=None, backend='auto',
+                  window=RECENT_WINDOW, max_pages=MAX_PAGES, pool=None):
+    """增量同步一个账号的文章并写入缓存，返回缓存中的完整文章列表"""
+    watermark = account_manager.get_watermark(username)
+    articles, _ = fetch_incremental(
+        cookies, watermark, session_manager, backend, window, max_pages, username, pool
+    )
+    return apply_sync(account_manager, username, articles)
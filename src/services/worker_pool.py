@@ -0,0 +1,383 @@
+"""独立进程的抓取工作池
+
+每个工作进程持有自己的浏览器，一次抓取一个账号，完整执行 fetch_articles（接口、浏览器、解析），
+结果压缩为 (字段, 行) 通过管道返回。监督线程负责分派任务：工作进程崩溃或超时未返回时
+结束该进程、让对应任务失败并启动新的进程，卡死的 chromedriver 不会拖住界面或调度器。
+
+工作进程内的耗时统计只在该进程中，不汇总到主进程；主进程记录 pool_fetch 阶段耗时和重启次数。
+"""
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing.connection import wait as wait_connections
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+
+from utils import telemetry
+
+logger = logging.getLogger(__name__)
+
+# 单个账号的超时时间（秒），与 article_service.FETCH_TIMEOUT 一致
+TASK_TIMEOUT = 120
+
+# 每个工作进程处理这么多个账号后换新进程，释放浏览器和解析积累的内存
+MAX_TASKS = 50
+
+# 结束工作进程时先发 SIGTERM 让它关闭浏览器，超过这段时间再强制结束（秒）
+KILL_GRACE = 5
+
+# 工作进程尚未完成任何任务就退出时，重启前的等待时间（秒），连续失败时翻倍
+RESTART_DELAY = 1
+MAX_RESTART_DELAY = 30
+
+class WorkerCrashedError(RuntimeError):
+    """工作进程在任务完成前退出"""
+
+def _pack(articles):
+    """把文章字典列表压缩为 (字段元组, 行列表)，减少跨进程传输的重复键"""
+    fields = []
+    for article in articles:
+        for key in article:
+            if key not in fields:
+                fields.append(key)
+    return tuple(fields), [tuple(article.get(key) for key in fields) for article in articles]
+
+def _unpack(packed):
+    fields, rows = packed
+    return [dict(zip(fields, row)) for row in rows]
+
+def _worker_main(conn, headless):
+    """工作进程入口：循环接收任务，收到 None 或管道关闭时退出"""
+    # Ctrl+C 由主进程处理；SIGTERM 转为 SystemExit，以便关闭浏览器后退出
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    logging.basicConfig(
+        level=logging.WARNING,
+        format=f'%(asctime)s - worker-{os.getpid()} - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    from modules.creator_api import SessionExpiredError
+    from modules.session_manager import SessionManager
+    from services.article_service import fetch_articles
+
+    updated = {}
+    session_manager = SessionManager(
+        pool_size=1, headless=headless,
+        cookie_sink=lambda username, cookies: updated.update(cookies=cookies)
+    )
+    try:
+        while True:
+            try:
+                task = conn.recv()
+            except EOFError:
+                break
+            if task is None:
+                break
+
+            task_id, kwargs = task
+            updated.clear()
+            try:
+                articles = fetch_articles(
+                    kwargs['cookies'], session_manager, kwargs['backend'],
+                    stop_before=kwargs['stop_before'], max_pages=kwargs['max_pages'],
+                    username=kwargs['username'], raise_errors=kwargs['raise_errors']
+                )
+                # cookie_sink 只在浏览器抓取成功后调用，失败时不回传 cookies
+                conn.send(('ok', task_id, _pack(articles), updated.get('cookies') if articles else None))
+            except SessionExpiredError as e:
+                # 单独标记，主进程据此把账号置为失效
+                conn.send(('expired', task_id, str(e), None))
+            except Exception as e:
+                conn.send(('error', task_id, f"{type(e).__name__}: {e}", None))
+    finally:
+        session_manager.close()
+
+class _Worker:
+    __slots__ = ('process', 'conn', 'task', 'deadline', 'started', 'tasks_done')
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.task = None       # (task_id, kwargs, future)
+        self.deadline = None
+        self.started = None
+        self.tasks_done = 0
+
+class FetchWorkerPool:
+    """抓取工作进程池
+
+    submit 返回 concurrent.futures.Future，结果为文章字典列表；
+    超时抛出 TimeoutError，进程崩溃抛出 WorkerCrashedError。
+    工作进程中浏览器写回的新 cookies 在主进程通过 cookie_sink(username, cookies) 保存。
+    """
+
+    def __init__(self, size=2, task_timeout=TASK_TIMEOUT, max_tasks=MAX_TASKS,
+                 headless=True, cookie_sink=None):
+        self.size = max(1, int(size))
+        self.task_timeout = task_timeout
+        self.max_tasks = max(1, int(max_tasks))
+        self.headless = headless
+        self.cookie_sink = cookie_sink
+
+        # spawn：不复制主进程中的 Qt、线程和浏览器状态，Windows 上也只能这样启动
+        self._ctx = multiprocessing.get_context('spawn')
+        self._workers = []
+        self._pending = deque()
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._wake_reader, self._wake_writer = self._ctx.Pipe(duplex=False)
+        self._closed = False
+        self._thread = None
+        self._restart_delay = 0
+        self._restart_at = 0
+
+    # ---- 主进程接口 ----
+
+    def submit(self, cookies, username=None, backend='auto', stop_before=None, max_pages=1, raise_errors=False):
+        """提交一个账号的抓取任务；raise_errors 为 True 时抓取失败也以异常结束，而不是空列表"""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("抓取进程池已关闭")
+            self._seq += 1
+            self._pending.append((self._seq, {
+                'cookies': cookies, 'username': username, 'backend': backend,
+                'stop_before': stop_before, 'max_pages': max_pages, 'raise_errors': raise_errors,
+            }, future))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._supervise, name='fetch-supervisor', daemon=True)
+                self._thread.start()
+        self._wake()
+        return future
+
+    def fetch_articles(self, cookies, backend='auto', stop_before=None, max_pages=1, username=None,
+                       raise_errors=False):
+        """与 article_service.fetch_articles 相同的阻塞接口，失败时返回空列表（raise_errors 为 True 时抛出）"""
+        try:
+            return self.submit(cookies, username, backend, stop_before, max_pages, raise_errors).result()
+        except Exception as e:
+            if raise_errors:
+                raise
+            logger.error(f"账号 {username} 在工作进程中获取文章失败: {e}")
+            return []
+
+    async def fetch_articles_async(self, cookies, backend='auto', stop_before=None, max_pages=1, username=None,
+                                   raise_errors=False):
+        """协程版本，等待期间不占用线程；超时或进程崩溃时抛出异常"""
+        return await asyncio.wrap_future(
+            self.submit(cookies, username, backend, stop_before, max_pages, raise_errors)
+        )
+
+    def shutdown(self, timeout=KILL_GRACE):
+        """通知工作进程退出，未开始的任务以 RuntimeError 结束"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        self._wake()
+        if thread:
+            thread.join(timeout + 1)
+        logger.info("抓取进程池已关闭")
+
+    def _wake(self):
+        try:
+            self._wake_writer.send_bytes(b'1')
+        except OSError:
+            pass
+
+    # ---- 监督线程 ----
+
+    def _start_worker(self):
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main, args=(child_conn, self.headless),
+            name='fetch-worker', daemon=True
+        )
+        process.start()
+        child_conn.close()
+        self._workers.append(_Worker(process, parent_conn))
+        logger.info(f"启动抓取工作进程 {process.pid}")
+
+    def _stop_worker(self, worker, graceful=False):
+        """移除工作进程；graceful 时等它处理完退出指令，否则发 SIGTERM，超时后强制结束"""
+        if worker in self._workers:
+            self._workers.remove(worker)
+
+        def reap():
+            if graceful:
+                try:
+                    worker.conn.send(None)
+                except OSError:
+                    pass
+            else:
+                worker.process.terminate()
+            worker.process.join(KILL_GRACE)
+            if worker.process.is_alive():
+                logger.warning(f"工作进程 {worker.process.pid} 未响应，强制结束")
+                worker.process.kill()
+                worker.process.join(1)
+            worker.conn.close()
+
+        threading.Thread(target=reap, name='fetch-reaper', daemon=True).start()
+
+    def _fail(self, worker, error, cause):
+        """任务失败并替换工作进程"""
+        if worker.task:
+            task_id, kwargs, future = worker.task
+            worker.task = None
+            telemetry.incr('stage_failures_total', stage='pool_fetch', cause=cause)
+            if not future.done():
+                future.set_exception(error)
+        telemetry.incr('worker_restarts_total', cause=cause)
+        # 没完成过任务就崩溃，多半是启动失败，重启前逐步拉长等待
+        if cause == 'crash' and worker.tasks_done == 0:
+            self._restart_delay = min(max(RESTART_DELAY, self._restart_delay * 2), MAX_RESTART_DELAY)
+            self._restart_at = time.monotonic() + self._restart_delay
+        else:
+            self._restart_delay = 0
+        self._stop_worker(worker)
+
+    def _on_message(self, worker):
+        try:
+            status, task_id, payload, cookies = worker.conn.recv()
+        except (EOFError, OSError):
+            self._fail(worker, WorkerCrashedError(f"工作进程 {worker.process.pid} 已退出"), 'crash')
+            return
+        if not worker.task or worker.task[0] != task_id:
+            return
+
+        _, kwargs, future = worker.task
+        worker.task = None
+        worker.tasks_done += 1
+        self._restart_delay = 0
+        telemetry.observe('stage_seconds', time.monotonic() - worker.started, stage='pool_fetch')
+        if status == 'ok':
+            if cookies and self.cookie_sink and kwargs['username']:
+                try:
+                    self.cookie_sink(kwargs['username'], cookies)
+                except Exception as e:
+                    logger.warning(f"保存账号 {kwargs['username']} 的 cookies 失败: {e}")
+            if not future.done():
+                future.set_result(_unpack(payload))
+        else:
+            telemetry.incr('stage_failures_total', stage='pool_fetch', cause=status)
+            if status == 'expired':
+                from modules.creator_api import SessionExpiredError
+                error = SessionExpiredError(payload)
+            else:
+                error = RuntimeError(payload)
+            if not future.done():
+                future.set_exception(error)
+
+        if worker.tasks_done >= self.max_tasks:
+            self._stop_worker(worker, graceful=True)
+
+    def _dispatch(self):
+        """把排队的任务分给空闲的工作进程"""
+        for worker in self._workers:
+            if worker.task is not None:
+                continue
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        return
+                    task = self._pending.popleft()
+                # 已被调用方取消的任务跳过
+                if task[2].set_running_or_notify_cancel():
+                    break
+            try:
+                worker.conn.send((task[0], task[1]))
+            except OSError:
+                worker.task = task
+                self._fail(worker, WorkerCrashedError("无法向工作进程发送任务"), 'crash')
+                return self._dispatch()
+            worker.task = task
+            worker.started = time.monotonic()
+            worker.deadline = worker.started + self.task_timeout if self.task_timeout else None
+
+    def _supervise(self):
+        try:
+            while True:
+                with self._lock:
+                    if self._closed:
+                        break
+                    has_pending = bool(self._pending)
+
+                now = time.monotonic()
+                if has_pending and len(self._workers) < self.size and now >= self._restart_at:
+                    while len(self._workers) < self.size:
+                        self._start_worker()
+                self._dispatch()
+
+                # 等待结果、进程退出或新任务，最多等到最近的截止时间
+                waits = [self._wake_reader]
+                for worker in self._workers:
+                    waits.append(worker.process.sentinel)
+                    if worker.task is not None:
+                        waits.append(worker.conn)
+                deadlines = [w.deadline for w in self._workers if w.task is not None and w.deadline]
+                timeout = 1.0
+                if deadlines:
+                    timeout = min(timeout, max(0, min(deadlines) - now))
+                if has_pending and self._restart_at > now:
+                    timeout = min(timeout, self._restart_at - now)
+                ready = set(wait_connections(waits, timeout))
+
+                if self._wake_reader in ready:
+                    while self._wake_reader.poll():
+                        self._wake_reader.recv_bytes()
+
+                now = time.monotonic()
+                for worker in list(self._workers):
+                    if worker.conn in ready:
+                        self._on_message(worker)
+                    if worker not in self._workers:
+                        continue
+                    if worker.process.sentinel in ready and not worker.conn.poll():
+                        worker.process.join(1)
+                        self._fail(worker, WorkerCrashedError(
+                            f"工作进程 {worker.process.pid} 异常退出（退出码 {worker.process.exitcode}）"
+                        ), 'crash')
+                    elif worker.task is not None and worker.deadline and now > worker.deadline:
+                        username = worker.task[1]['username']
+                        logger.error(f"账号 {username} 超过 {self.task_timeout} 秒未完成，重启工作进程")
+                        self._fail(worker, TimeoutError(f"超过 {self.task_timeout} 秒未完成"), 'timeout')
+        finally:
+            self._close_all()
+
+    def _close_all(self):
+        with self._lock:
+            pending, self._pending = list(self._pending), deque()
+        for _, _, future in pending:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError("抓取进程池已关闭"))
+        for worker in list(self._workers):
+            if worker.task is not None:
+                worker.task[2].set_exception(RuntimeError("抓取进程池已关闭"))
+                worker.task = None
+                self._stop_worker(worker)
+            else:
+                self._stop_worker(worker, graceful=True)
+
+_default_pool = None
+_default_lock = threading.Lock()
+
+def get_worker_pool(cookie_sink=None):
+    """设置了 TOUTIAO_FETCH_PROCESSES（工作进程数）时返回共享的进程池，否则返回 None"""
+    global _default_pool
+    try:
+        size = int(os.environ.get('TOUTIAO_FETCH_PROCESSES') or 0)
+    except ValueError:
+        size = 0
+    if size <= 0:
+        return None
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = FetchWorkerPool(size, cookie_sink=cookie_sink)
+        return _default_pool
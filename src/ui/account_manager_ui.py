@@ -2,39 +2,98 @@ from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QPushButton, QTableWidget, QTableWidgetItem, 
     QMessageBox, QLabel, QHeaderView, QSplitter,
-    QTabWidget
+    QTabWidget, QTableView, QLineEdit, QPlainTextEdit
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QColor
+import asyncio
 import logging
 from datetime import datetime
-from modules.account_manager import AccountManager
-from services.article_service import fetch_articles
+from modules.account_manager import AccountManager, STATUS_ACTIVE, STATUS_EXPIRED
+from ui.article_table_model import ArticleTableModel, ArticleFilterProxyModel
+from ui.async_bridge import AsyncBridge
+from services.async_engine import get_engine, run_blocking
+from utils import telemetry
+from utils.logger import get_ring_buffer, RING_SIZE
 
-class ArticleFetchThread(QThread):
-    finished = pyqtSignal(list)  # 成功信号
-    error = pyqtSignal(str)      # 错误信号
+class AccountManagerUI(QMainWindow):
+    # 批量刷新时同时抓取的账号数
+    BATCH_CONCURRENCY = 4
     
-    def __init__(self, cookies):
-        super().__init__()
-        self.cookies = cookies
-        self.timeout = 120  # 设置2分钟超时
+    # 账号状态的显示文字
+    STATUS_TEXT = {STATUS_ACTIVE: '正常', STATUS_EXPIRED: '已失效'}
+    
+    # 运行统计面板的刷新间隔（毫秒）和显示的最近记录条数
+    STATS_INTERVAL = 2000
+    RECENT_SPAN_ROWS = 50
     
-    def run(self):
-        try:
-            articles = fetch_articles(self.cookies)  # 传入特定账号的 cookies
-            if articles is not None:
-                self.finished.emit(articles)
-            else:
-                self.error.emit("获取文章失败")
-        except Exception as e:
-            self.error.emit(str(e))
-
-class AccountManagerUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.logger = logging.getLogger(__name__)
-        self.account_manager = AccountManager()
+        self.account_manager = None  # 在工作线程中创建，见 load_accounts
+        self.worker_pool = None      # 设置了 TOUTIAO_FETCH_PROCESSES 时在工作进程中抓取
+        
+        # 所有网络和浏览器操作在异步引擎上运行，结果经 bridge 回到主线程
+        self.bridge = AsyncBridge(get_engine(), self)
+        self.fetch_future = None
+        self.batch_future = None
+        self.check_future = None
+        self.login_future = None
+        self.batch_progress = (0, 0)
+        self.current_username = None  # 文章表格当前显示的账号
         self.init_ui()
+        self.load_accounts()
+        
+    def load_accounts(self):
+        """在工作线程中打开数据库并读取账号列表，窗口不必等待"""
+        self.status_label.setText('正在加载账号...')
+        
+        async def load():
+            account_manager = await run_blocking(AccountManager)
+            return account_manager, await run_blocking(account_manager.get_all_accounts)
+        
+        self.bridge.run(load(), on_result=self.on_accounts_loaded, on_error=self.on_accounts_load_failed)
+        
+    def on_accounts_loaded(self, result):
+        """账号列表加载完成（主线程）"""
+        self.account_manager, accounts = result
+        from services.worker_pool import get_worker_pool
+        self.worker_pool = get_worker_pool(cookie_sink=self.account_manager.update_cookies)
+        self.refresh_account_table(accounts)
+        self.status_label.setText('就绪')
+        # 界面空闲后在后台预先导入抓取相关模块，第一次刷新不必在主线程等待导入
+        self.bridge.run(run_blocking(self._preload_modules))
+        
+    def on_accounts_load_failed(self, error_msg):
+        self.logger.error(f"加载账号失败: {error_msg}")
+        self.status_label.setText('加载账号失败')
+        QMessageBox.critical(self, "错误", f"加载账号失败: {error_msg}")
+        
+    @staticmethod
+    def _preload_modules():
+        import modules.article_metrics  # noqa: F401
+        import services.sync_service  # noqa: F401
+        import services.session_validator  # noqa: F401
+        
+    def _accounts_ready(self):
+        """账号尚未加载完成时提示并返回 False"""
+        if self.account_manager is None:
+            self.status_label.setText('正在加载账号，请稍候...')
+            return False
+        return True
+        
+    async def _session_manager(self):
+        """在工作线程中取得浏览器会话管理器，第一次调用时才导入 Selenium；使用工作进程时不需要"""
+        if self.worker_pool:
+            return None
+        return await run_blocking(lambda: self.account_manager.session_manager)
+        
+    async def _sync_articles(self, username, articles):
+        """在工作线程中写入缓存和统计数据，返回缓存中的完整文章列表；没有抓到文章时返回 None"""
+        if not articles:
+            return None
+        from services.sync_service import apply_sync
+        return await run_blocking(apply_sync, self.account_manager, username, articles)
         
     def init_ui(self):
         """初始化UI"""
@@ -68,6 +127,12 @@ class AccountManagerUI(QMainWindow):
         refresh_btn.clicked.connect(self.refresh_all)
         toolbar_layout.addWidget(refresh_btn)
         
+        # 检测登录状态按钮
+        check_btn = QPushButton('检测登录')
+        check_btn.setFixedWidth(100)
+        check_btn.clicked.connect(lambda: self.check_sessions(max_age=0))
+        toolbar_layout.addWidget(check_btn)
+        
         # 添加状态标签
         self.status_label = QLabel('就绪')
         toolbar_layout.addWidget(self.status_label)
@@ -86,9 +151,15 @@ class AccountManagerUI(QMainWindow):
         account_widget = self._create_account_widget()
         splitter.addWidget(account_widget)
         
-        # 右侧文章信息
-        article_widget = self._create_article_widget()
-        splitter.addWidget(article_widget)
+        # 右侧文章信息和运行统计
+        self.right_tabs = QTabWidget()
+        self.right_tabs.addTab(self._create_article_widget(), '文章信息')
+        self.stats_widget = self._create_stats_widget()
+        self.right_tabs.addTab(self.stats_widget, '运行统计')
+        self.log_view = self._create_log_widget()
+        self.right_tabs.addTab(self.log_view, '运行日志')
+        self.right_tabs.currentChanged.connect(lambda _: self.refresh_panels())
+        splitter.addWidget(self.right_tabs)
         
         # 设置分割器比例
         splitter.setSizes([400, 800])
@@ -98,6 +169,18 @@ class AccountManagerUI(QMainWindow):
         # 将分割器添加到主布局
         layout.addWidget(splitter)
         
+    def closeEvent(self, event):
+        """关闭窗口时取消进行中的任务并释放浏览器池"""
+        try:
+            self.bridge.engine.stop()
+            if self.worker_pool:
+                self.worker_pool.shutdown()
+            if self.account_manager:
+                self.account_manager.close()
+        except Exception as e:
+            self.logger.error(f"释放浏览器池出错: {str(e)}")
+        super().closeEvent(event)
+        
     def _create_account_widget(self):
         """创建账号列表部件"""
         widget = QWidget()
@@ -176,16 +259,34 @@ class AccountManagerUI(QMainWindow):
         title.setStyleSheet('font-size: 14px; font-weight: bold;')
         title_layout.addWidget(title)
         
+        # 当前账号的统计汇总
+        self.article_summary = QLabel('')
+        self.article_summary.setStyleSheet('color: #666;')
+        title_layout.addWidget(self.article_summary)
+        
+        # 标题过滤框
+        self.article_filter = QLineEdit()
+        self.article_filter.setPlaceholderText('按标题过滤')
+        self.article_filter.setFixedWidth(200)
+        title_layout.addStretch()
+        title_layout.addWidget(self.article_filter)
+        
         layout.addWidget(title_widget)
         
-        # 创建文章表格
-        self.article_table = QTableWidget()
-        self.article_table.setColumnCount(6)
-        self.article_table.setHorizontalHeaderLabels(['标题', '发布时间', '点赞', '展现', '阅读', '评论'])
+        # 创建文章表格：模型 + 排序过滤代理 + 视图
+        self.article_model = ArticleTableModel(AccountManager.article_key, self)
+        self.article_proxy = ArticleFilterProxyModel(self)
+        self.article_proxy.setSourceModel(self.article_model)
+        self.article_filter.textChanged.connect(self.article_proxy.setFilterFixedString)
+        
+        self.article_table = QTableView()
+        self.article_table.setModel(self.article_proxy)
+        self.article_table.setSortingEnabled(True)
+        self.article_table.verticalHeader().setVisible(False)
         
         # 设置表格样式
         self.article_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #ddd;
                 gridline-color: #f5f5f5;
             }
@@ -222,33 +323,136 @@ class AccountManagerUI(QMainWindow):
         layout.addWidget(self.article_table)
         return widget
         
-    def refresh_account_table(self):
-        """刷新账号列表"""
+    def _create_stats_widget(self):
+        """创建运行统计部件：各阶段耗时、计数器和最近的阶段记录"""
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.stats_summary = QLabel('')
+        self.stats_summary.setStyleSheet('color: #666; padding: 4px;')
+        layout.addWidget(self.stats_summary)
+        
+        # 各阶段耗时
+        self.stage_table = QTableWidget()
+        self.stage_table.setColumnCount(6)
+        self.stage_table.setHorizontalHeaderLabels(['阶段', '次数', '平均(s)', 'P95(s)', '最大(s)', '失败'])
+        self.stage_table.verticalHeader().setVisible(False)
+        self.stage_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.stage_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.stage_table)
+        
+        # 最近的阶段记录
+        self.span_table = QTableWidget()
+        self.span_table.setColumnCount(5)
+        self.span_table.setHorizontalHeaderLabels(['时间', '账号', '阶段', '用时(s)', '结果'])
+        self.span_table.verticalHeader().setVisible(False)
+        self.span_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.span_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.span_table)
+        
+        self.stats_timer = QTimer(self)
+        self.stats_timer.timeout.connect(self.refresh_panels)
+        self.stats_timer.start(self.STATS_INTERVAL)
+        return widget
+        
+    def _create_log_widget(self):
+        """创建运行日志部件，显示内存缓冲中的最近日志"""
+        view = QPlainTextEdit()
+        view.setReadOnly(True)
+        view.setMaximumBlockCount(RING_SIZE)
+        view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.log_seq = 0  # 已显示的最后一条日志序号
+        return view
+        
+    def refresh_panels(self):
+        """只刷新当前可见的统计或日志页"""
+        current = self.right_tabs.currentWidget()
+        if current is self.stats_widget:
+            self.refresh_stats_panel()
+        elif current is self.log_view:
+            self.refresh_log_panel()
+        
+    def refresh_log_panel(self):
+        """追加上次刷新之后的新日志"""
+        ring_buffer = get_ring_buffer()
+        if ring_buffer is None:
+            return
+        entries = ring_buffer.since(self.log_seq)
+        if not entries:
+            return
+        self.log_seq = entries[-1][0]
+        self.log_view.appendPlainText('\n'.join(text for _, _, text in entries))
+        
+    def refresh_stats_panel(self):
+        """刷新运行统计面板"""
+        stats = telemetry.snapshot()
+        
+        stages = sorted(stats['stages'].items(), key=lambda item: -item[1]['avg'] * item[1]['count'])
+        self.stage_table.setRowCount(len(stages))
+        for row, (stage, s) in enumerate(stages):
+            values = [stage, s['count'], f"{s['avg']:.2f}", f"{s['p95']:.2f}", f"{s['max']:.2f}", s['failures']]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                if col == 5 and s['failures']:
+                    item.setForeground(QColor('#d9534f'))
+                self.stage_table.setItem(row, col, item)
+        
+        recent = stats['recent'][-self.RECENT_SPAN_ROWS:][::-1]
+        self.span_table.setRowCount(len(recent))
+        for row, span in enumerate(recent):
+            values = [
+                datetime.fromtimestamp(span['time']).strftime('%H:%M:%S'),
+                span['account'] or '-', span['stage'], f"{span['seconds']:.2f}", span['error'] or '成功',
+            ]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col == 4 and span['error']:
+                    item.setForeground(QColor('#d9534f'))
+                self.span_table.setItem(row, col, item)
+        
+        self.stats_summary.setText(
+            f"解析文章 {telemetry.registry.total('articles_parsed_total')} 篇"
+            f"（接口 {telemetry.registry.total('articles_parsed_total', source='http')}，"
+            f"浏览器 {telemetry.registry.total('articles_parsed_total', source='selenium')}），"
+            f"抓取失败 {telemetry.registry.total('fetch_total', result='error')} 次，"
+            f"cookies 失效 {telemetry.registry.total('fetch_total', result='expired')} 次，"
+            f"备用选择器 {telemetry.registry.total('selector_fallbacks_total')} 次"
+        )
+        
+    def refresh_account_table(self, accounts=None):
+        """刷新账号列表，accounts 为空时从数据库读取"""
         try:
             self.status_label.setText('正在刷新账号列表...')
             self.account_table.setRowCount(0)
             
-            accounts = self.account_manager.get_all_accounts()
+            if accounts is None:
+                accounts = self.account_manager.get_all_accounts()
             
             for row, account in enumerate(accounts):
                 self.account_table.insertRow(row)
                 
-                # 使用字典格式访问账号信息
-                username_item = QTableWidgetItem(account['username'])
+                username_item = QTableWidgetItem(account.username)
                 username_item.setFlags(username_item.flags() & ~Qt.ItemIsEditable)
                 self.account_table.setItem(row, 0, username_item)
                 
+                # 状态，失效账号标红提示重新登录
+                status = self.STATUS_TEXT.get(account.status, account.status or '-')
+                status_item = QTableWidgetItem(str(status))
+                status_item.setFlags(status_item.flags() & ~Qt.ItemIsEditable)
+                if account.last_check:
+                    checked = datetime.fromtimestamp(account.last_check).strftime('%Y-%m-%d %H:%M')
+                    status_item.setToolTip(f'最近检测: {checked}')
+                if account.expired:
+                    status_item.setForeground(QColor('#d9534f'))
+                    username_item.setForeground(QColor('#d9534f'))
+                self.account_table.setItem(row, 1, status_item)
+                
                 # 最后登录时间
-                last_login = account.get('last_login', '-')
+                last_login = account.last_login or '-'
                 last_login_item = QTableWidgetItem(str(last_login))
                 last_login_item.setFlags(last_login_item.flags() & ~Qt.ItemIsEditable)
-                self.account_table.setItem(row, 1, last_login_item)
-                
-                # 状态
-                status = account.get('status', '-')
-                status_item = QTableWidgetItem(str(status))
-                status_item.setFlags(status_item.flags() & ~Qt.ItemIsEditable)
-                self.account_table.setItem(row, 2, status_item)
+                self.account_table.setItem(row, 2, last_login_item)
             
             self.status_label.setText('账号列表刷新完成')
             
@@ -258,37 +462,45 @@ class AccountManagerUI(QMainWindow):
             QMessageBox.critical(self, "错误", f"刷新账号列表失败: {str(e)}")
         
     def add_account(self):
-        """添加账号"""
-        try:
-            self.status_label.setText('正在打开登录窗口...')
-            
-            # 打开登录窗口
-            result = self.account_manager.session_manager.open_login_window()
-            
-            if result['success']:
-                username = result['user_info'].get('name')
-                if not username:
-                    raise Exception("未能获取用户名")
-                
-                cookies = result['cookies']
-                
-                if self.account_manager.add_account(username, cookies):
-                    QMessageBox.information(self, "成功", f"账号 {username} 添加成功！")
-                    self.refresh_account_table()
-                    self.status_label.setText('账号添加成功')
-                else:
-                    QMessageBox.warning(self, "失败", "添加账号失败，请重试")
-                    self.status_label.setText('账号添加失败')
-            else:
-                QMessageBox.warning(self, "失败", f"登录失败: {result.get('error', '未知错误')}")
-                self.status_label.setText('登录失败')
-                
-        except Exception as e:
-            self.logger.error(f"添加账号时出错: {str(e)}")
-            QMessageBox.critical(self, "错误", f"添加账号时出错: {str(e)}")
-            self.status_label.setText('出错')
-        finally:
-            self.status_label.setText('就绪')
+        """添加账号：在工作线程中打开登录窗口并等待登录（最长 LOGIN_TIMEOUT 秒），界面保持响应"""
+        if not self._accounts_ready():
+            return
+        if self.login_future and not self.login_future.done():
+            self.status_label.setText('登录窗口已打开，请在浏览器中完成登录')
+            return
+        self.status_label.setText('正在打开登录窗口...')
+        
+        async def login():
+            session_manager = await run_blocking(lambda: self.account_manager.session_manager)
+            result = await run_blocking(session_manager.open_login_window)
+            if not result['success']:
+                return result
+            username = result['user_info'].get('name')
+            if not username:
+                raise Exception("未能获取用户名")
+            saved = await run_blocking(self.account_manager.add_account, username, result['cookies'])
+            return dict(saved, username=username)
+        
+        self.login_future = self.bridge.run(login(), on_result=self.on_login_finished, on_error=self.on_login_failed)
+        
+    def on_login_finished(self, result):
+        """登录窗口关闭（主线程）：result 为登录失败信息或账号保存结果"""
+        username = result.get('username')
+        if username and result['success']:
+            QMessageBox.information(self, "成功", f"账号 {username} 添加成功！")
+            self.refresh_account_table()
+            self.status_label.setText('账号添加成功')
+        elif username:
+            QMessageBox.warning(self, "失败", "添加账号失败，请重试")
+            self.status_label.setText('账号添加失败')
+        else:
+            QMessageBox.warning(self, "失败", f"登录失败: {result.get('error', '未知错误')}")
+            self.status_label.setText('登录失败')
+        
+    def on_login_failed(self, error_msg):
+        self.logger.error(f"添加账号时出错: {error_msg}")
+        QMessageBox.critical(self, "错误", f"添加账号时出错: {error_msg}")
+        self.status_label.setText('出错')
             
     def delete_account(self, username):
         """删除账号"""
@@ -315,6 +527,8 @@ class AccountManagerUI(QMainWindow):
             
     def on_account_selected(self, index):
         """处理账号选择事件"""
+        if not self._accounts_ready():
+            return
         try:
             row = index.row()
             username = self.account_table.item(row, 0).text()
@@ -322,70 +536,77 @@ class AccountManagerUI(QMainWindow):
         except Exception as e:
             self.logger.error(f"处理账号选择事件出错: {str(e)}")
             
-    def refresh_article_table(self, username):
-        """刷新文章列表"""
+    def refresh_article_table(self, username, force=False):
+        """刷新文章列表：先显示缓存，过期时后台重新获取"""
         try:
-            self.status_label.setText(f'正在获取 {username} 的文章列表...')
-            self.article_table.setRowCount(0)
+            self.current_username = username
+            
+            # 立即显示缓存的文章
+            cached = self.account_manager.get_cached_articles(username)
+            self.update_article_table(cached)
+            
+            if not force and cached and not self.account_manager.is_articles_stale(username):
+                self.status_label.setText(f'{username} 的文章列表为最新缓存')
+                return
             
             # 获取特定账号的信息
             account = self.account_manager.get_account(username)
             if not account:
                 raise Exception(f"找不到账号 {username}")
             
-            cookies = account.get('cookies')  # 使用字典格式获取 cookies
+            # 登录已失效的账号不再抓取
+            if account.expired:
+                self.status_label.setText(f'{username} 的登录已失效，请重新登录')
+                return
+            
+            self.status_label.setText(f'正在获取 {username} 的文章列表...')
+            
+            cookies = account.cookies
             if not cookies:
                 raise Exception(f"账号 {username} 的 cookies 无效")
             
-            # 创建并启动获取线程
-            self.fetch_thread = ArticleFetchThread(cookies)
-            self.fetch_thread.finished.connect(self.update_article_table)
-            self.fetch_thread.error.connect(self.handle_fetch_error)
-            self.fetch_thread.start()
+            # 切换账号时取消上一个账号尚未完成的获取
+            if self.fetch_future and not self.fetch_future.done():
+                self.fetch_future.cancel()
+            
+            from services.sync_service import fetch_incremental_async
+            watermark = self.account_manager.get_watermark(username)
+            
+            async def fetch():
+                session_manager = await self._session_manager()
+                articles, _ = await fetch_incremental_async(
+                    cookies, watermark, session_manager, username=username, pool=self.worker_pool
+                )
+                return await self._sync_articles(username, articles)
+            
+            self.fetch_future = self.bridge.run(
+                fetch(),
+                on_result=lambda articles, username=username: self.on_articles_revalidated(username, articles),
+                on_error=self.handle_fetch_error
+            )
             
         except Exception as e:
             self.logger.error(f"刷新文章列表出错: {str(e)}")
             QMessageBox.critical(self, "错误", f"获取文章列表失败: {str(e)}")
             self.status_label.setText('获取文章列表失败')
 
+    def on_articles_revalidated(self, username, articles):
+        """后台同步完成（主线程）：articles 为写入后的缓存文章，None 表示未获取到文章"""
+        if articles is None:
+            # 抓取失败时保留原有缓存
+            if username == self.current_username:
+                self.status_label.setText('未获取到文章，显示缓存数据')
+            return
+        
+        if username == self.current_username:
+            self.apply_article_diff(articles)
+            self.status_label.setText('文章列表获取完成')
+
     def update_article_table(self, articles):
         """更新文章表格"""
         try:
-            self.article_table.setRowCount(0)
-            
-            for row, article in enumerate(articles):
-                self.article_table.insertRow(row)
-                
-                # 标题
-                title_item = QTableWidgetItem(article['title'])
-                title_item.setFlags(title_item.flags() & ~Qt.ItemIsEditable)
-                self.article_table.setItem(row, 0, title_item)
-                
-                # 发布时间
-                time_item = QTableWidgetItem(article.get('publish_time', '-'))
-                time_item.setFlags(time_item.flags() & ~Qt.ItemIsEditable)
-                self.article_table.setItem(row, 1, time_item)
-                
-                # 点赞数
-                digg_item = QTableWidgetItem(str(article.get('digg_count', 0)))
-                digg_item.setFlags(digg_item.flags() & ~Qt.ItemIsEditable)
-                self.article_table.setItem(row, 2, digg_item)
-                
-                # 展现量
-                show_item = QTableWidgetItem(str(article.get('show_count', 0)))
-                show_item.setFlags(show_item.flags() & ~Qt.ItemIsEditable)
-                self.article_table.setItem(row, 3, show_item)
-                
-                # 阅读量
-                read_item = QTableWidgetItem(str(article.get('read_count', 0)))
-                read_item.setFlags(read_item.flags() & ~Qt.ItemIsEditable)
-                self.article_table.setItem(row, 4, read_item)
-                
-                # 评论数
-                comment_item = QTableWidgetItem(str(article.get('comment_count', 0)))
-                comment_item.setFlags(comment_item.flags() & ~Qt.ItemIsEditable)
-                self.article_table.setItem(row, 5, comment_item)
-            
+            self.article_model.set_articles(articles)
+            self.update_article_summary(articles)
             self.status_label.setText('文章列表获取完成')
             
         except Exception as e:
@@ -393,6 +614,24 @@ class AccountManagerUI(QMainWindow):
             QMessageBox.critical(self, "错误", f"更新文章列表失败: {str(e)}")
             self.status_label.setText('更新文章列表失败')
 
+    def apply_article_diff(self, articles):
+        """按文章主键把新结果合并进当前表格，不重建整个表格"""
+        self.article_model.apply_articles(articles)
+        self.update_article_summary(articles)
+
+    def update_article_summary(self, articles):
+        """在文章表格上方显示当前账号的合计与阅读率"""
+        if not articles:
+            self.article_summary.setText('')
+            return
+        from modules.article_metrics import ArticleBatch
+        stats = ArticleBatch.from_articles({'': articles}).aggregate()['']
+        totals = stats['totals']
+        self.article_summary.setText(
+            f"共 {stats['articles']} 篇  阅读 {totals['read_count']}  展现 {totals['show_count']}  "
+            f"阅读率 {stats['read_show_ratio']:.1%}"
+        )
+
     def handle_fetch_error(self, error_msg):
         """处理获取错误"""
         self.logger.error(f"获取文章列表失败: {error_msg}")
@@ -400,11 +639,129 @@ class AccountManagerUI(QMainWindow):
         self.status_label.setText('获取文章列表失败')
 
     def refresh_all(self):
-        """刷新所有数据"""
+        """刷新所有数据：先检测登录状态，再刷新有效账号的文章"""
+        if not self._accounts_ready():
+            return
         self.refresh_account_table()
-        
-        # 如果有选中的账号，也刷新文章列表
-        selected_items = self.account_table.selectedItems()
-        if selected_items:
-            username = self.account_table.item(selected_items[0].row(), 0).text()
-            self.refresh_article_table(username)
\ No newline at end of file
+        self.check_sessions(then_refresh=True)
+        
+    def check_sessions(self, max_age=None, then_refresh=False):
+        """后台检测账号登录状态，完成后更新账号列表"""
+        if not self._accounts_ready():
+            return
+        if self.check_future and not self.check_future.done():
+            self.status_label.setText('正在检测登录状态...')
+            return
+        
+        from services.session_validator import validate_sessions_async
+        self.status_label.setText('正在检测登录状态...')
+        kwargs = {} if max_age is None else {'max_age': max_age}
+        self.check_future = self.bridge.run(
+            validate_sessions_async(self.account_manager, **kwargs),
+            on_result=lambda results, then_refresh=then_refresh: self.on_sessions_checked(results, then_refresh),
+            on_error=lambda error, then_refresh=then_refresh: self.on_sessions_check_failed(error, then_refresh)
+        )
+        
+    def on_sessions_checked(self, results, then_refresh=False):
+        """登录状态检测完成"""
+        expired = sum(1 for status in results.values() if status == STATUS_EXPIRED)
+        self.refresh_account_table()
+        self.status_label.setText(f'登录状态检测完成，失效 {expired} 个' if results else '登录状态无需检测')
+        if then_refresh:
+            self.refresh_all_articles()
+        
+    def on_sessions_check_failed(self, error_msg, then_refresh=False):
+        """登录状态检测出错时照常刷新文章"""
+        self.logger.error(f"检测登录状态失败: {error_msg}")
+        if then_refresh:
+            self.refresh_all_articles()
+        
+    def refresh_all_articles(self):
+        """并发刷新所有账号的文章列表，每个账号完成即更新界面"""
+        if self.batch_future and not self.batch_future.done():
+            self.status_label.setText('批量刷新进行中...')
+            return
+        
+        from services.article_service import fetch_articles_many
+        from services.sync_service import sync_cutoff, MAX_PAGES
+        
+        accounts = [
+            (account.username, account.cookies)
+            for account in self.account_manager.get_all_accounts()
+            if not account.expired and account.cookies
+        ]
+        if not accounts:
+            return
+        
+        stop_before = {
+            username: sync_cutoff(self.account_manager.get_watermark(username)) or None
+            for username, _ in accounts
+        }
+        
+        self.status_label.setText(f'正在刷新 {len(accounts)} 个账号...')
+        self.batch_progress = (0, len(accounts))
+        syncs = []
+        
+        async def sync_one(username, articles, error):
+            # 在引擎中写入缓存，主线程只收到写好的文章列表
+            if not error:
+                try:
+                    articles = await self._sync_articles(username, articles)
+                except Exception as e:
+                    error = f"保存文章失败: {e}"
+            self.bridge.post(self.on_batch_result, username, articles, error)
+        
+        async def fetch():
+            results = await fetch_articles_many(
+                accounts,
+                await self._session_manager(),
+                limit=self.BATCH_CONCURRENCY,
+                stop_before=stop_before,
+                max_pages=MAX_PAGES,
+                on_result=lambda *result: syncs.append(asyncio.ensure_future(sync_one(*result))),
+                pool=self.worker_pool
+            )
+            await asyncio.gather(*syncs)
+            return results
+        
+        self.batch_future = self.bridge.run(
+            fetch(),
+            on_error=lambda error: self.logger.error(f"批量刷新出错: {error}")
+        )
+        
+    def on_batch_result(self, username, articles, error):
+        """批量刷新中单个账号完成（主线程）"""
+        if error:
+            self.on_batch_account_failed(username, error)
+        else:
+            self.on_batch_account_finished(username, articles)
+        done, total = self.batch_progress
+        self.batch_progress = (done + 1, total)
+        self.on_batch_progress(done + 1, total)
+        
+    def on_batch_account_finished(self, username, articles):
+        """单个账号刷新完成"""
+        self.on_articles_revalidated(username, articles)
+        
+    def on_batch_account_failed(self, username, error_msg):
+        """单个账号刷新失败"""
+        self.logger.error(f"账号 {username} 刷新失败: {error_msg}")
+        
+    def on_batch_progress(self, done, total):
+        """批量刷新进度"""
+        if done < total:
+            self.status_label.setText(f'正在刷新账号 {done}/{total}...')
+        else:
+            self.status_label.setText(f'全部账号刷新完成 ({total})')
+            self.log_account_summary()
+
+    def log_account_summary(self):
+        """批量刷新完成后记录各账号的统计汇总"""
+        try:
+            for username, stats in self.account_manager.get_article_batch().aggregate().items():
+                self.logger.info(
+                    f"账号 {username}: {stats['articles']} 篇，阅读 {stats['totals']['read_count']}，"
+                    f"展现 {stats['totals']['show_count']}，阅读率 {stats['read_show_ratio']:.1%}"
+                )
+        except Exception as e:
+            self.logger.error(f"统计账号汇总失败: {str(e)}")
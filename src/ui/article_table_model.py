@@ -0,0 +1,200 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from modules.dom_extractor import parse_count
+
+# 排序使用的数据角色：数值列返回数字，其余列返回文本
+SORT_ROLE = Qt.UserRole
+
+class ArticleTableModel(QAbstractTableModel):
+    """文章表格模型
+
+    文章以元组形式紧凑存放，视图通过 fetchMore 按批懒加载；
+    增量更新只发出 dataChanged / rowsInserted / rowsRemoved，不重建表格。
+    代理模型排序或过滤时关闭分页（set_paging），让代理看到全部行。
+    """
+
+    HEADERS = ['标题', '发布时间', '点赞', '展现', '阅读', '评论']
+    FIELDS = ['title', 'publish_time', 'digg_count', 'show_count', 'read_count', 'comment_count']
+    NUMERIC_COLUMNS = {2, 3, 4, 5}
+
+    # 每次 fetchMore 加载的行数
+    BATCH_SIZE = 200
+
+    def __init__(self, key_func, parent=None):
+        super().__init__(parent)
+        self.key_func = key_func  # 文章 -> 主键
+        self._keys = []
+        self._rows = []
+        self._loaded = 0
+        self._fetching = False
+        self.paging = True
+
+    # ---- Qt 接口 ----
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.FIELDS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._fetching and self._loaded < len(self._rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        count = min(self.BATCH_SIZE, len(self._rows) - self._loaded)
+        # 视图可能在插入信号中再次调用 fetchMore，避免重入
+        self._fetching = True
+        try:
+            self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+            self._loaded += count
+            self.endInsertRows()
+        finally:
+            self._fetching = False
+
+    def fetch_all(self):
+        """把尚未加载的行一次性交给视图"""
+        if self._loaded < len(self._rows):
+            self.beginInsertRows(QModelIndex(), self._loaded, len(self._rows) - 1)
+            self._loaded = len(self._rows)
+            self.endInsertRows()
+
+    def set_paging(self, enabled):
+        """开关 fetchMore 分页；关闭时立即加载全部行"""
+        self.paging = enabled
+        if not enabled:
+            self.fetch_all()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self._loaded:
+            return None
+        value = self._rows[index.row()][index.column()]
+        if role == Qt.DisplayRole:
+            return value
+        if role == SORT_ROLE:
+            if index.column() in self.NUMERIC_COLUMNS:
+                return parse_count(value)
+            return value
+        if role == Qt.TextAlignmentRole and index.column() in self.NUMERIC_COLUMNS:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
+    # ---- 数据更新 ----
+
+    def _to_row(self, article):
+        return (
+            article.get('title', ''),
+            article.get('publish_time') or '-',
+            str(article.get('digg_count') or 0),
+            str(article.get('show_count') or 0),
+            str(article.get('read_count') or 0),
+            str(article.get('comment_count') or 0),
+        )
+
+    def set_articles(self, articles):
+        """整体替换文章（切换账号时使用）"""
+        self.beginResetModel()
+        self._keys = [self.key_func(a) for a in articles]
+        self._rows = [self._to_row(a) for a in articles]
+        self._loaded = 0 if self.paging else len(self._rows)
+        self.endResetModel()
+        self.fetchMore()
+
+    def _insert(self, position, key, row):
+        # 已全部加载时追加到末尾也要通知视图
+        if position < self._loaded or self._loaded == len(self._keys):
+            self.beginInsertRows(QModelIndex(), position, position)
+            self._keys.insert(position, key)
+            self._rows.insert(position, row)
+            self._loaded += 1
+            self.endInsertRows()
+        else:
+            # 尚未加载到视图的部分直接写入
+            self._keys.insert(position, key)
+            self._rows.insert(position, row)
+
+    def _remove(self, position):
+        if position < self._loaded:
+            self.beginRemoveRows(QModelIndex(), position, position)
+            del self._keys[position]
+            del self._rows[position]
+            self._loaded -= 1
+            self.endRemoveRows()
+        else:
+            del self._keys[position]
+            del self._rows[position]
+
+    def _update(self, position, row):
+        old = self._rows[position]
+        if old == row:
+            return
+        self._rows[position] = row
+        if position < self._loaded:
+            changed = [c for c in range(len(row)) if old[c] != row[c]]
+            self.dataChanged.emit(
+                self.index(position, min(changed)),
+                self.index(position, max(changed)),
+                [Qt.DisplayRole, SORT_ROLE]
+            )
+
+    def apply_articles(self, articles):
+        """按主键把新结果合并进模型，只发出细粒度的变更信号"""
+        new_keys = [self.key_func(a) for a in articles]
+        new_key_set = set(new_keys)
+
+        # 删除已不存在的行
+        for position in reversed(range(len(self._keys))):
+            if self._keys[position] not in new_key_set:
+                self._remove(position)
+
+        # 保留下来的行顺序变化时整体替换
+        current = set(self._keys)
+        if [key for key in new_keys if key in current] != self._keys:
+            self.set_articles(articles)
+            return
+
+        # 更新已有行、插入新行
+        for position, (key, article) in enumerate(zip(new_keys, articles)):
+            row = self._to_row(article)
+            if position < len(self._keys) and self._keys[position] == key:
+                self._update(position, row)
+            else:
+                self._insert(position, key, row)
+
+class ArticleFilterProxyModel(QSortFilterProxyModel):
+    """按标题过滤、按数值排序的代理模型
+
+    代理只能排序和过滤源模型已加载的行，因此排序或过滤生效期间关闭源模型的分页，
+    未排序且未过滤时才按批懒加载。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(SORT_ROLE)
+        self.setFilterKeyColumn(0)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self._filter_text = ''
+
+    def _update_paging(self, sort_column, filter_text):
+        source = self.sourceModel()
+        if isinstance(source, ArticleTableModel):
+            source.set_paging(sort_column < 0 and not filter_text)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._update_paging(column, self._filter_text)
+        super().sort(column, order)
+
+    def setFilterFixedString(self, text):
+        self._filter_text = text
+        self._update_paging(self.sortColumn(), text)
+        super().setFilterFixedString(text)
@@ -0,0 +1,47 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+import asyncio
+import concurrent.futures
+
+class AsyncBridge(QObject):
+    """把异步引擎中协程的结果投递回 Qt 主线程
+
+    引擎线程里只发出信号，回调总是在主线程执行，可以直接操作界面。
+    """
+
+    _deliver = pyqtSignal(object, object)  # 回调, 参数元组
+
+    def __init__(self, engine, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self._deliver.connect(self._on_deliver)
+
+    def _on_deliver(self, func, args):
+        func(*args)
+
+    def post(self, func, *args):
+        """在主线程调用 func(*args)，可在任意线程调用"""
+        self._deliver.emit(func, args)
+
+    def run(self, coro, on_result=None, on_error=None, timeout=None):
+        """提交协程，完成后在主线程回调 on_result(结果) 或 on_error(错误信息)
+
+        返回 Future，调用 cancel() 即取消协程，被取消的任务不再回调。
+        """
+        future = self.engine.submit(coro, timeout)
+
+        def done(f):
+            if f.cancelled():
+                return
+            error = f.exception()
+            if error is None:
+                if on_result:
+                    self.post(on_result, f.result())
+            elif on_error:
+                if isinstance(error, (asyncio.TimeoutError, concurrent.futures.TimeoutError)):
+                    message = f"操作超时（{timeout} 秒）" if timeout else "操作超时"
+                else:
+                    message = str(error) or type(error).__name__
+                self.post(on_error, message)
+
+        future.add_done_callback(done)
+        return future
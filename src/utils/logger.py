@@ -1,42 +1,235 @@
+"""日志设置
+
+调用方线程只把日志记录放进队列，格式化和写文件都在后台监听线程中完成，
+界面线程和抓取线程不会因为写日志而阻塞。文件按大小轮转，每行一个 JSON 对象；
+内存中保留最近的日志供界面显示。每个 logger 有独立的限流，WARNING 以下的日志
+超出速率时丢弃，丢弃条数记录在下一条通过的日志中。
+"""
 import os
 import sys
+import json
+import time
+import atexit
 import logging
+import logging.handlers
+import queue
+import threading
+from collections import deque
 from datetime import datetime
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LOG_DIR = os.path.join(BASE_DIR, 'logs')
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# 单个日志文件的大小上限和保留的备份数
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 5
+
+# 每个 logger 每秒允许的日志条数和突发上限（只限制 WARNING 以下）
+RATE = 20
+BURST = 100
+
+# 内存中保留的日志条数
+RING_SIZE = 2000
+
+class JsonFormatter(logging.Formatter):
+    """每条日志输出为一行 JSON"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        dropped = getattr(record, 'dropped', 0)
+        if dropped:
+            entry['dropped'] = dropped
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+class RateLimitFilter(logging.Filter):
+    """按 logger 限流和抽样，WARNING 及以上总是放行
+
+    sample 为 {logger 名称: 保留比例}，例如 {'services.article_service': 0.1}
+    表示该 logger 的 DEBUG/INFO 日志只保留十分之一（子 logger 同样适用）。
+    """
+
+    def __init__(self, rate=RATE, burst=BURST, sample=None):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.sample = dict(sample or {})
+        self._buckets = {}   # logger 名称 -> [令牌数, 上次补充时间, 丢弃条数, 抽样计数]
+        self._lock = threading.Lock()
+
+    def _sample_every(self, name):
+        while name:
+            if name in self.sample:
+                ratio = self.sample[name]
+                return max(1, round(1 / ratio)) if ratio > 0 else 0
+            name = name.rpartition('.')[0]
+        return 1
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(record.name)
+            if bucket is None:
+                bucket = self._buckets[record.name] = [self.burst, now, 0, 0]
+
+            every = self._sample_every(record.name)
+            bucket[3] += 1
+            if every == 0 or bucket[3] % every:
+                return False
+
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            if bucket[2]:
+                record.dropped = bucket[2]
+                bucket[2] = 0
+        return True
+
+class RingBufferHandler(logging.Handler):
+    """在内存中保留最近的日志，供界面按序号增量读取"""
+
+    def __init__(self, capacity=RING_SIZE):
+        super().__init__()
+        self.entries = deque(maxlen=capacity)  # (序号, 级别, 文本)
+        self._seq = 0
+        self._entries_lock = threading.Lock()
+
+    def emit(self, record):
+        try:
+            text = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._entries_lock:
+            self._seq += 1
+            self.entries.append((self._seq, record.levelno, text))
+
+    def since(self, seq=0):
+        """序号大于 seq 的日志"""
+        with self._entries_lock:
+            return [entry for entry in self.entries if entry[0] > seq]
+
+class DroppedSuffixFormatter(logging.Formatter):
+    """文本格式：有被限流丢弃的日志时在末尾注明条数"""
+
+    def format(self, record):
+        text = super().format(record)
+        dropped = getattr(record, 'dropped', 0)
+        return f"{text}（此前丢弃 {dropped} 条）" if dropped else text
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """只在调用方线程合并消息参数，异常堆栈留给后台的格式化器"""
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+_listeners = []
+_root_listener = None
+_ring_buffer = None
+
+def _start_pipeline(handlers, rate=RATE, burst=BURST, sample=None):
+    """启动后台监听线程，返回 (投递到队列的 QueueHandler, 监听器)"""
+    log_queue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(rate, burst, sample))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    return queue_handler, listener
+
+def _stop_listener(listener):
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+def _file_handler(log_file, max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT):
+    """按大小轮转的 JSON 行日志文件"""
+    if not os.path.isabs(log_file):
+        log_file = os.path.join(LOG_DIR, log_file)
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+    )
+    handler.setFormatter(JsonFormatter())
+    return handler
+
+def _console_handler():
+    handler = logging.StreamHandler()
+    handler.setFormatter(DroppedSuffixFormatter(TEXT_FORMAT))
+    return handler
+
+def setup_logging(log_file='app.jsonl', level=logging.INFO, console=True,
+                  max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT,
+                  rate=RATE, burst=BURST, sample=None):
+    """配置根 logger：队列 + 后台线程写控制台、轮转 JSON 文件和内存缓冲
+
+    log_file 为相对路径时放在 logs 目录下。重复调用会替换之前的配置。
+    """
+    global _ring_buffer, _root_listener
+    if _root_listener in _listeners:
+        _listeners.remove(_root_listener)
+        _stop_listener(_root_listener)
+
+    _ring_buffer = RingBufferHandler()
+    _ring_buffer.setFormatter(DroppedSuffixFormatter(TEXT_FORMAT))
+    handlers = [_file_handler(log_file, max_bytes, backup_count), _ring_buffer]
+    if console:
+        handlers.append(_console_handler())
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    queue_handler, _root_listener = _start_pipeline(handlers, rate, burst, sample)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    return root
+
+def get_ring_buffer():
+    """setup_logging 创建的内存缓冲，未配置时为 None"""
+    return _ring_buffer
+
+def shutdown():
+    """停止所有监听线程，写完队列中剩余的日志"""
+    while _listeners:
+        _stop_listener(_listeners.pop())
+
+atexit.register(shutdown)
+
 def setup_logger(name, log_file=None):
     """通用日志设置函数"""
     logger = logging.getLogger(name)
     if not logger.handlers:  # 避免重复添加处理程序
-        # 获取日志目录路径
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        log_dir = os.path.join(base_dir, 'logs')
-        os.makedirs(log_dir, exist_ok=True)
-        
         # 如果没有指定日志文件，使用模块名
         if log_file is None:
             log_file = f"{name.split('.')[-1]}.log"
-        
-        # 创建文件处理程序
-        file_handler = logging.FileHandler(
-            os.path.join(log_dir, log_file),
-            encoding='utf-8'
-        )
-        file_handler.setLevel(logging.INFO)
-        
-        # 创建控制台处理程序
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        
-        # 设置格式
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        # 添加处理程序
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+
+        handlers = [_file_handler(log_file), _console_handler()]
+        for handler in handlers:
+            handler.setLevel(logging.INFO)
+        logger.addHandler(_start_pipeline(handlers)[0])
         logger.setLevel(logging.INFO)
-    
-    return logger 
\ No newline at end of file
+
+    return logger
@@ -0,0 +1,281 @@
+"""抓取链路的耗时统计
+
+span(stage, account=...) 记录一个阶段的耗时，写入按阶段划分的直方图；
+阶段抛出异常时按异常类型计入失败次数。嵌套的 span 继承外层的账号。
+incr / observe 记录其他计数器和直方图（解析文章数、备用选择器命中等）。
+
+统计结果可导出为 Prometheus 文本格式：写入文件（node_exporter textfile）
+或在本地端口提供 /metrics，界面中的运行统计面板读取 snapshot()。
+"""
+from contextlib import contextmanager
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import bisect
+import logging
+import math
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 阶段耗时直方图的分桶上界（秒）
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# 保留最近的 span 条数，用于界面展示
+RECENT_SPANS = 200
+
+PREFIX = 'toutiao_'
+
+HELP = {
+    'stage_seconds': '各阶段耗时（秒）',
+    'stage_failures_total': '各阶段失败次数，按原因划分',
+    'articles_parsed_total': '解析得到的文章数',
+    'selector_fallbacks_total': '命中备用选择器的次数',
+    'fetch_total': '文章抓取次数，按方式和结果划分',
+    'login_total': '登录窗口结果',
+    'worker_restarts_total': '抓取工作进程重启次数，按原因划分',
+}
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count', 'max')
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 最后一个为 +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """按分桶估算分位数（取所在桶的上界）"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+class Registry:
+    """进程内的计数器和直方图，线程安全"""
+
+    def __init__(self):
+        self.counters = {}    # (名称, 标签元组) -> 值
+        self.histograms = {}  # (名称, 标签元组) -> Histogram
+        self.recent = deque(maxlen=RECENT_SPANS)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+    def incr(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def current_account(self):
+        """当前线程最内层 span 的账号"""
+        stack = getattr(self._local, 'accounts', None)
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def span(self, stage, account=None):
+        """记录一个阶段的耗时；账号只记录在 span 中，不作为 Prometheus 标签"""
+        stack = getattr(self._local, 'accounts', None)
+        if stack is None:
+            stack = self._local.accounts = []
+        account = account or (stack[-1] if stack else None)
+        stack.append(account)
+        error = None
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            stack.pop()
+            self.observe('stage_seconds', elapsed, stage=stage)
+            if error:
+                self.incr('stage_failures_total', stage=stage, cause=error)
+            with self._lock:
+                self.recent.append({
+                    'time': time.time(), 'stage': stage, 'account': account,
+                    'seconds': elapsed, 'error': error,
+                })
+            logger.debug(f"[{account or '-'}] {stage} 用时 {elapsed:.3f}s" + (f"，失败: {error}" if error else ''))
+
+    def snapshot(self):
+        """当前统计的副本：{'stages': {阶段: {...}}, 'counters': {...}, 'recent': [...]}"""
+        with self._lock:
+            stages = {}
+            for (name, labels), h in self.histograms.items():
+                if name != 'stage_seconds':
+                    continue
+                stage = dict(labels)['stage']
+                stages[stage] = {
+                    'count': h.count,
+                    'avg': h.sum / h.count if h.count else 0.0,
+                    'p95': h.quantile(0.95),
+                    'max': h.max,
+                    'failures': 0,
+                }
+            counters = {}
+            for (name, labels), value in self.counters.items():
+                if name == 'stage_failures_total':
+                    stage = dict(labels)['stage']
+                    stages.setdefault(stage, {'count': 0, 'avg': 0.0, 'p95': 0.0, 'max': 0.0, 'failures': 0})
+                    stages[stage]['failures'] += value
+                counters[(name, labels)] = value
+            return {'stages': stages, 'counters': counters, 'recent': list(self.recent)}
+
+    def total(self, name, **labels):
+        """名称相同、标签包含 labels 的计数器之和"""
+        wanted = {(k, str(v)) for k, v in labels.items()}
+        with self._lock:
+            return sum(
+                value for (n, key), value in self.counters.items()
+                if n == name and wanted <= set(key)
+            )
+
+    def render_prometheus(self):
+        """Prometheus 文本格式"""
+        def fmt(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ''
+            escaped = (
+                '%s="%s"' % (k, v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+                for k, v in pairs
+            )
+            return '{' + ','.join(escaped) + '}'
+
+        def bound(value):
+            return '+Inf' if math.isinf(value) else repr(float(value))
+
+        lines = []
+        with self._lock:
+            for name in sorted({n for n, _ in self.counters}):
+                metric = PREFIX + name
+                lines.append(f'# HELP {metric} {HELP.get(name, name)}')
+                lines.append(f'# TYPE {metric} counter')
+                for (n, labels), value in sorted(self.counters.items()):
+                    if n == name:
+                        lines.append(f'{metric}{fmt(labels)} {value}')
+            for name in sorted({n for n, _ in self.histograms}):
+                metric = PREFIX + name
+                lines.append(f'# HELP {metric} {HELP.get(name, name)}')
+                lines.append(f'# TYPE {metric} histogram')
+                for (n, labels), h in sorted(self.histograms.items()):
+                    if n != name:
+                        continue
+                    cumulative = 0
+                    for upper, count in zip(h.buckets + (math.inf,), h.counts):
+                        cumulative += count
+                        lines.append(f'{metric}_bucket{fmt(labels, [("le", bound(upper))])} {cumulative}')
+                    lines.append(f'{metric}_sum{fmt(labels)} {h.sum}')
+                    lines.append(f'{metric}_count{fmt(labels)} {h.count}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.recent.clear()
+
+registry = Registry()
+span = registry.span
+incr = registry.incr
+observe = registry.observe
+snapshot = registry.snapshot
+
+def write_prometheus(path):
+    """把当前统计写入文件，先写临时文件再替换，读取方不会看到半个文件"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(registry.render_prometheus())
+    os.replace(tmp_path, path)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = registry.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class Exporter:
+    """后台导出统计：定期写文件，和/或在 127.0.0.1:port/metrics 提供抓取"""
+
+    def __init__(self, path=None, port=None, interval=15):
+        self.path = path
+        self.interval = interval
+        self.server = None
+        self._stop = threading.Event()
+        if port:
+            self.server = ThreadingHTTPServer(('127.0.0.1', int(port)), _MetricsHandler)
+            threading.Thread(target=self.server.serve_forever, name='metrics-http', daemon=True).start()
+            logger.info(f"统计接口: http://127.0.0.1:{self.server.server_address[1]}/metrics")
+        if path:
+            threading.Thread(target=self._write_loop, name='metrics-file', daemon=True).start()
+            logger.info(f"统计文件: {path}")
+
+    def _write_loop(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def write(self):
+        if not self.path:
+            return
+        try:
+            write_prometheus(self.path)
+        except OSError as e:
+            logger.warning(f"写入统计文件失败: {e}")
+
+    def stop(self):
+        self._stop.set()
+        self.write()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+def start_exporter(path=None, port=None, interval=15):
+    """启动导出；未指定时读取 TOUTIAO_METRICS_FILE / TOUTIAO_METRICS_PORT，都没有则返回 None"""
+    path = path or os.environ.get('TOUTIAO_METRICS_FILE') or None
+    port = port or os.environ.get('TOUTIAO_METRICS_PORT') or None
+    if not path and not port:
+        return None
+    try:
+        return Exporter(path, port, interval)
+    except OSError as e:
+        logger.warning(f"启动统计导出失败: {e}")
+        return None
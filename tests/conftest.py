@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 源码按 src 目录下的顶层包导入（modules、services、utils）；桩服务器在 benchmarks 目录
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+@pytest.fixture
+def stub():
+    """本地创作者中心桩服务器，返回 (server, base_url)"""
+    from stub_server import start_stub_server
+    server, base_url = start_stub_server()
+    yield server, base_url
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from modules.account_manager import AccountManager
+from modules.profile_store import ProfileStore
+
+COOKIES = [{'name': 'sessionid', 'value': 'test', 'domain': '.toutiao.com', 'path': '/'}]
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    # AccountManager 的数据库和浏览器目录都在当前目录的 data 下
+    monkeypatch.chdir(tmp_path)
+    manager = AccountManager()
+    yield manager
+    manager.close()
+
+def test_remove_account_deletes_profile_without_browser(manager):
+    manager.add_account('alice', COOKIES)
+    profile = ProfileStore().path('alice')
+    os.makedirs(profile)
+
+    assert manager.remove_account('alice')
+
+    assert not os.path.exists(profile)
+    assert manager.get_account('alice') is None
+    # 没有创建 SessionManager（不导入 Selenium）
+    assert manager._session_manager is None
+
+def test_remove_account_without_profiles(manager):
+    manager.add_account('alice', COOKIES)
+
+    assert manager.remove_account('alice')
+    assert not os.path.exists(ProfileStore.ROOT)
+
+def test_relogin_discards_profile(manager):
+    manager.add_account('alice', COOKIES)
+    profile = ProfileStore().path('alice')
+    os.makedirs(profile)
+
+    # 重新登录写入新 cookies 后，下次抓取不再沿用目录中的旧登录状态
+    manager.add_account('alice', [dict(COOKIES[0], value='new')])
+
+    assert not os.path.exists(profile)
+    assert manager.get_account('alice').cookies[0]['value'] == 'new'
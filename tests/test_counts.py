@@ -0,0 +1,44 @@
+import pytest
+
+from modules.article_metrics import parse_counts
+from modules.dom_extractor import parse_count
+
+# (计数文本, 期望的整数)，标量和批量两种实现共用
+CASES = [
+    ('0', 0),
+    ('345', 345),
+    ('3,456', 3456),
+    (' 12 ', 12),
+    ('1.2万', 12000),
+    ('1.23456万', 12346),
+    ('10万', 100000),
+    ('1.1亿', 110000000),
+    ('.5万', 5000),
+    ('2.', 2),
+    ('-', 0),
+    ('', 0),
+    (None, 0),
+    (12, 12),
+    ('1万万', 0),
+    ('1亿万', 0),
+    ('1.5亿万', 0),
+    ('²', 0),
+    ('٣', 3),
+    ('万', 0),
+    ('1.2.3', 0),
+    ('-5', 0),
+    ('1e3', 0),
+    ('abc', 0),
+]
+
+@pytest.mark.parametrize('text,expected', CASES)
+def test_parse_count(text, expected):
+    assert parse_count(text) == expected
+
+def test_parse_counts_matches_parse_count():
+    texts = [text for text, _ in CASES]
+    assert parse_counts(texts).tolist() == [expected for _, expected in CASES]
+    assert parse_counts(texts).tolist() == [parse_count(text) for text in texts]
+
+def test_parse_counts_empty():
+    assert parse_counts([]).tolist() == []
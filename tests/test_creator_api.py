@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from modules.creator_api import CreatorApi, CreatorApiError, SessionExpiredError
+from services.article_service import fetch_articles
+from stub_server import ARTICLE_LIST_PATH, generate_article_list, set_payload
+
+COOKIES = [{'name': 'sessionid', 'value': 'test', 'domain': '.toutiao.com', 'path': '/'}]
+
+def test_fetch_articles_paginates(stub):
+    server, base_url = stub
+    set_payload(server, ARTICLE_LIST_PATH, generate_article_list(45))
+
+    articles = CreatorApi(base_url).fetch_articles(COOKIES, size=20, max_pages=5)
+
+    assert len(articles) == 45
+    assert server.stats[ARTICLE_LIST_PATH] == 3
+    first = articles[0]
+    assert first['article_id'] == '7300000000000000000'
+    assert first['create_time'] == 1700000000
+    assert set(first) >= {'title', 'publish_time', 'show_count', 'read_count', 'digg_count', 'comment_count'}
+
+def test_fetch_articles_stops_at_cutoff(stub):
+    server, base_url = stub
+    # 每篇间隔 1 小时，第 2 页（第 20-39 篇）中出现早于 cutoff 的文章后停止
+    set_payload(server, ARTICLE_LIST_PATH, generate_article_list(100))
+    cutoff = 1700000000 - 25 * 3600
+
+    articles = CreatorApi(base_url).fetch_articles(COOKIES, size=20, max_pages=5, stop_before=cutoff)
+
+    assert len(articles) == 40
+    assert server.stats[ARTICLE_LIST_PATH] == 2
+
+def test_redirect_raises_session_expired(stub):
+    _, base_url = stub
+    api = CreatorApi(base_url)
+
+    with pytest.raises(SessionExpiredError):
+        api.list_articles([])
+    assert api.check_session([]) is False
+    assert api.check_session(COOKIES) is True
+
+def test_error_code_raises(stub):
+    server, base_url = stub
+    set_payload(server, ARTICLE_LIST_PATH, {'code': 1001, 'message': '参数错误', 'data': {}})
+
+    with pytest.raises(CreatorApiError, match='1001'):
+        CreatorApi(base_url).list_articles(COOKIES)
+
+def test_cookies_do_not_leak_between_accounts(stub):
+    _, base_url = stub
+    api = CreatorApi(base_url)
+
+    api.list_articles(COOKIES)
+    # 同一线程复用的会话不保存上一个账号的 cookies
+    with pytest.raises(SessionExpiredError):
+        api.list_articles([])
+
+def test_fetch_articles_stops_on_unknown_create_time(stub):
+    server, base_url = stub
+    payload = generate_article_list(60)
+    # 与浏览器路径一致：发布时间无法识别的文章同样视为到达 cutoff
+    payload['data']['list'][5]['create_time'] = 0
+    set_payload(server, ARTICLE_LIST_PATH, payload)
+
+    articles = CreatorApi(base_url).fetch_articles(COOKIES, size=20, max_pages=3, stop_before=1)
+
+    assert len(articles) == 20
+    assert server.stats[ARTICLE_LIST_PATH] == 1
+
+def test_fetch_articles_stops_at_deadline(stub):
+    server, base_url = stub
+    set_payload(server, ARTICLE_LIST_PATH, generate_article_list(60))
+
+    with pytest.raises(TimeoutError):
+        CreatorApi(base_url).fetch_articles(COOKIES, size=20, max_pages=3, deadline=time.monotonic() - 1)
+    assert ARTICLE_LIST_PATH not in server.stats
+
+def test_expired_deadline_skips_browser_fallback(stub):
+    _, base_url = stub
+    api = CreatorApi(base_url)
+
+    # 已超过截止时间时接口失败不再回退到浏览器（未传入 session_manager，回退会创建浏览器）
+    with pytest.raises(TimeoutError):
+        fetch_articles(COOKIES, api=api, deadline=time.monotonic() - 1, raise_errors=True)
+    assert fetch_articles(COOKIES, api=api, deadline=time.monotonic() - 1) == []
@@ -0,0 +1,53 @@
+import pytest
+
+from modules.driver_pool import DriverPool
+
+class FakeDriver:
+    session_id = 'fake'
+
+    def __init__(self):
+        self.quit_called = False
+
+    def execute_script(self, script):
+        return 1
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {}
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+def make_pool(driver):
+    # 预先放入一个空闲实例，不启动 Chrome
+    pool = DriverPool(lambda: None, size=1)
+    pool._idle.put(driver)
+    return pool
+
+def test_driver_is_reused_after_normal_use():
+    driver = FakeDriver()
+    pool = make_pool(driver)
+
+    with pool.driver() as borrowed:
+        assert borrowed is driver
+
+    assert not driver.quit_called
+    assert pool._idle.get_nowait() is driver
+
+def test_driver_is_discarded_after_timeout():
+    driver = FakeDriver()
+    pool = make_pool(driver)
+
+    with pytest.raises(TimeoutError):
+        with pool.driver():
+            raise TimeoutError("超过抓取时限")
+
+    assert driver.quit_called
+    assert pool._idle.empty()
+    # 名额已归还
+    assert pool._slots.acquire(timeout=0)
@@ -0,0 +1,43 @@
+import copy
+import json
+import os
+
+from modules.hot_crawler import HotCrawler
+from stub_server import FIXTURE_DIR, set_payload
+
+HOT_BOARD_PATH = '/hot-event/hot-board/'
+
+def load_board():
+    with open(os.path.join(FIXTURE_DIR, 'hot_board.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+def test_poll_conditional_get_backoff_and_diff(stub):
+    server, base_url = stub
+    board = load_board()
+    crawler = HotCrawler(url=f'{base_url}{HOT_BOARD_PATH}?origin=toutiao_pc', min_interval=10, max_interval=100)
+    try:
+        # 第一次轮询全部为新上榜
+        changes = crawler.poll()
+        assert [t['title'] for t in changes['added']] == [item['Title'] for item in board['data']]
+        assert crawler.interval == 10
+
+        # 内容未变：条件请求返回 304，fetch 返回 None，间隔按 BACKOFF 放大
+        assert crawler.fetch() is None
+        assert crawler.poll() is None
+        assert crawler.interval == 10 * HotCrawler.BACKOFF
+        assert server.stats[HOT_BOARD_PATH] == 3
+
+        # 第一名掉榜，其余话题排名各上升一位
+        changed = copy.deepcopy(board)
+        dropped = changed['data'].pop(0)
+        set_payload(server, HOT_BOARD_PATH, changed)
+        changes = crawler.poll()
+
+        assert changes['added'] == []
+        assert [t['id'] for t in changes['dropped']] == [dropped['ClusterIdStr']]
+        assert [(t['id'], t['rank'], rank) for t, rank in changes['moved']] == [
+            (item['ClusterIdStr'], i + 1, i + 2) for i, item in enumerate(changed['data'])
+        ]
+        assert crawler.interval == 10
+    finally:
+        crawler.close()
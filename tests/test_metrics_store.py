@@ -0,0 +1,60 @@
+from modules.metrics_store import MetricsStore
+
+# 对齐到天的起点，便于推算各精度的时间桶
+DAY = 86400
+BASE = 1700000000 // DAY * DAY
+
+def row(read):
+    return ('a1', read, read * 10, read // 10, 0)
+
+def test_record_downsample_and_query(tmp_path):
+    store = MetricsStore(str(tmp_path / 'metrics.db'), raw_retention=3600, hourly_retention=DAY)
+    try:
+        for ts, read in ((BASE + 600, 10), (BASE + 1800, 20), (BASE + 3900, 30),
+                         (BASE + DAY + 600, 40), (BASE + 2 * DAY + 600, 50)):
+            store.record('alice', [row(read)], ts=ts)
+        store.downsample(BASE + 2 * DAY + 1200)
+
+        # 第 0 天的小时数据已并入天表（取最大值），第 1 天保留小时粒度，第 2 天仍是原始快照
+        tables = {
+            table: store.storage.query(f'SELECT ts, read_count FROM {table} ORDER BY ts')
+            for table in ('metric_daily', 'metric_hourly', 'metric_raw')
+        }
+        assert tables == {
+            'metric_daily': [(BASE, 30)],
+            'metric_hourly': [(BASE + DAY, 40)],
+            'metric_raw': [(BASE + 2 * DAY + 600, 50)],
+        }
+
+        series = store.query('alice', 'a1')
+        assert list(series['ts']) == [BASE, BASE + DAY, BASE + 2 * DAY + 600]
+        assert list(series['read_count']) == [30, 40, 50]
+        assert list(series['show_count']) == [300, 400, 500]
+
+        window = store.query('alice', 'a1', start=BASE + DAY, end=BASE + 2 * DAY)
+        assert list(window['ts']) == [BASE + DAY]
+        assert list(store.query('alice', 'missing')['ts']) == []
+    finally:
+        store.storage.close()
+
+def test_downsample_merges_into_existing_bucket(tmp_path):
+    store = MetricsStore(str(tmp_path / 'metrics.db'), raw_retention=3600, hourly_retention=DAY)
+    try:
+        store.record('alice', [row(10)], ts=BASE + 600)
+        store.downsample(BASE + 3 * 3600)
+        # 同一小时内晚到的快照与已有的小时数据合并，计数取最大值
+        store.record('alice', [row(15)], ts=BASE + 1200)
+        store.record('bob', [row(7)], ts=BASE + 1200)
+        store.downsample(BASE + 3 * 3600)
+
+        assert store.storage.query('SELECT ts, read_count FROM metric_hourly ORDER BY series_id') == [
+            (BASE, 15), (BASE, 7)
+        ]
+        ts, totals = store.query_account('alice')
+        assert (list(ts), list(totals)) == ([BASE], [15])
+
+        store.delete_account('alice')
+        assert list(store.query('alice', 'a1')['ts']) == []
+        assert list(store.query('bob', 'a1')['read_count']) == [7]
+    finally:
+        store.storage.close()
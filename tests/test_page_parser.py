@@ -0,0 +1,63 @@
+from datetime import datetime
+
+from conftest import read_fixture
+from modules import page_parser
+
+def timestamp(text):
+    return int(datetime.strptime(text, '%Y-%m-%d %H:%M').timestamp())
+
+def test_parse_articles_card_layout():
+    articles = page_parser.parse_articles(read_fixture('articles_cards.html'))
+
+    # 没有标题的草稿卡片被跳过
+    assert [a['title'] for a in articles] == ['秋天的第一杯奶茶', '城市夜跑路线推荐']
+    first = articles[0]
+    assert first['publish_time'] == '2024-10-01 08:30'
+    assert first['create_time'] == timestamp('2024-10-01 08:30')
+    assert (first['show_count'], first['read_count'], first['digg_count'], first['comment_count']) == \
+        ('1.2万', '3,456', '78', '9')
+
+    # 缺少的统计项补 '0'
+    assert articles[1]['digg_count'] == '0'
+    assert articles[1]['comment_count'] == '0'
+
+def test_parse_articles_table_layout():
+    articles = page_parser.parse_articles(read_fixture('articles_table.html'))
+
+    assert [a['title'] for a in articles] == ['一周菜谱合集', '旧手机改造家庭服务器']
+    assert articles[0]['create_time'] == timestamp('2024-09-15 00:00')
+    assert articles[0]['show_count'] == '2.5万'
+    assert articles[0]['digg_count'] == '-'
+    assert articles[1]['read_count'] == '1.1亿'
+    assert articles[1]['show_count'] == '0'
+
+def test_parse_articles_without_cards():
+    assert page_parser.parse_articles(read_fixture('profile.html')) == []
+    assert page_parser.parse_articles('') == []
+
+def test_parse_profile():
+    profile = page_parser.parse_profile(read_fixture('profile.html'))
+
+    assert profile == {
+        'username': 'PenpoAI创意',
+        'fans': '粉丝 1.3万',
+        'following': '关注 56',
+        'likes': '获赞 8.8万',
+    }
+
+def test_parse_page_combines_articles_and_profile():
+    page = page_parser.parse_page(read_fixture('articles_cards.html'))
+
+    assert len(page['articles']) == 2
+    assert page['profile'] == {}
+
+def test_parse_articles_title_link_fallback():
+    html = '''
+    <div class="feed">
+      <a data-log-click="article_title" href="/item/1">只有标题链接的文章</a>
+    </div>
+    '''
+    articles = page_parser.parse_articles(html)
+
+    assert [a['title'] for a in articles] == ['只有标题链接的文章']
+    assert articles[0]['create_time'] == 0
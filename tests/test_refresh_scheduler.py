@@ -0,0 +1,98 @@
+from concurrent.futures import Future
+
+from modules.account_manager import Account, STATUS_EXPIRED
+from modules.creator_api import SessionExpiredError
+from services.refresh_scheduler import RefreshScheduler
+
+class FakeAccountManager:
+    """只提供调度器用到的接口，账号保存在内存中"""
+
+    def __init__(self, usernames):
+        self.accounts = {username: Account(username, cookies=[]) for username in usernames}
+        self.statuses = []
+
+    def get_refresh_schedule(self):
+        return [(username, 0, 600) for username, account in self.accounts.items() if not account.expired]
+
+    def get_account(self, username):
+        return self.accounts.get(username)
+
+    def update_statuses(self, results, checked_at=None):
+        self.statuses.extend(results)
+        for username, status in results:
+            if username in self.accounts:
+                self.accounts[username].status = status
+
+def finished(result=None, error=None):
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+def start_refresh(scheduler, username):
+    """模拟调度循环取出账号开始刷新"""
+    with scheduler._lock:
+        scheduler._due.pop(username, None)
+        scheduler._running.add(username)
+
+def make_scheduler(usernames):
+    manager = FakeAccountManager(usernames)
+    # 传入 pool 时调度器不创建浏览器
+    scheduler = RefreshScheduler(manager, pool=object(), jitter=0)
+    scheduler.reload()
+    return manager, scheduler
+
+def test_on_done_reschedules_after_success():
+    _, scheduler = make_scheduler(['alice'])
+    start_refresh(scheduler, 'alice')
+
+    scheduler._on_done('alice', finished(3))
+
+    assert 'alice' in scheduler._due
+    assert not scheduler._running
+
+def test_account_deleted_during_refresh_is_not_rescheduled():
+    manager, scheduler = make_scheduler(['alice', 'bob'])
+    start_refresh(scheduler, 'alice')
+
+    del manager.accounts['alice']
+    scheduler._on_done('alice', finished(3))
+
+    assert 'alice' not in scheduler._due
+    assert 'alice' not in scheduler._ttl
+    assert 'bob' in scheduler._due
+
+def test_reload_drops_account_that_is_refreshing():
+    manager, scheduler = make_scheduler(['alice'])
+    start_refresh(scheduler, 'alice')
+
+    del manager.accounts['alice']
+    scheduler.reload()
+
+    assert 'alice' not in scheduler._ttl
+
+def test_expired_session_marks_account_and_unschedules():
+    manager, scheduler = make_scheduler(['alice', 'bob'])
+    start_refresh(scheduler, 'alice')
+
+    scheduler._on_done('alice', finished(error=SessionExpiredError('跳转到登录页')))
+
+    assert manager.statuses == [('alice', STATUS_EXPIRED)]
+    assert 'alice' not in scheduler._due
+    assert 'alice' not in scheduler._failures
+    # 下一次 reload 也不会加回，直到重新登录
+    scheduler.reload()
+    assert 'alice' not in scheduler._due
+    assert 'bob' in scheduler._due
+
+def test_other_failures_are_retried():
+    manager, scheduler = make_scheduler(['alice'])
+    start_refresh(scheduler, 'alice')
+
+    scheduler._on_done('alice', finished(error=RuntimeError('网络错误')))
+
+    assert manager.statuses == []
+    assert scheduler._failures == {'alice': 1}
+    assert 'alice' in scheduler._due
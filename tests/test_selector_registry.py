@@ -0,0 +1,44 @@
+from modules.dom_extractor import LastResort
+from modules.selector_registry import SelectorRegistry
+
+class FakeDriver:
+    """按候选选择器返回预设匹配的驱动，记录每次探测收到的候选顺序"""
+
+    def __init__(self, matches):
+        self.matches = matches
+        self.probes = []
+
+    def execute_script(self, script, spec, limit):
+        self.probes.append(spec)
+        result = {}
+        for field, candidates in spec.items():
+            for selector in candidates:
+                if selector in self.matches:
+                    result[field] = {'selector': selector, 'count': 1, 'texts': [self.matches[selector]]}
+                    break
+        return result
+
+CARDS = ['.article-card', '.content-item', LastResort('//div[contains(@class, "article")]')]
+
+def test_resolve_caches_specific_match(tmp_path):
+    registry = SelectorRegistry(str(tmp_path / 'cache.json'))
+    found = registry.resolve(FakeDriver({'.content-item': '文章'}), 'profile', {'card': CARDS})
+
+    assert found['card'].selector == '.content-item'
+    assert registry.cached('profile', 'card') == '.content-item'
+    assert registry.candidates('profile', 'card', CARDS)[0] == '.content-item'
+
+def test_resolve_does_not_cache_last_resort(tmp_path):
+    registry = SelectorRegistry(str(tmp_path / 'cache.json'))
+    registry.remember('profile', 'card', '.content-item')
+    found = registry.resolve(FakeDriver({CARDS[2]: '外层容器'}), 'profile', {'card': CARDS})
+
+    assert found['card'].selector == CARDS[2]
+    # 命中宽泛候选时清除旧缓存，下次按默认顺序探测
+    assert registry.cached('profile', 'card') is None
+
+def test_candidates_ignore_cached_last_resort(tmp_path):
+    registry = SelectorRegistry(str(tmp_path / 'cache.json'))
+    registry.remember('profile', 'card', str(CARDS[2]))
+
+    assert registry.candidates('profile', 'card', CARDS) == CARDS
@@ -0,0 +1,71 @@
+from contextlib import contextmanager
+
+from modules.session_manager import SessionManager
+
+COOKIES = [{'name': 'sessionid', 'value': 'stored', 'domain': '.toutiao.com', 'path': '/'}]
+
+class FakeDriver:
+    """用 CDP 命令读写的内存 cookies，模拟账号目录中保存的浏览器状态"""
+
+    def __init__(self, cookies=()):
+        self.cookies = list(cookies)
+        self.set_calls = 0
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == 'Network.setCookies':
+            self.set_calls += 1
+            self.cookies = [dict(c, session=True) for c in params['cookies']]
+            return {}
+        if cmd == 'Network.getCookies':
+            return {'cookies': self.cookies}
+        raise AssertionError(cmd)
+
+def make_manager(tmp_path, driver):
+    manager = SessionManager(pool_size=1, use_profiles=True, profile_dir=str(tmp_path / 'profiles'))
+
+    @contextmanager
+    def profile_driver(username):
+        # 不启动 Chrome，只占用账号目录
+        manager.profiles.acquire(username)
+        try:
+            yield driver
+        finally:
+            manager.profiles.release(username)
+
+    manager._profile_driver = profile_driver
+    return manager
+
+def test_new_profile_gets_stored_cookies(tmp_path):
+    driver = FakeDriver()
+    manager = make_manager(tmp_path, driver)
+
+    with manager.session(username='alice', cookies=COOKIES):
+        pass
+
+    assert driver.set_calls == 1
+
+def test_existing_profile_with_session_is_trusted(tmp_path):
+    driver = FakeDriver()
+    manager = make_manager(tmp_path, driver)
+    with manager.session(username='alice', cookies=COOKIES):
+        pass
+
+    # 目录中的登录状态可能比数据库更新，不再覆盖
+    driver.cookies = [{'name': 'sessionid', 'value': 'rotated', 'domain': '.toutiao.com', 'path': '/'}]
+    with manager.session(username='alice', cookies=COOKIES):
+        pass
+
+    assert driver.set_calls == 1
+    assert driver.cookies[0]['value'] == 'rotated'
+
+def test_existing_profile_without_session_gets_cookies(tmp_path):
+    driver = FakeDriver()
+    manager = make_manager(tmp_path, driver)
+    with manager.session(username='alice', cookies=COOKIES):
+        pass
+
+    driver.cookies = []
+    with manager.session(username='alice', cookies=COOKIES):
+        pass
+
+    assert driver.set_calls == 2
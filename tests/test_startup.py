@@ -0,0 +1,11 @@
+import check_startup
+
+def test_main_import_budget_and_forbidden_modules():
+    runs = [check_startup.measure_imports() for _ in range(3)]
+    names, total, children = min(runs, key=lambda run: run[1])
+
+    slowest = ', '.join(f'{name} {ms:.0f}ms' for ms, name in sorted(children, reverse=True)[:5])
+    assert total <= check_startup.IMPORT_BUDGET_MS, f'导入 main 用时 {total:.1f}ms，超出预算（{slowest}）'
+
+    loaded = sorted({name.split('.')[0] for name in names} & set(check_startup.FORBIDDEN))
+    assert not loaded, f'启动时导入了: {", ".join(loaded)}'
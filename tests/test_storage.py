@@ -0,0 +1,50 @@
+import sqlite3
+
+from modules.account_manager import MIGRATIONS
+from modules.storage import Storage, column_names
+
+def create_v1_database(path):
+    """按版本 1 的结构建库，包含重复账号和没有状态的账号"""
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE schema_version (version INTEGER PRIMARY KEY, applied_at TIMESTAMP)')
+    conn.execute('INSERT INTO schema_version (version) VALUES (1)')
+    cursor = conn.cursor()
+    MIGRATIONS[0][1](cursor)
+    cursor.executemany(
+        'INSERT INTO accounts (username, cookies, status) VALUES (?, ?, ?)',
+        [('alice', '[]', 'expired'), ('alice', '[{"name": "sessionid"}]', 'active'), ('bob', '[]', None)]
+    )
+    conn.commit()
+    conn.close()
+
+def test_migrate_v1_to_latest(tmp_path):
+    path = str(tmp_path / 'accounts.db')
+    create_v1_database(path)
+
+    storage = Storage(path, MIGRATIONS)
+    try:
+        assert storage.version() == MIGRATIONS[-1][0]
+        cursor = storage.connection().cursor()
+        assert {'article_ttl', 'articles_synced_at', 'watermark_time', 'watermark_id',
+                'version', 'last_check'} <= column_names(cursor, 'accounts')
+
+        # v3 只保留每个用户名最新的一条，v5 补齐状态
+        rows = storage.query('SELECT username, cookies, status, version FROM accounts ORDER BY username')
+        assert rows == [('alice', '[{"name": "sessionid"}]', 'active', 0), ('bob', '[]', 'active', 0)]
+
+        # v4 触发器在 cookies 变化时递增行版本
+        storage.execute("UPDATE accounts SET cookies = '[]' WHERE username = 'alice'")
+        assert storage.query_one("SELECT version FROM accounts WHERE username = 'alice'") == (1,)
+    finally:
+        storage.close()
+
+def test_migrate_is_idempotent(tmp_path):
+    path = str(tmp_path / 'accounts.db')
+    Storage(path, MIGRATIONS).close()
+
+    storage = Storage(path, MIGRATIONS)
+    try:
+        versions = [row[0] for row in storage.query('SELECT version FROM schema_version ORDER BY version')]
+        assert versions == [version for version, _ in MIGRATIONS]
+    finally:
+        storage.close()